@@ -1,6 +1,10 @@
 from fitlog import create_app
-app = create_app()
+
+# Die Vorab-Render-Worker (ProcessPoolExecutor, spawn) importieren dieses
+# Modul als "__mp_main__" erneut – dort keine App aufbauen (Migrationen,
+# Asset-Build); die Worker brauchen nur fitlog.services.charts.
+if __name__ != "__mp_main__":
+    app = create_app()
 
 if __name__ == "__main__":
     app.run(debug=True)
-
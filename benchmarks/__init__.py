@@ -0,0 +1,6 @@
+"""
+Benchmarks für FitLog (keine Tests – reine Messskripte).
+
+Ausführung aus dem Projektverzeichnis, z. B.:
+    python -m benchmarks.bench_record_save
+"""
@@ -0,0 +1,125 @@
+"""
+Benchmark: Diagramm-Durchsatz bei parallelem Rendern in Threads.
+
+Vergleicht den pyplot-freien Renderer (`fitlog.services.charts`, Figure +
+FigureCanvasAgg) mit dem bisherigen pyplot-Schreibpfad (Referenz unten,
+`plt.subplots`/`plt.setp`/`plt.close`) für 1 … 8 Threads. Gemessen werden
+Diagramme pro Sekunde und Fehler (pyplot teilt seinen Figure-Manager
+zwischen allen Threads).
+
+Ausführung:
+    python -m benchmarks.bench_chart_concurrency [--charts 48] [--threads 1 2 4 8]
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Callable, List, Tuple
+
+from fitlog.services import charts
+
+
+# ---------------------------
+# Referenz: bisheriger pyplot-Pfad
+# ---------------------------
+
+def _pyplot_plan_png(plan_name: str, data: List[Tuple[str, float]]) -> bytes:
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(7.5, 3.8), dpi=140)
+    ax.bar([n for n, _ in data], [v for _, v in data])
+    ax.set_title(f"Current weights per exercise – {plan_name}")
+    ax.set_ylabel("Weight (kg)")
+    ax.set_xlabel("Exercise")
+    ax.grid(axis="y", linestyle=":", alpha=0.4)
+    plt.setp(ax.get_xticklabels(), rotation=18, ha="right")
+    plt.tight_layout()
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png")
+    plt.close(fig)
+    return buf.getvalue()
+
+
+def _pyplot_exercise_png(title: str, history: List[Tuple[str, float]]) -> bytes:
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    dates = [datetime.strptime(day, "%Y-%m-%d").date() for day, _ in history]
+    fig, ax = plt.subplots(figsize=(7.5, 3.2), dpi=140)
+    ax.plot(dates, [w for _, w in history], marker="o", linewidth=2)
+    ax.set_title(title)
+    ax.set_ylabel("Weight (kg)")
+    ax.set_xlabel("Date")
+    ax.grid(True, linestyle=":", alpha=0.4)
+    fig.autofmt_xdate()
+    plt.tight_layout()
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png")
+    plt.close(fig)
+    return buf.getvalue()
+
+
+# ---------------------------
+# Messung
+# ---------------------------
+
+def _inputs(i: int):
+    plan = [(f"Übung {k}", 20.0 + (i + k) % 60) for k in range(8)]
+    start = date(2024, 1, 1)
+    history = [
+        ((start + timedelta(days=3 * d)).isoformat(), 40.0 + 0.2 * d + (i % 5))
+        for d in range(120)
+    ]
+    return plan, history
+
+
+def _job(plan_fn: Callable, exercise_fn: Callable, i: int) -> int:
+    plan, history = _inputs(i)
+    if i % 2:
+        png = plan_fn(f"Plan {i}", plan)
+    else:
+        png = exercise_fn(f"Weight over time – {i}", history)
+    if not png.startswith(b"\x89PNG"):
+        raise RuntimeError("kein PNG")
+    return len(png)
+
+
+def _throughput(plan_fn, exercise_fn, n_charts: int, threads: int) -> Tuple[float, int]:
+    errors = 0
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        futures = [pool.submit(_job, plan_fn, exercise_fn, i) for i in range(n_charts)]
+        for f in futures:
+            try:
+                f.result()
+            except Exception:
+                errors += 1
+    return n_charts / (time.perf_counter() - t0), errors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--charts", type=int, default=48)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    # Imports/Font-Cache vorab, damit der erste Lauf nicht verfälscht wird
+    charts.warmup()
+    _job(_pyplot_plan_png, _pyplot_exercise_png, 0)
+
+    print(f"{'Threads':>7} {'pyplot/s':>9} {'Fehler':>7} {'Figure/s':>9} {'Fehler':>7} {'Faktor':>7}")
+    for threads in args.threads:
+        old, old_err = _throughput(_pyplot_plan_png, _pyplot_exercise_png, args.charts, threads)
+        new, new_err = _throughput(charts.render_plan_png, charts.render_exercise_png, args.charts, threads)
+        print(f"{threads:>7} {old:>9.1f} {old_err:>7} {new:>9.1f} {new_err:>7} {new / old:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Benchmark: Decodieren des Erfassungsformulars bei großen Formularen.
+
+Vergleicht `decode_record_form` (ein Durchlauf über alle Felder, vorkompilierte
+Schlüssel-Regex, gemeinsame Konverter) mit dem bisherigen Decoder (Referenz
+unten: `str.index` je Schlüssel, zweiter Durchlauf für die flachen Felder)
+für 50 … 2000 Übungen, jeweils im Klammer- (`ex[<id>][sets]`) und im flachen
+Format (`sets_<id>`). Vor der Messung wird geprüft, dass beide Decoder für
+gültige Eingaben dieselben Werte liefern.
+
+Ausführung:
+    python -m benchmarks.bench_record_parse [--repeat 15] [--sizes 50 200 2000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+from typing import Any, Callable, Dict, List, Optional
+
+from werkzeug.datastructures import MultiDict
+
+from fitlog.services.record_parser import EntryRow, decode_record_form
+
+
+# ---------------------------
+# Referenz: bisheriger Decoder
+# ---------------------------
+
+def _reference_parse_brackets(form: Dict[str, Any]) -> Dict[int, Dict[str, Any]]:
+    result: Dict[int, Dict[str, Any]] = {}
+    for full_key, raw_value in form.items():
+        if not full_key.startswith("ex["):
+            continue
+        try:
+            left = full_key.index("[") + 1
+            right = full_key.index("]", left)
+            ex_id = int(full_key[left:right])
+        except Exception:
+            continue
+
+        try:
+            sub_left = full_key.index("[", right) + 1
+            sub_right = full_key.index("]", sub_left)
+            subkey = full_key[sub_left:sub_right]
+        except Exception:
+            continue
+
+        payload = result.setdefault(ex_id, {"sets": 0, "reps": 0, "weight": 0.0, "note": ""})
+        if subkey == "sets":
+            try:
+                payload["sets"] = max(0, int(str(raw_value).strip()))
+            except ValueError:
+                payload["sets"] = 0
+        elif subkey == "reps":
+            try:
+                payload["reps"] = max(0, int(str(raw_value).strip()))
+            except ValueError:
+                payload["reps"] = 0
+        elif subkey == "weight":
+            try:
+                payload["weight"] = max(0.0, float(str(raw_value).replace(",", ".").strip()))
+            except ValueError:
+                payload["weight"] = 0.0
+        elif subkey == "note":
+            payload["note"] = (raw_value or "").strip()
+
+    return result
+
+
+def _ref_flat_int(raw: Any) -> Optional[int]:
+    if not raw:
+        return None
+    try:
+        return int(raw)
+    except ValueError:
+        return None
+
+
+def _ref_flat_float(raw: Any) -> Optional[float]:
+    if not raw:
+        return None
+    try:
+        return float(str(raw).replace(",", "."))
+    except ValueError:
+        return None
+
+
+def _reference_decode(form: Any) -> List[EntryRow]:
+    parsed = _reference_parse_brackets(form)
+
+    getlist = getattr(form, "getlist", None)
+    raw_ids: List[str] = list(getlist("exercise_id")) if getlist else []
+    if not raw_ids:
+        found = set(parsed)
+        for key in form.keys():
+            if "_" in key and not key.startswith("ex["):
+                suffix = key.rsplit("_", 1)[-1]
+                if suffix.isdigit():
+                    found.add(int(suffix))
+        raw_ids = [str(i) for i in sorted(found)]
+
+    rows: List[EntryRow] = []
+    for raw_id in raw_ids:
+        try:
+            ex_id = int(raw_id)
+        except ValueError:
+            continue
+
+        payload = parsed.get(ex_id)
+        if payload is not None:
+            # bracket form: parser already delivers cleaned values
+            rows.append(EntryRow(
+                exercise_id=ex_id,
+                sets=payload["sets"],
+                reps=payload["reps"],
+                weight=payload["weight"],
+                note=str(payload["note"] or "").strip(),
+            ))
+            continue
+
+        rows.append(EntryRow(
+            exercise_id=ex_id,
+            sets=_ref_flat_int(form.get(f"sets_{ex_id}")),
+            reps=_ref_flat_int(form.get(f"reps_{ex_id}")),
+            weight=_ref_flat_float(form.get(f"weight_{ex_id}")),
+            note=str(form.get(f"note_{ex_id}") or "").strip(),
+        ))
+    return rows
+
+
+# ---------------------------
+# Messung
+# ---------------------------
+
+def _form(n: int, flat: bool) -> MultiDict:
+    """Formular wie aus record.html; jede 10. Übung ausgelassen (Sätze 0)."""
+    form = MultiDict()
+    for i in range(n):
+        ex_id = 1000 + i
+        form.add("exercise_id", str(ex_id))
+        sets = "0" if i % 10 == 9 else "3"
+        weight = f"{20 + i % 40},5"
+        if flat:
+            form.add(f"sets_{ex_id}", sets)
+            form.add(f"reps_{ex_id}", "10")
+            form.add(f"weight_{ex_id}", weight)
+        else:
+            form.add(f"ex[{ex_id}][sets]", sets)
+            form.add(f"ex[{ex_id}][reps]", "10")
+            form.add(f"ex[{ex_id}][weight]", weight)
+    form.add("duration_minutes", "45")
+    return form
+
+
+def _values(rows: List[EntryRow]) -> list:
+    return [(r.exercise_id, r.sets, r.reps, r.weight, r.note or "") for r in rows]
+
+
+def _best_us(fn: Callable[[], Any], repeat: int, number: int = 5) -> float:
+    """Bestwert je Aufruf (µs) – robuster als der Median auf lauten Maschinen."""
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=15)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 500, 2000])
+    args = parser.parse_args()
+
+    print(f"{'Übungen':>8} {'Format':>8} {'alt µs':>10} {'neu µs':>10} "
+          f"{'µs/Übung':>9} {'Faktor':>7}")
+    for n in args.sizes:
+        for flat in (False, True):
+            form = _form(n, flat)
+            if _values(_reference_decode(form)) != _values(decode_record_form(form)):
+                raise SystemExit(f"Decoder liefern unterschiedliche Werte (n={n}, flat={flat})")
+            old = _best_us(lambda: _reference_decode(form), args.repeat)
+            new = _best_us(lambda: decode_record_form(form), args.repeat)
+            print(f"{n:>8} {'flach' if flat else 'ex[..]':>8} {old:>10.1f} {new:>10.1f} "
+                  f"{new / n:>9.2f} {old / new:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Benchmark: Zwischenspeichern/Beenden einer Session bei wachsender Plangröße.
+
+Misst über den Flask-Test-Client
+  - POST /sessions/<id>/record  (Zwischenspeichern)
+  - POST /sessions/<id>/finish  (Speichern & beenden)
+für Pläne mit 5 … 200 Übungen und vergleicht `_upsert_entries` (gebatcht)
+mit einem zeilenweisen Referenz-Schreibpfad (ein Statement pro Übung).
+
+Ausführung:
+    python -m benchmarks.bench_record_save [--repeat 30]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from werkzeug.datastructures import MultiDict
+
+from fitlog import create_app
+from fitlog.blueprints.sessions import _upsert_entries, _utcnow_iso
+from fitlog.db import get_db
+
+PLAN_SIZES = (5, 20, 50, 100, 200)
+
+
+def _setup_plan(db, n_exercises: int) -> int:
+    """Plan mit `n_exercises` Übungen anlegen; liefert die plan_id."""
+    cur = db.execute("INSERT INTO training_plans (name) VALUES (?)", (f"Bench {n_exercises}",))
+    plan_id = cur.lastrowid
+    for i in range(n_exercises):
+        ex_id = db.execute(
+            "INSERT INTO exercises (name) VALUES (?)", (f"Bench-Übung {n_exercises}-{i}",)
+        ).lastrowid
+        db.execute(
+            "INSERT INTO plan_exercises (plan_id, exercise_id, position) VALUES (?, ?, ?)",
+            (plan_id, ex_id, i + 1),
+        )
+    db.commit()
+    return plan_id
+
+
+def _record_form(db, plan_id: int) -> MultiDict:
+    """Formular wie aus record.html: jede 10. Übung ausgelassen (Sätze 0)."""
+    form = MultiDict()
+    ex_ids = [r[0] for r in db.execute(
+        "SELECT exercise_id FROM plan_exercises WHERE plan_id = ? ORDER BY position", (plan_id,)
+    )]
+    for i, ex_id in enumerate(ex_ids):
+        form.add("exercise_id", str(ex_id))
+        form.add(f"ex[{ex_id}][sets]", "0" if i % 10 == 9 else "3")
+        form.add(f"ex[{ex_id}][reps]", "10")
+        form.add(f"ex[{ex_id}][weight]", f"{20 + i % 40},5")
+    return form
+
+
+def _rowwise_reference(db, session_id: int, form: MultiDict) -> None:
+    """Referenz: ein Statement und ein Zeitstempel pro Übung (alter Schreibpfad)."""
+    from fitlog.services.record_parser import decode_record_form
+
+    for row in decode_record_form(form):
+        if row.skipped:
+            db.execute(
+                "DELETE FROM session_entries WHERE session_id = ? AND exercise_id = ?",
+                (session_id, row.exercise_id),
+            )
+            continue
+        db.execute(
+            """
+            INSERT INTO session_entries (session_id, exercise_id, weight_kg, reps, sets, note, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(session_id, exercise_id) DO UPDATE SET
+              weight_kg = excluded.weight_kg, reps = excluded.reps, sets = excluded.sets,
+              note = excluded.note, created_at = excluded.created_at
+            """,
+            (session_id, row.exercise_id, row.weight, row.reps, row.sets or 3, row.note, _utcnow_iso()),
+        )
+
+
+def _median_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app({"DATABASE": str(Path(tmp) / "bench.db"), "TESTING": True})
+        client = app.test_client()
+
+        print(f"{'Übungen':>8} {'record ms':>10} {'finish ms':>10} "
+              f"{'batch ms':>9} {'rowwise ms':>11} {'µs/Übung':>9}")
+        for n in PLAN_SIZES:
+            with app.app_context():
+                db = get_db()
+                plan_id = _setup_plan(db, n)
+                form = _record_form(db, plan_id)
+
+            def new_session() -> int:
+                resp = client.get(f"/sessions/new?plan_id={plan_id}")
+                return int(resp.location.rstrip("/").split("/")[-2])
+
+            sid = new_session()
+            record_ms = _median_ms(
+                lambda: client.post(f"/sessions/{sid}/record", data=form), args.repeat
+            )
+
+            finish_samples = []
+            for _ in range(args.repeat):
+                fid = new_session()
+                t0 = time.perf_counter()
+                client.post(f"/sessions/{fid}/finish", data=form)
+                finish_samples.append((time.perf_counter() - t0) * 1000)
+            finish_ms = statistics.median(finish_samples)
+
+            with app.app_context():
+                db = get_db()
+
+                def batched():
+                    _upsert_entries(db, sid, form)
+                    db.commit()
+
+                def rowwise():
+                    _rowwise_reference(db, sid, form)
+                    db.commit()
+
+                batch_ms = _median_ms(batched, args.repeat)
+                row_ms = _median_ms(rowwise, args.repeat)
+
+            print(f"{n:>8} {record_ms:>10.2f} {finish_ms:>10.2f} "
+                  f"{batch_ms:>9.3f} {row_ms:>11.3f} {batch_ms * 1000 / n:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
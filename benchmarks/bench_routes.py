@@ -0,0 +1,187 @@
+"""
+Benchmark: heiße Routen und Service-Funktionen bei mehreren Datengrößen.
+
+Für jede Stufe aus `benchmarks.synthetic.SIZES` wird eine Datenbank
+deterministisch erzeugt und anschließend über den Flask-Test-Client gemessen:
+
+  GET  /                               Startseite
+  GET  /sessions/<id>/record           Erfassungsseite
+  POST /sessions/<id>/finish           Speichern & beenden
+  GET  /progress/plan/<id>/png         Plan-Diagramm (Cache geleert)
+  GET  /progress/exercise/<id>/png     Übungsverlauf (Cache geleert)
+  GET  /progress/exercise/<id>/series  JSON-Verlauf (LTTB)
+  GET  /progress/exercise/<id>/stats   NumPy-Kennzahlen
+
+sowie `compute_exercise_stats` und `lttb_indices` direkt. Die Ergebnisse
+(Median/p95 in ms) lassen sich mit `--output` als JSON speichern und mit
+`--compare` gegen einen früheren Lauf vergleichen, damit Regressionen als
+Zahlen sichtbar werden.
+
+Ausführung:
+    python -m benchmarks.bench_routes [--sizes small medium] [--repeat 20]
+                                      [--output run.json] [--compare base.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+from werkzeug.datastructures import MultiDict
+
+from benchmarks.synthetic import SIZES, generate
+from fitlog import create_app
+from fitlog.db import get_db
+
+
+def _measure(fn: Callable[[], object], repeat: int) -> Dict[str, float]:
+    fn()  # Aufwärmen (Imports, Statement-Cache)
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    samples.sort()
+    return {
+        "median_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+    }
+
+
+def _pick_targets(db) -> dict:
+    """Plan mit den meisten Sessions und dessen meistgenutzte Übung."""
+    plan_id = db.execute(
+        "SELECT plan_id FROM sessions GROUP BY plan_id ORDER BY COUNT(*) DESC, plan_id LIMIT 1"
+    ).fetchone()[0]
+    exercise_id = db.execute(
+        """
+        SELECT se.exercise_id
+          FROM session_entries se JOIN sessions s ON s.id = se.session_id
+         WHERE s.plan_id = ?
+         GROUP BY se.exercise_id ORDER BY COUNT(*) DESC, se.exercise_id LIMIT 1
+        """,
+        (plan_id,),
+    ).fetchone()[0]
+    ex_ids = [r[0] for r in db.execute(
+        "SELECT exercise_id FROM plan_exercises WHERE plan_id = ? ORDER BY position", (plan_id,)
+    )]
+    form = MultiDict()
+    for ex_id in ex_ids:
+        form.add("exercise_id", str(ex_id))
+        form.add(f"ex[{ex_id}][sets]", "3")
+        form.add(f"ex[{ex_id}][reps]", "10")
+        form.add(f"ex[{ex_id}][weight]", "42,5")
+    return {"plan_id": plan_id, "exercise_id": exercise_id, "form": form}
+
+
+def run_size(name: str, tmp: Path, repeat: int) -> Dict[str, dict]:
+    db_path = tmp / f"bench-{name}.db"
+    counts = generate(db_path, SIZES[name])
+    app = create_app({"DATABASE": str(db_path), "TESTING": True})
+    client = app.test_client()
+
+    with app.app_context():
+        t = _pick_targets(get_db())
+    plan_id, exercise_id, form = t["plan_id"], t["exercise_id"], t["form"]
+    cache = app.extensions["chart_cache"]
+
+    def new_session() -> int:
+        resp = client.get(f"/sessions/new?plan_id={plan_id}")
+        return int(resp.location.rstrip("/").split("/")[-2])
+
+    record_sid = new_session()
+
+    def finish():
+        sid = new_session()
+        client.post(f"/sessions/{sid}/finish", data=form)
+
+    def uncached(url: str):
+        def call():
+            cache.clear()
+            client.get(url)
+        return call
+
+    results: Dict[str, dict] = {"_data": counts}
+    cases = {
+        "GET /": lambda: client.get("/"),
+        "GET record": lambda: client.get(f"/sessions/{record_sid}/record"),
+        "POST finish": finish,
+        "GET plan png": uncached(f"/progress/plan/{plan_id}/png"),
+        "GET exercise png": uncached(f"/progress/exercise/{exercise_id}/png"),
+        "GET exercise series": lambda: client.get(f"/progress/exercise/{exercise_id}/series"),
+        "GET exercise stats": lambda: client.get(f"/progress/exercise/{exercise_id}/stats"),
+    }
+    for label, fn in cases.items():
+        results[label] = _measure(fn, repeat)
+
+    # Service-Funktionen ohne HTTP-Schicht
+    import numpy as np
+
+    from fitlog.services.analytics import compute_exercise_stats, load_exercise_arrays
+    from fitlog.services.downsample import lttb_indices
+
+    with app.app_context():
+        db = get_db()
+        arrays = load_exercise_arrays(db, exercise_id)
+        results["load_exercise_arrays"] = _measure(lambda: load_exercise_arrays(db, exercise_id), repeat)
+    results["compute_exercise_stats"] = _measure(lambda: compute_exercise_stats(arrays), repeat)
+    x = np.arange(len(arrays["weight"]), dtype=float)
+    results["lttb_indices(365)"] = _measure(lambda: lttb_indices(x, arrays["weight"], 365), repeat)
+
+    app.extensions["db_pool"].close_all()
+    return results
+
+
+def _print_table(name: str, results: Dict[str, dict], baseline: Dict[str, dict] | None) -> None:
+    data = results["_data"]
+    print(f"\n== {name}: {data['sessions']} Sessions, {data['entries']} Einträge, "
+          f"{data['exercises']} Übungen, {data['plans']} Pläne ==")
+    header = f"{'Fall':<26} {'median ms':>10} {'p95 ms':>9}"
+    if baseline:
+        header += f" {'vorher':>9} {'Faktor':>7}"
+    print(header)
+    for label, r in results.items():
+        if label.startswith("_"):
+            continue
+        line = f"{label:<26} {r['median_ms']:>10.2f} {r['p95_ms']:>9.2f}"
+        if baseline and label in baseline:
+            before = baseline[label]["median_ms"]
+            line += f" {before:>9.2f} {r['median_ms'] / before if before else 0:>7.2f}"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=["small", "medium"])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", type=Path, default=None, help="Ergebnisse als JSON speichern")
+    parser.add_argument("--compare", type=Path, default=None, help="früheren JSON-Lauf vergleichen")
+    args = parser.parse_args()
+
+    baseline = json.loads(args.compare.read_text())["sizes"] if args.compare else {}
+
+    run = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "sizes": {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in args.sizes:
+            results = run_size(name, Path(tmp), args.repeat)
+            run["sizes"][name] = results
+            _print_table(name, results, baseline.get(name))
+
+    if args.output:
+        args.output.write_text(json.dumps(run, indent=2, ensure_ascii=False))
+        print(f"\nErgebnisse gespeichert: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
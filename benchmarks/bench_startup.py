@@ -0,0 +1,94 @@
+"""
+Benchmark: Startzeit eines Workers (Import + create_app) in frischen Prozessen.
+
+Vergleicht den Standardstart (Matplotlib lazy) mit `CHART_WARMUP=True`
+und zeigt, ob Matplotlib nach dem Start bereits geladen ist. Mit
+`--importtime` werden zusätzlich die teuersten Imports aus
+`python -X importtime` aufgelistet.
+
+Ausführung:
+    python -m benchmarks.bench_startup [--runs 5] [--importtime]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+_CHILD = r"""
+import json, sys, time
+t0 = time.perf_counter()
+from fitlog import create_app
+app = create_app({"DATABASE": sys.argv[1], "CHART_WARMUP": sys.argv[2] == "1"})
+t1 = time.perf_counter()
+with app.test_client() as c:
+    c.get("/health")
+t2 = time.perf_counter()
+print(json.dumps({
+    "create_app_ms": (t1 - t0) * 1000,
+    "first_health_ms": (t2 - t1) * 1000,
+    "matplotlib_loaded": "matplotlib" in sys.modules,
+}))
+"""
+
+
+def _run_child(db_path: str, warmup: bool) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD, db_path, "1" if warmup else "0"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _importtime_report(db_path: str, top: int = 15) -> None:
+    code = f"from fitlog import create_app; create_app({{'DATABASE': {db_path!r}}})"
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = [p.strip() for p in line[len("import time:"):].split("|")]
+        if parts[1].isdigit():
+            rows.append((int(parts[1]), parts[2]))
+    print("\nTeuerste Imports (kumulativ, µs) beim Standardstart:")
+    for cumulative, name in sorted(rows, reverse=True)[:top]:
+        print(f"  {cumulative:>9}  {name}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--importtime", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        _run_child(db_path, False)  # Migrationen einmal vorab anwenden
+
+        print(f"{'Modus':<10} {'create_app ms':>14} {'1. /health ms':>14} {'matplotlib':>11}")
+        for label, warmup in (("lazy", False), ("warmup", True)):
+            results = [_run_child(db_path, warmup) for _ in range(args.runs)]
+            print(
+                f"{label:<10} "
+                f"{statistics.median(r['create_app_ms'] for r in results):>14.1f} "
+                f"{statistics.median(r['first_health_ms'] for r in results):>14.1f} "
+                f"{'geladen' if results[0]['matplotlib_loaded'] else 'nein':>11}"
+            )
+
+        if args.importtime:
+            _importtime_report(db_path)
+
+
+if __name__ == "__main__":
+    main()
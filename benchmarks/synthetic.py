@@ -0,0 +1,175 @@
+"""
+Deterministischer Generator für synthetische Trainingsdaten.
+
+Füllt eine (neue oder migrierte) Datenbank mit `plans` Plänen, `exercises`
+Übungen und `years` Jahren abgeschlossener Sessions. Gleicher `seed` und
+gleiche Parameter liefern byte-identische Daten – Zeitstempel beginnen an
+einem festen Startdatum, nicht „heute“.
+
+Ausführung:
+    python -m benchmarks.synthetic bench.db [--plans 6] [--exercises 60] [--years 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from fitlog.migrations import apply_migrations
+from fitlog.seed import EXERCISES
+from fitlog.services.rollup import rebuild_rollup
+
+START = datetime(2020, 1, 6, 18, 0, 0)  # ein Montag
+
+
+@dataclass(frozen=True)
+class DataSize:
+    plans: int = 6
+    exercises: int = 60
+    exercises_per_plan: int = 8
+    years: float = 3.0
+    sessions_per_week: int = 4
+
+
+# Stufen für die Benchmarks
+SIZES = {
+    "small": DataSize(plans=3, exercises=20, exercises_per_plan=6, years=0.5, sessions_per_week=3),
+    "medium": DataSize(plans=6, exercises=60, exercises_per_plan=8, years=3.0, sessions_per_week=4),
+    "large": DataSize(plans=12, exercises=150, exercises_per_plan=12, years=10.0, sessions_per_week=5),
+}
+
+
+def _ts(dt: datetime) -> str:
+    return dt.isoformat(timespec="seconds")
+
+
+def generate(db_path: str | Path, size: DataSize = DataSize(), seed: int = 42) -> dict:
+    """
+    Datenbank unter `db_path` migrieren und mit synthetischen Daten füllen.
+
+    Liefert Zähler (plans, exercises, sessions, entries, seconds).
+    """
+    rng = random.Random(seed)
+    apply_migrations(db_path)
+    t0 = time.perf_counter()
+
+    conn = sqlite3.connect(str(db_path))
+    try:
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = OFF")
+
+        names = list(EXERCISES) + [
+            f"Übung {i:03d}" for i in range(max(0, size.exercises - len(EXERCISES)))
+        ]
+        names = names[: size.exercises]
+        conn.executemany("INSERT INTO exercises (name) VALUES (?)", [(n,) for n in names])
+        exercise_ids = [r[0] for r in conn.execute("SELECT id FROM exercises ORDER BY id")]
+
+        # Startgewicht und Steigerung (kg/Woche) je Übung
+        profile = {
+            ex_id: (rng.uniform(10, 90), rng.uniform(0.05, 0.6))
+            for ex_id in exercise_ids
+        }
+
+        plan_exercises: dict[int, list[int]] = {}
+        for p in range(size.plans):
+            plan_id = conn.execute(
+                "INSERT INTO training_plans (name, created_at) VALUES (?, ?)",
+                (f"Plan {p + 1:02d}", _ts(START)),
+            ).lastrowid
+            chosen = rng.sample(exercise_ids, min(size.exercises_per_plan, len(exercise_ids)))
+            plan_exercises[plan_id] = chosen
+            conn.executemany(
+                """
+                INSERT INTO plan_exercises
+                       (plan_id, exercise_id, position, default_sets, default_reps, default_weight_kg)
+                VALUES (?, ?, ?, 3, 10, ?)
+                """,
+                [(plan_id, ex_id, i + 1, round(profile[ex_id][0], 1)) for i, ex_id in enumerate(chosen)],
+            )
+
+        plan_ids = list(plan_exercises)
+        weeks = int(size.years * 52)
+        session_count = 0
+        entry_count = 0
+        for week in range(weeks):
+            days = sorted(rng.sample(range(7), min(size.sessions_per_week, 7)))
+            for day in days:
+                plan_id = plan_ids[session_count % len(plan_ids)]
+                started = START + timedelta(weeks=week, days=day, minutes=rng.randrange(0, 180))
+                ended = started + timedelta(minutes=rng.randrange(40, 100))
+                session_id = conn.execute(
+                    "INSERT INTO sessions (plan_id, started_at, ended_at) VALUES (?, ?, ?)",
+                    (plan_id, _ts(started), _ts(ended)),
+                ).lastrowid
+                session_count += 1
+
+                entries = []
+                for i, ex_id in enumerate(plan_exercises[plan_id]):
+                    if rng.random() < 0.05:
+                        continue  # gelegentlich ausgelassen
+                    base, slope = profile[ex_id]
+                    weight = round((base + slope * week + rng.gauss(0, 2.0)) * 2) / 2
+                    entries.append((
+                        session_id, ex_id, max(weight, 0.0), rng.randint(5, 12),
+                        rng.choice((3, 3, 3, 4)), "",
+                        _ts(started + timedelta(minutes=5 * (i + 1))),
+                    ))
+                conn.executemany(
+                    """
+                    INSERT INTO session_entries
+                           (session_id, exercise_id, weight_kg, reps, sets, note, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    entries,
+                )
+                entry_count += len(entries)
+
+        rebuild_rollup(conn)
+        conn.commit()
+    finally:
+        conn.close()
+
+    return {
+        "plans": size.plans,
+        "exercises": len(names),
+        "sessions": session_count,
+        "entries": entry_count,
+        "seconds": round(time.perf_counter() - t0, 3),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("db_path", type=Path)
+    parser.add_argument("--size", choices=sorted(SIZES), default=None,
+                        help="vordefinierte Stufe statt einzelner Parameter")
+    parser.add_argument("--plans", type=int, default=DataSize.plans)
+    parser.add_argument("--exercises", type=int, default=DataSize.exercises)
+    parser.add_argument("--exercises-per-plan", type=int, default=DataSize.exercises_per_plan)
+    parser.add_argument("--years", type=float, default=DataSize.years)
+    parser.add_argument("--sessions-per-week", type=int, default=DataSize.sessions_per_week)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.db_path.exists():
+        parser.error(f"{args.db_path} existiert bereits")
+
+    size = SIZES[args.size] if args.size else DataSize(
+        plans=args.plans,
+        exercises=args.exercises,
+        exercises_per_plan=args.exercises_per_plan,
+        years=args.years,
+        sessions_per_week=args.sessions_per_week,
+    )
+    stats = generate(args.db_path, size, seed=args.seed)
+    print(", ".join(f"{k}={v}" for k, v in stats.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,47 @@ def create_app(test_config: dict | None = None) -> Flask:
     app.config.from_mapping(
         SECRET_KEY="dev",
         DATABASE=str(Path(app.instance_path) / "fitlog.db"),
+        # Connection-Pool (siehe fitlog/db.py); SQLITE_PRAGMAS ergänzt/überschreibt
+        # die Standard-PRAGMAs (WAL, busy_timeout, synchronous, cache/mmap)
+        DB_POOL_SIZE=8,
+        DB_POOL_TIMEOUT=10.0,
+        DB_STATEMENT_CACHE=256,
+        SQLITE_PRAGMAS={},
+        # Schema-Migrationen beim Start anwenden (siehe fitlog/migrations)
+        AUTO_MIGRATE=True,
+        # Diagramm-Cache (LRU im Speicher, optional Spill nach instance/chart_cache)
+        CHART_CACHE_SIZE=128,
+        CHART_CACHE_SPILL=False,
+        CHART_CACHE_DIR=None,
+        CHART_CACHE_SPILL_MAX_FILES=2048,
+        # Matplotlib schon beim Start laden statt beim ersten Diagramm
+        CHART_WARMUP=False,
+        # Diagramme nach „Training beenden“ im Prozess-Pool vorab rendern
+        # (opt-in: startet eigene Worker-Prozesse)
+        CHART_PRERENDER=False,
+        CHART_PRERENDER_WORKERS=1,
+        CHART_PRERENDER_QUEUE=32,
+        CHART_PRERENDER_START_METHOD="spawn",
+        # Prometheus-Metriken unter /metrics (Latenzen, SQL je Request, Render-Zeiten);
+        # opt-in, abrufbar nur mit METRICS_TOKEN (Bearer) bzw. ohne Token von Loopback
+        METRICS_ENABLED=False,
+        METRICS_TOKEN=None,
+        # SQL-Trace: jedes Statement messen, langsame mit EXPLAIN QUERY PLAN
+        # nach SQL_TRACE_LOG (Standard: instance/sql_trace.log) schreiben
+        SQL_TRACE=False,
+        SQL_TRACE_THRESHOLD_MS=50,
+        SQL_TRACE_LOG=None,
+        # Startseiten-Daten bis zum nächsten Schreibzugriff cachen; die
+        # Datenversion wird über DATA_VERSION_FILE (Standard:
+        # instance/data_version) zwischen Worker-Prozessen geteilt
+        INDEX_CACHE=True,
+        DATA_VERSION_FILE=None,
+        # CSS/JS gebündelt, minifiziert, mit Hash im Namen und als .gz/.br
+        # unter /assets (immutable); Build beim Start nach ASSETS_DIR
+        # (Standard: instance/assets), sobald sich Quellen ändern
+        ASSETS_ENABLED=True,
+        ASSETS_BUILD=True,
+        ASSETS_DIR=None,
     )
 
     # Test-Config überschreibt alles (z. B. für Tests)
@@ -18,9 +59,48 @@ def create_app(test_config: dict | None = None) -> Flask:
     # Instance-Ordner sicherstellen
     Path(app.instance_path).mkdir(parents=True, exist_ok=True)
 
-    # DB-Initialisierung / Teardown
-    from .db import close_db, get_db
-    app.teardown_appcontext(close_db)
+    # Metriken (Request-Hooks, /metrics)
+    from .metrics import init_metrics
+    init_metrics(app)
+
+    # DB-Initialisierung (Connection-Pool) / Teardown
+    from .db import get_db, init_app as init_db_pool
+    init_db_pool(app)
+
+    from .sqltrace import init_sql_trace
+    init_sql_trace(app)
+
+    # Schema migrieren und Fähigkeiten einmal pro Prozess ermitteln
+    from .schema import init_schema
+    init_schema(app)
+
+    # Datenversion + Seiten-Cache (Startseite)
+    from .services.data_version import init_data_version
+    init_data_version(app)
+
+    # Diagramm-Cache für die Fortschritts-PNGs
+    from .services.chart_cache import init_chart_cache
+    init_chart_cache(app)
+    from .services.prerender import init_prerender
+    init_prerender(app)
+    if app.config.get("CHART_WARMUP"):
+        from .services.charts import warmup as chart_warmup
+        chart_warmup()
+
+    # Gebündelte Stylesheets/Skripte unter /assets
+    from .assets import init_assets
+    init_assets(app)
+
+    # CLI-Kommandos (flask --app app …)
+    from .cli import register_cli
+    register_cli(app)
+
+    # Service Worker muss im Root liegen, damit sein Scope die ganze App umfasst
+    @app.get("/sw.js")
+    def service_worker():
+        resp = app.send_static_file("js/sw.js")
+        resp.headers["Cache-Control"] = "no-cache"
+        return resp
 
     # Healthcheck
     @app.get("/health")
@@ -31,21 +111,26 @@ def create_app(test_config: dict | None = None) -> Flask:
     # Startseite
     @app.get("/")
     def index():
-        db = get_db()
-
-        # Nur aktive Pläne anzeigen
-        plans = db.execute(
-            """
-            SELECT id, name
-              FROM training_plans
-             WHERE deleted_at IS NULL
-             ORDER BY name
-            """
-        ).fetchall()
-
-        # Zuletzt abgeschlossene oder gestartete Session
+        from fitlog.services.data_version import get_page_cache
         from fitlog.services.last_session import get_last_session
-        last_session = get_last_session(db)
+
+        def load():
+            db = get_db()
+            # Nur aktive Pläne anzeigen
+            plans = db.execute(
+                """
+                SELECT id, name
+                  FROM training_plans
+                 WHERE deleted_at IS NULL
+                 ORDER BY name
+                """
+            ).fetchall()
+            # Zuletzt abgeschlossene oder gestartete Session
+            return [dict(p) for p in plans], get_last_session(db)
+
+        # Gecacht bis zum nächsten Schreibzugriff (siehe services/data_version.py)
+        cache = get_page_cache()
+        plans, last_session = cache.get_or_load("index", load) if cache else load()
 
         return render_template("index.html", plans=plans, last_session=last_session)
 
@@ -56,6 +141,12 @@ def create_app(test_config: dict | None = None) -> Flask:
     from .blueprints.sessions import bp as sessions_bp
     app.register_blueprint(sessions_bp)
 
+    from .blueprints.data import bp as data_bp
+    app.register_blueprint(data_bp)
+
+    from .blueprints.exercises import bp as exercises_bp
+    app.register_blueprint(exercises_bp)
+
     from fitlog.routes.progress import progress_bp
     app.register_blueprint(progress_bp)
 
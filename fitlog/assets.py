@@ -0,0 +1,249 @@
+# fitlog/assets.py
+"""
+Asset-Pipeline für CSS/JS: bündeln, minifizieren, fingerprinten, vorkomprimieren.
+
+Jede Seite lädt genau *ein* Stylesheet-Bündel (`BUNDLES`). Beim Build werden
+die Quelldateien aus `static/` zusammengefügt, CSS minifiziert und unter
+einem Namen mit Inhalts-Hash abgelegt (`progress.3f9c0a1b2d4e.css`), dazu
+`.gz` und – falls das Paket `brotli` installiert ist – `.br`. Die Zuordnung
+logischer Name -> Datei steht in `manifest.json`.
+
+Ausgeliefert werden die Dateien unter `/assets/…` mit
+`Cache-Control: public, max-age=31536000, immutable`: Browser fragen sie bis
+zur nächsten Änderung (= neuer Hash im HTML) nicht erneut an.
+
+- Build beim Start, sobald sich eine Quelldatei geändert hat (`ASSETS_BUILD`),
+  oder explizit: `flask --app app assets build`
+- Ausgabe nach `ASSETS_DIR` (Standard: instance/assets)
+- `ASSETS_ENABLED=False` bindet wieder die Einzeldateien aus `static/` ein
+  (zum Debuggen der Styles)
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from flask import Flask, abort, current_app, request, send_file, url_for
+from markupsafe import Markup, escape
+
+try:  # optional: ohne brotli gibt es nur gzip-Varianten
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+# Bündel: logischer Name -> Quelldateien relativ zu static/
+_BASE_CSS = [
+    "css/base.css",
+    "css/components.css",
+    "css/layout.css",
+    "css/utilities.css",
+]
+BUNDLES: Dict[str, List[str]] = {
+    "base.css": _BASE_CSS,
+    "progress.css": _BASE_CSS + ["css/pages/progress.css"],
+    "progress_chart.js": ["js/progress_chart.js"],
+    "exercise_picker.js": ["js/exercise_picker.js"],
+    "sync_queue.js": ["js/sync_queue.js"],
+}
+
+MANIFEST = "manifest.json"
+PIPELINE_VERSION = "1"
+IMMUTABLE = "public, max-age=31536000, immutable"
+_MIMETYPES = {".css": "text/css", ".js": "text/javascript"}
+
+
+# ---------------------------
+# Minifizieren
+# ---------------------------
+
+_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_CSS_WS = re.compile(r"\s+")
+_CSS_PUNCT = re.compile(r"\s*([{};,>])\s*")
+_CSS_COLON = re.compile(r":\s+")
+
+
+def minify_css(css: str) -> str:
+    """
+    Einfacher CSS-Minifier: Kommentare, überflüssige Leerzeichen und das
+    letzte Semikolon eines Blocks entfernen. Leerzeichen *vor* `:` bleiben
+    stehen (`a :hover` ≠ `a:hover`), ebenso Leerzeichen um `+`/`-` (calc).
+    """
+    css = _CSS_COMMENT.sub("", css)
+    css = _CSS_WS.sub(" ", css)
+    css = _CSS_PUNCT.sub(r"\1", css)
+    css = _CSS_COLON.sub(":", css)
+    return css.replace(";}", "}").strip() + "\n"
+
+
+# ---------------------------
+# Build
+# ---------------------------
+
+def _read_bundle(static_dir: Path, files: List[str]) -> str:
+    parts = []
+    for rel in files:
+        parts.append((static_dir / rel).read_text(encoding="utf-8"))
+    return "\n".join(parts)
+
+
+def sources_digest(static_dir: Path) -> str:
+    """Hash über Pipeline-Version, Bündeldefinition und alle Quelldateien."""
+    h = hashlib.sha256(PIPELINE_VERSION.encode())
+    h.update(json.dumps(BUNDLES, sort_keys=True).encode())
+    h.update(b"brotli" if brotli else b"")
+    for rel in sorted({f for files in BUNDLES.values() for f in files}):
+        h.update(rel.encode())
+        h.update((static_dir / rel).read_bytes())
+    return h.hexdigest()
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def load_manifest(out_dir: Path) -> Optional[dict]:
+    try:
+        return json.loads((out_dir / MANIFEST).read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def build_assets(static_dir: Path, out_dir: Path) -> dict:
+    """
+    Alle Bündel bauen und das Manifest schreiben; liefert das Manifest.
+
+    Dateinamen sind inhaltsadressiert, parallele Builds mehrerer Worker
+    schreiben also dieselben Dateien. Dateien des vorherigen Manifests bleiben
+    liegen (noch ausgelieferte HTML-Seiten verweisen evtl. darauf), ältere
+    werden gelöscht.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    previous = load_manifest(out_dir) or {}
+
+    files: Dict[str, str] = {}
+    sizes: Dict[str, Dict[str, int]] = {}
+    for name, sources in BUNDLES.items():
+        stem, ext = os.path.splitext(name)
+        text = _read_bundle(static_dir, sources)
+        if ext == ".css":
+            text = minify_css(text)
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()[:12]
+        filename = f"{stem}.{digest}{ext}"
+
+        target = out_dir / filename
+        variants = {"raw": len(data)}
+        if not target.exists():
+            _write_atomic(target, data)
+        gz = gzip.compress(data, compresslevel=9, mtime=0)
+        _write_atomic(out_dir / f"{filename}.gz", gz)
+        variants["gzip"] = len(gz)
+        if brotli is not None:
+            br = brotli.compress(data, quality=11)
+            _write_atomic(out_dir / f"{filename}.br", br)
+            variants["br"] = len(br)
+
+        files[name] = filename
+        sizes[name] = variants
+
+    manifest = {"sources": sources_digest(static_dir), "files": files, "sizes": sizes}
+    _write_atomic(out_dir / MANIFEST, json.dumps(manifest, indent=2).encode("utf-8"))
+
+    keep = set(files.values()) | set((previous.get("files") or {}).values())
+    for path in out_dir.iterdir():
+        if path.name == MANIFEST or path.name.startswith("."):
+            continue
+        base = path.name.removesuffix(".gz").removesuffix(".br")
+        if base not in keep:
+            path.unlink(missing_ok=True)
+    return manifest
+
+
+def ensure_assets(static_dir: Path, out_dir: Path) -> dict:
+    """Manifest laden und nur neu bauen, wenn sich Quellen geändert haben."""
+    manifest = load_manifest(out_dir)
+    if manifest is None or manifest.get("sources") != sources_digest(static_dir):
+        manifest = build_assets(static_dir, out_dir)
+    return manifest
+
+
+# ---------------------------
+# Flask-Anbindung
+# ---------------------------
+
+def assets_dir(app: Flask) -> Path:
+    return Path(app.config.get("ASSETS_DIR") or Path(app.instance_path) / "assets")
+
+
+def asset_url(name: str) -> str:
+    """URL eines Bündels (mit Hash) bzw. der Einzeldatei, falls Assets aus sind."""
+    manifest = current_app.extensions.get("assets")
+    if manifest is None:
+        return url_for("static", filename=BUNDLES[name][0])
+    return url_for("assets", filename=manifest["files"][name])
+
+
+def stylesheet_tags(name: str) -> Markup:
+    """<link>-Tag(s) eines CSS-Bündels für das Template."""
+    manifest = current_app.extensions.get("assets")
+    if manifest is None:
+        hrefs = [url_for("static", filename=rel) for rel in BUNDLES[name]]
+    else:
+        hrefs = [url_for("assets", filename=manifest["files"][name])]
+    return Markup("\n  ".join(f'<link rel="stylesheet" href="{escape(h)}">' for h in hrefs))
+
+
+def _serve_asset(filename: str):
+    out_dir = assets_dir(current_app)
+    path = (out_dir / filename).resolve()
+    if path.parent != out_dir.resolve() or not path.is_file() or filename == MANIFEST:
+        abort(404)
+
+    encoding = None
+    for enc, suffix in (("br", ".br"), ("gzip", ".gz")):
+        variant = path.with_name(path.name + suffix)
+        if request.accept_encodings[enc] and variant.is_file():
+            path, encoding = variant, enc
+            break
+
+    resp = send_file(
+        path,
+        mimetype=_MIMETYPES.get(Path(filename).suffix, "application/octet-stream"),
+        etag=filename if encoding is None else f"{filename}-{encoding}",
+        max_age=31536000,
+        conditional=True,
+    )
+    resp.headers["Cache-Control"] = IMMUTABLE
+    resp.headers["Vary"] = "Accept-Encoding"
+    if encoding:
+        resp.headers["Content-Encoding"] = encoding
+    return resp
+
+
+def init_assets(app: Flask) -> Optional[dict]:
+    """Template-Helfer und /assets registrieren; ggf. beim Start bauen."""
+    app.jinja_env.globals.update(asset_url=asset_url, stylesheet_tags=stylesheet_tags)
+    if not app.config.get("ASSETS_ENABLED"):
+        return None
+
+    static_dir = Path(app.static_folder)
+    out_dir = assets_dir(app)
+    if app.config.get("ASSETS_BUILD"):
+        manifest = ensure_assets(static_dir, out_dir)
+    else:
+        manifest = load_manifest(out_dir)
+        if manifest is None:
+            app.logger.warning("Kein Asset-Manifest in %s – nutze static/ (flask assets build)", out_dir)
+            return None
+
+    app.extensions["assets"] = manifest
+    app.add_url_rule("/assets/<path:filename>", "assets", _serve_asset)
+    return manifest
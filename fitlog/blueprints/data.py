@@ -0,0 +1,94 @@
+# fitlog/blueprints/data.py
+import csv
+from datetime import date
+
+from flask import Blueprint, Response, current_app, jsonify, request
+
+from ..db import get_db
+from ..services.data_version import bump_data_version
+from ..services.exporter import ExportFilter, iter_export
+from ..services.importer import DEFAULT_CHUNK_SIZE, ImportAborted, import_rows, iter_rows
+
+bp = Blueprint("data", __name__, url_prefix="/data")
+
+_NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+_EXPORT_MIMETYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def _request_format() -> str:
+    """Format aus ?format=… oder dem Content-Type ableiten (Standard: CSV)."""
+    fmt = (request.args.get("format") or "").lower()
+    if fmt:
+        return fmt
+    return "ndjson" if request.mimetype in _NDJSON_TYPES else "csv"
+
+
+# -------------------------------------------------------------------
+# Import: Rohdaten im Request-Body (CSV oder NDJSON), gestreamt gelesen
+#   curl --data-binary @verlauf.csv -H 'Content-Type: text/csv' /data/import
+# -------------------------------------------------------------------
+@bp.post("/import")
+def import_data():
+    fmt = _request_format()
+    if fmt not in ("csv", "ndjson"):
+        return jsonify({"ok": False, "msg": f"Unbekanntes Format: {fmt}"}), 400
+
+    chunk_size = request.args.get("chunk_size", type=int) or DEFAULT_CHUNK_SIZE
+    try:
+        report = import_rows(get_db(), iter_rows(request.stream, fmt), chunk_size=max(1, chunk_size))
+    except ImportAborted as exc:
+        # Teilimport: geschriebene Blöcke sind sichtbar -> Caches verwerfen
+        if exc.report.entries_written:
+            bump_data_version()
+        # kaputte Eingabe (Kodierung, CSV-Syntax) ist ein Client-Fehler
+        status = 400 if isinstance(exc.__cause__, (UnicodeError, csv.Error)) else 500
+        return jsonify({"ok": False, "msg": str(exc), **exc.report.as_dict()}), status
+    bump_data_version()
+    return jsonify({"ok": True, **report.as_dict()})
+
+
+# -------------------------------------------------------------------
+# Export: alle Sessions mit Einträgen, gestreamt
+#   /data/export?format=ndjson&plan_id=1&exercise_id=3&from=2024-01-01&to=2024-12-31
+# -------------------------------------------------------------------
+@bp.get("/export")
+def export_data():
+    fmt = (request.args.get("format") or "csv").lower()
+    if fmt not in _EXPORT_MIMETYPES:
+        return jsonify({"ok": False, "msg": f"Unbekanntes Format: {fmt}"}), 400
+
+    # fromisoformat akzeptiert auch „20240101“ oder „2024-W01-1“; der Filter
+    # vergleicht aber Text -> immer kanonisch als YYYY-MM-DD weitergeben
+    try:
+        date_from, date_to = (
+            date.fromisoformat(value).isoformat() if value else None
+            for value in (request.args.get("from"), request.args.get("to"))
+        )
+    except ValueError:
+        return jsonify({"ok": False, "msg": "from/to erwartet YYYY-MM-DD"}), 400
+
+    filters = ExportFilter(
+        plan_id=request.args.get("plan_id", type=int),
+        exercise_id=request.args.get("exercise_id", type=int),
+        date_from=date_from,
+        date_to=date_to,
+    )
+
+    # Eigene Connection für die Dauer des Streams – der Request-Kontext
+    # (und damit g.db) ist beim Ausliefern des Bodys schon abgebaut.
+    pool = current_app.extensions["db_pool"]
+
+    def generate():
+        conn = pool.acquire()
+        try:
+            for chunk in iter_export(conn, filters, fmt):
+                yield chunk.encode("utf-8")
+        finally:
+            pool.release(conn)
+
+    filename = f"fitlog-export.{fmt}"
+    return Response(
+        generate(),
+        mimetype=_EXPORT_MIMETYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,24 @@
+# fitlog/blueprints/exercises.py
+from flask import Blueprint, jsonify, request
+
+from ..db import get_db
+from ..schema import get_schema
+from ..services.exercise_search import DEFAULT_LIMIT, search_exercises
+
+bp = Blueprint("exercises", __name__, url_prefix="/exercises")
+
+# -------------------------------------------------------------------
+# JSON: Übungssuche für die Auswahlfelder (Typeahead)
+#   GET /exercises/search?q=bank&limit=20&offset=0
+#   -> {"items": [{"id": 3, "name": "Bankdrücken"}, …], "next_offset": 20}
+# -------------------------------------------------------------------
+@bp.get("/search")
+def search():
+    page = search_exercises(
+        get_db(),
+        request.args.get("q", ""),
+        limit=request.args.get("limit", default=DEFAULT_LIMIT, type=int),
+        offset=request.args.get("offset", default=0, type=int),
+        use_fts=get_schema().has_table("exercises_fts"),
+    )
+    return jsonify(page.as_dict())
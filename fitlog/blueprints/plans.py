@@ -6,6 +6,7 @@ from flask import (
     redirect, url_for, flash, abort
 )
 from ..db import get_db  # falls dein db.py woanders liegt ggf. anpassen
+from ..services.data_version import bump_data_version
 
 bp = Blueprint("plans", __name__, url_prefix="/plans")
 
@@ -48,6 +49,7 @@ def create_plan():
     try:
         db.execute("INSERT INTO training_plans (name) VALUES (?)", (name,))
         db.commit()
+        bump_data_version()
         flash(f"Plan „{name}“ erstellt.", "success")
     except sqlite3.IntegrityError:
         # z. B. UNIQUE(name) bei aktiven Plänen
@@ -62,7 +64,11 @@ def create_plan():
 def edit_plan(plan_id: int):
     db = get_db()
     plan = db.execute(
-        "SELECT id, name FROM training_plans WHERE id = ? AND deleted_at IS NULL",
+        """
+        SELECT id, name, carry_over_reps, carry_over_sets
+          FROM training_plans
+         WHERE id = ? AND deleted_at IS NULL
+        """,
         (plan_id,),
     ).fetchone()
     if not plan:
@@ -85,9 +91,8 @@ def edit_plan(plan_id: int):
         (plan_id,),
     ).fetchall()
 
-    all_exercises = db.execute("SELECT id, name FROM exercises ORDER BY name").fetchall()
-
-    return render_template("plans/edit.html", plan=plan, items=items, all_exercises=all_exercises)
+    # Übungskatalog nicht mitrendern: die Auswahl sucht per /exercises/search
+    return render_template("plans/edit.html", plan=plan, items=items)
 
 # -------------------------------------------------------------------
 # Änderungen speichern -> danach zur Startseite (/)
@@ -100,7 +105,17 @@ def update_plan(plan_id: int):
         flash("Bitte einen Plan-Namen angeben.", "error")
         return redirect(url_for("plans.edit_plan", plan_id=plan_id))
 
-    db.execute("UPDATE training_plans SET name = ? WHERE id = ?", (name, plan_id))
+    # Checkboxen: Wdh./Sätze beim Beenden einer Session als Defaults übernehmen
+    carry_reps = 1 if request.form.get("carry_over_reps") else 0
+    carry_sets = 1 if request.form.get("carry_over_sets") else 0
+    db.execute(
+        """
+        UPDATE training_plans
+           SET name = ?, carry_over_reps = ?, carry_over_sets = ?
+         WHERE id = ?
+        """,
+        (name, carry_reps, carry_sets, plan_id),
+    )
 
     ex_ids    = request.form.getlist("exercise_id[]", type=int)
     positions = request.form.getlist("position[]", type=int)
@@ -125,6 +140,7 @@ def update_plan(plan_id: int):
         )
 
     db.commit()
+    bump_data_version()
     flash("Plan gespeichert.", "success")
     return redirect(url_for("index"))
 
@@ -186,4 +202,5 @@ def delete_plan(plan_id: int):
         (datetime.utcnow().isoformat(timespec="seconds"), plan_id),
     )
     db.commit()
+    bump_data_version()
     return jsonify({"ok": True, "msg": f"Plan „{plan['name']}“ archiviert."})
@@ -1,31 +1,26 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 import sqlite3
 
 from flask import (
-    Blueprint, current_app, render_template, request,
-    redirect, url_for, abort, flash
+    Blueprint, render_template, request,
+    redirect, url_for, abort, flash, jsonify
 )
+
+from ..db import get_db
+from ..services.data_version import bump_data_version
+from ..services.record_parser import PATCH_FIELDS, EntryRow, decode_entry_changes, decode_record_form
+from ..services.prerender import schedule_session_charts
+from ..services.rollup import RollupKey, refresh_rollup, session_rollup_keys
+
 bp = Blueprint("sessions", __name__, url_prefix="/sessions")
 
 
 # ------------------------------
-# DB Infrastruktur
+# Helfer
 # ------------------------------
-def get_db() -> sqlite3.Connection:
-    """Open a SQLite connection with row_factory=Row and FK enabled."""
-    db_path = current_app.config.get("DATABASE")
-    if not db_path:
-        from pathlib import Path
-        db_path = str(Path(current_app.instance_path) / "fitlog.db")
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON;")
-    return conn
-
-
 def _utcnow_iso() -> str:
     """UTC timestamp ISO (seconds)."""
     return (
@@ -36,15 +31,6 @@ def _utcnow_iso() -> str:
     )
 
 
-# ------------------------------
-# Schema-Helfer (robust bei optionalen Spalten)
-# ------------------------------
-def _table_has_column(db: sqlite3.Connection, table: str, column: str) -> bool:
-    """True, falls Tabelle 'table' eine Spalte 'column' besitzt."""
-    rows = db.execute(f"PRAGMA table_info({table})").fetchall()
-    return any(r["name"].lower() == column.lower() for r in rows)
-
-
 # ------------------------------
 # Loader
 # ------------------------------
@@ -76,21 +62,15 @@ def _load_record_items(db: sqlite3.Connection, session_id: int) -> List[sqlite3.
       - Prefill-Priorität: session_entries > plan_exercises-Defaults
       - Notiz-Fallback: session_entries.note > plan_exercises.note > ''
       - Sätze: COALESCE(se.sets, pe.default_sets, 3)
-        (Spalten 'sets' / 'default_sets' sind optional und werden nur gelesen, wenn vorhanden)
+        (Spalten 'sets' / 'default_sets' garantiert Migration 0002)
     """
-    has_se_sets = _table_has_column(db, "session_entries", "sets")
-    has_pe_sets = _table_has_column(db, "plan_exercises", "default_sets")
-
-    se_sets_expr = "se.sets" if has_se_sets else "NULL"
-    pe_sets_expr = "pe.default_sets" if has_pe_sets else "NULL"
-
-    sql = f"""
+    sql = """
         SELECT
             e.id   AS exercise_id,
             e.name AS name,
 
             /* Sätze mit robustem Fallback auf 3 */
-            COALESCE({se_sets_expr}, {pe_sets_expr}, 3) AS sets,
+            COALESCE(se.sets, pe.default_sets, 3) AS sets,
 
             COALESCE(se.reps,      pe.default_reps,       10) AS reps,
             COALESCE(se.weight_kg, pe.default_weight_kg,   0) AS weight_kg,
@@ -112,49 +92,51 @@ def _update_plan_defaults_from_session(
     plan_id: int,
     session_id: int,
 ) -> None:
-    """Update per-plan default weights from the latest session.
+    """Update per-plan defaults from the latest session.
 
     Für jede Übung, die in dieser Session mit einem positiven Gewicht
     geloggt wurde, wird das entsprechende `default_weight_kg` im
-    `plan_exercises`-Eintrag des zugehörigen Plans aktualisiert.
+    `plan_exercises`-Eintrag des zugehörigen Plans aktualisiert. Ist im
+    Plan `carry_over_reps` bzw. `carry_over_sets` gesetzt, werden auch
+    positive Wiederholungen/Sätze als neue Defaults übernommen.
 
     Effekt: Beim nächsten Training werden automatisch die zuletzt
-    geschafften Gewichte als Standard vorgeschlagen.
+    geschafften Werte als Standard vorgeschlagen.
+
+    Ein einziges, mengenbasiertes UPDATE … FROM (SQLite >= 3.33) – die
+    Kosten sind unabhängig von der Anzahl der Übungen im Plan.
     """
-    rows = db.execute(
+    db.execute(
         """
-        SELECT exercise_id, weight_kg
-          FROM session_entries
-         WHERE session_id = ?
-           AND weight_kg IS NOT NULL
+        UPDATE plan_exercises AS pe
+           SET default_weight_kg = CASE WHEN se.weight_kg > 0
+                                        THEN se.weight_kg
+                                        ELSE pe.default_weight_kg END,
+               default_reps      = CASE WHEN tp.carry_over_reps AND se.reps > 0
+                                        THEN se.reps
+                                        ELSE pe.default_reps END,
+               default_sets      = CASE WHEN tp.carry_over_sets AND se.sets > 0
+                                        THEN se.sets
+                                        ELSE pe.default_sets END
+          FROM session_entries se
+          JOIN training_plans tp ON tp.id = :plan_id
+         WHERE se.session_id   = :session_id
+           AND pe.plan_id      = :plan_id
+           AND pe.exercise_id  = se.exercise_id
+           AND (se.weight_kg > 0
+                OR (tp.carry_over_reps AND se.reps > 0)
+                OR (tp.carry_over_sets AND se.sets > 0))
         """,
-        (session_id,),
-    ).fetchall()
-
-    for row in rows:
-        weight = row["weight_kg"]
-        ex_id = row["exercise_id"]
-
-        # Nur sinnvolle, positive Gewichte übernehmen
-        try:
-            w = float(weight)
-        except (TypeError, ValueError):
-            continue
-        if w <= 0:
-            continue
-
-        db.execute(
-            """
-            UPDATE plan_exercises
-               SET default_weight_kg = ?
-             WHERE plan_id     = ?
-               AND exercise_id = ?
-            """,
-            (w, plan_id, ex_id),
-        )
+        {"plan_id": plan_id, "session_id": session_id},
+    )
 
 
-def _upsert_entries(db: sqlite3.Connection, session_id: int, form: Dict[str, Any]) -> None:
+def _upsert_entries(
+    db: sqlite3.Connection,
+    session_id: int,
+    form: Dict[str, Any],
+    now: Optional[str] = None,
+) -> List[str]:
     """
     Write one aggregate row per exercise into session_entries.
     Unterstützte Formnamen:
@@ -163,139 +145,171 @@ def _upsert_entries(db: sqlite3.Connection, session_id: int, form: Dict[str, Any
 
     Besonderheiten:
       - Sätze 0..99 (0 = Übung ausgelassen -> kein Speichern)
-      - Spalte 'sets' ist optional: wird nur beschrieben, wenn vorhanden
+      - Formular wird in einem Durchlauf decodiert (`decode_record_form`);
+        Löschungen und Upserts laufen gesammelt per executemany in der
+        Transaktion des Aufrufers
+      - ein Zeitstempel (`now`) für den gesamten Submit
+
+    Liefert die Validierungsfehler der Zeilen (gespeichert wird trotzdem,
+    mit den Ersatzwerten des Decoders).
     """
-    # Parser (falls vorhanden) darf liefern; ansonsten fallen wir auf eigenes Parsing zurück
-    try:
-        from fitlog.services.record_parser import parse_exercises_form
-        parsed = parse_exercises_form(form)  # Dict[int, Dict[str, Any]]
-    except Exception:
-        parsed = {}
+    rows = decode_record_form(form)
+    if not rows:
+        return []
+    if now is None:
+        now = _utcnow_iso()
+
+    deletes = []
+    upserts = []
+    for row in rows:
+        if row.skipped:
+            # evtl. vorhandenen Eintrag löschen, damit „auslassen“ eindeutig ist
+            deletes.append((session_id, row.exercise_id))
+        else:
+            upserts.append((
+                session_id,
+                row.exercise_id,
+                row.weight,
+                row.reps,
+                row.sets if row.sets is not None else 3,
+                row.note,
+                now,
+            ))
+
+    if deletes:
+        db.executemany(
+            "DELETE FROM session_entries WHERE session_id = ? AND exercise_id = ?",
+            deletes,
+        )
+    if upserts:
+        db.executemany(
+            """
+            INSERT INTO session_entries (session_id, exercise_id, weight_kg, reps, sets, note, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(session_id, exercise_id) DO UPDATE SET
+              weight_kg = excluded.weight_kg,
+              reps      = excluded.reps,
+              sets      = excluded.sets,
+              note      = excluded.note,
+              created_at= excluded.created_at
+            """,
+            upserts,
+        )
+    return [f"Übung {row.exercise_id}: {err}" for row in rows for err in row.errors]
+
+
+def _flash_form_errors(errors: List[str]) -> None:
+    if errors:
+        flash("Ungültige Eingaben wurden korrigiert – " + "; ".join(errors[:5]), "error")
 
-    has_se_sets = _table_has_column(db, "session_entries", "sets")
 
-    # Alle exercise_ids aus dem Formular
-    exercise_ids = request.form.getlist("exercise_id")
-    # Fallback: falls Template keine hidden exercise_id setzt, versuche IDs aus Keys zu parsen
+def _plan_exercise_ids(db: sqlite3.Connection, plan_id: int, exercise_ids: List[int]) -> set:
+    """Welche der `exercise_ids` gehören zum Plan?"""
     if not exercise_ids:
-        # Suche nach ex[<id>][...] oder <field>_<id>
-        for key in form.keys():
-            if key.startswith("ex["):
-                try:
-                    part = key.split("[", 1)[1]
-                    ex_id = int(part.split("]")[0])
-                    exercise_ids.append(str(ex_id))
-                except Exception:
-                    pass
-            elif "_" in key:
-                suffix = key.rsplit("_", 1)[-1]
-                if suffix.isdigit():
-                    exercise_ids.append(suffix)
-        # deduplizieren
-        exercise_ids = sorted(set(exercise_ids), key=lambda x: int(x) if x.isdigit() else 0)
-
-    for raw_id in exercise_ids:
-        try:
-            ex_id = int(raw_id)
-        except ValueError:
-            continue
+        return set()
+    rows = db.execute(
+        f"SELECT exercise_id FROM plan_exercises WHERE plan_id = ? "
+        f"AND exercise_id IN ({','.join('?' * len(exercise_ids))})",
+        (plan_id, *exercise_ids),
+    )
+    return {r[0] for r in rows}
 
-        # Keys der flachen Form
-        sets_key   = f"sets_{ex_id}"
-        reps_key   = f"reps_{ex_id}"
-        weight_key = f"weight_{ex_id}"
-        note_key   = f"note_{ex_id}"
-
-        # Basiswerte
-        sets_val: Optional[int] = None
-        reps: Optional[int] = None
-        weight: Optional[float] = None
-        note: str = ""
-
-        # 1. Versuch: geparstes Dict verwenden
-        payload: Dict[str, Any] = parsed.get(ex_id, {})
-
-        if "sets" in payload:
-            try:
-                sets_val = int(payload.get("sets"))
-            except (TypeError, ValueError):
-                sets_val = None
-        elif sets_key in form:
-            raw_sets = form.get(sets_key)
-            if raw_sets:
-                try:
-                    sets_val = int(raw_sets)
-                except ValueError:
-                    sets_val = None
-
-        if "reps" in payload:
-            try:
-                reps = int(payload.get("reps"))
-            except (TypeError, ValueError):
-                reps = None
-        elif reps_key in form:
-            raw_reps = form.get(reps_key)
-            if raw_reps:
-                try:
-                    reps = int(raw_reps)
-                except ValueError:
-                    reps = None
-
-        if "weight" in payload:
-            try:
-                weight = float(str(payload.get("weight")).replace(",", "."))
-            except (TypeError, ValueError):
-                weight = None
-        elif weight_key in form:
-            raw_weight = form.get(weight_key)
-            if raw_weight:
-                try:
-                    weight = float(str(raw_weight).replace(",", "."))
-                except ValueError:
-                    weight = None
-
-        if note_key in form:
-            note = str(form.get(note_key) or "").strip()
-        if "note" in payload:
-            note = str(payload.get("note", note) or "").strip()
-
-        # Wenn Sätze explizit 0 -> Übung ausgelassen -> keinen Datensatz speichern
-        if sets_val is not None and sets_val == 0:
-            # evtl. vorhandenen Eintrag löschen, damit „auslassen“ eindeutig ist
+
+def _apply_entry_changes(
+    db: sqlite3.Connection,
+    session_id: int,
+    plan_id: int,
+    changes: Dict[int, EntryRow],
+    now: str,
+) -> Tuple[List[int], List[int], Set[RollupKey]]:
+    """
+    Geänderte Felder einzelner Übungen schreiben (Autosave/Offline-Sync).
+
+    Je Übung genau ein Statement: Upsert, der nur die gesendeten Spalten
+    überschreibt (fehlende Werte einer neuen Zeile kommen aus den
+    Plan-Defaults wie beim Prefill), bzw. DELETE bei `sets: 0` (ausgelassen).
+    Liefert (gespeichert, gelöscht, Rollup-Schlüssel vorher + nachher); die
+    Rollups und den Commit übernimmt der Aufrufer.
+    """
+    ids = sorted(changes)
+    rollup_keys = session_rollup_keys(db, session_id, ids)
+    saved, deleted = [], []
+    for exercise_id in ids:
+        fields = changes[exercise_id].present()
+        if fields.get("sets") == 0:
             db.execute(
                 "DELETE FROM session_entries WHERE session_id = ? AND exercise_id = ?",
-                (session_id, ex_id),
+                (session_id, exercise_id),
             )
+            deleted.append(exercise_id)
             continue
 
-        # Dynamisches INSERT/UPSERT (mit optionaler Spalte 'sets')
-        values = [session_id, ex_id, weight, reps, note, _utcnow_iso()]
-        if has_se_sets:
-            # wir fügen 'sets' vor 'note' ein (Reihenfolge egal, aber semantisch schöner)
-            insert_vals = [session_id, ex_id, weight, reps, (sets_val if sets_val is not None else 3), note, _utcnow_iso()]
-            sql = """
-                INSERT INTO session_entries (session_id, exercise_id, weight_kg, reps, sets, note, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(session_id, exercise_id) DO UPDATE SET
-                  weight_kg = excluded.weight_kg,
-                  reps      = excluded.reps,
-                  sets      = excluded.sets,
-                  note      = excluded.note,
-                  created_at= excluded.created_at
-            """
-            db.execute(sql, insert_vals)
-        else:
-            # kein 'sets' in Tabelle -> altes, kompatibles Verhalten
-            sql = """
-                INSERT INTO session_entries (session_id, exercise_id, weight_kg, reps, note, created_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-                ON CONFLICT(session_id, exercise_id) DO UPDATE SET
-                  weight_kg = excluded.weight_kg,
-                  reps      = excluded.reps,
-                  note      = excluded.note,
-                  created_at= excluded.created_at
-            """
-            db.execute(sql, values)
+        params = {
+            "session_id": session_id,
+            "plan_id": plan_id,
+            "exercise_id": exercise_id,
+            "now": now,
+            **{f: fields.get(f) for f in PATCH_FIELDS},
+        }
+        updates = ",\n              ".join(
+            f"{PATCH_FIELDS[f]} = excluded.{PATCH_FIELDS[f]}" for f in fields
+        )
+        db.execute(
+            f"""
+            INSERT INTO session_entries (session_id, exercise_id, weight_kg, reps, sets, note, created_at)
+            SELECT :session_id, pe.exercise_id,
+                   COALESCE(:weight, pe.default_weight_kg, 0),
+                   COALESCE(:reps, pe.default_reps, 10),
+                   COALESCE(:sets, pe.default_sets, 3),
+                   COALESCE(:note, ''),
+                   :now
+              FROM plan_exercises pe
+             WHERE pe.plan_id = :plan_id AND pe.exercise_id = :exercise_id
+            ON CONFLICT(session_id, exercise_id) DO UPDATE SET
+              {updates},
+              created_at = excluded.created_at
+            """,
+            params,
+        )
+        saved.append(exercise_id)
+
+    # neue/aktualisierte Einträge liegen alle am Tag von `now`
+    rollup_keys |= {(exercise_id, plan_id, now[:10]) for exercise_id in saved}
+    return saved, deleted, rollup_keys
+
+
+def _close_session(
+    db: sqlite3.Connection,
+    sess: sqlite3.Row,
+    raw_minutes: Any,
+    now: str,
+) -> None:
+    """Ende setzen (optional aus Dauer in Minuten) und Plan-Defaults übernehmen."""
+    session_id = sess["id"]
+    if raw_minutes:
+        try:
+            mins = max(0.0, float(str(raw_minutes).replace(",", ".").strip()))
+        except ValueError:
+            mins = 0.0
+    else:
+        mins = 0.0
+
+    if mins > 0.0:
+        try:
+            start_dt = datetime.fromisoformat(sess["started_at"])
+        except Exception:
+            start_dt = datetime.utcnow()
+        ended_at_iso = (start_dt + timedelta(minutes=mins)).isoformat(timespec="seconds")
+        db.execute("UPDATE sessions SET ended_at = ? WHERE id = ?", (ended_at_iso, session_id))
+    else:
+        # klassischer „Training beenden“-Klick -> Ende jetzt, falls nicht schon gesetzt
+        db.execute(
+            "UPDATE sessions SET ended_at = COALESCE(ended_at, ?) WHERE id = ?",
+            (now, session_id),
+        )
+
+    # Nach Abschluss der Session: Standardgewichte im Plan aktualisieren
+    _update_plan_defaults_from_session(db, sess["plan_id"], session_id)
 
 
 # ------------------------------
@@ -309,7 +323,6 @@ def new_session():
     # plan_id aus Query-Param (?plan_id=...)
     plan_id = request.args.get("plan_id", type=int)
     if plan_id is None:
-        db.close()
         abort(400, description="plan_id is required")
 
     # prüfen, ob Plan existiert
@@ -319,7 +332,6 @@ def new_session():
     ).fetchone()
 
     if not plan:
-        db.close()
         abort(404)
 
     started_at = _utcnow_iso()
@@ -329,7 +341,6 @@ def new_session():
     )
     session_id = cur.lastrowid
     db.commit()
-    db.close()
 
     return redirect(url_for("sessions.record_session", session_id=session_id))
 
@@ -341,7 +352,6 @@ def record_session(session_id: int):
     db = get_db()
     sess = _load_session(db, session_id)
     items = _load_record_items(db, session_id)
-    db.close()
     return render_template(
         "sessions/record.html",
         session=sess,  # optional alias, falls irgendwo 'session' verwendet wird
@@ -356,53 +366,234 @@ def record_session_post(session_id: int):
     """Zwischenspeichern der Eingaben, Session bleibt offen."""
     db = get_db()
     _ = _load_session(db, session_id)
-    _upsert_entries(db, session_id, request.form)
+    rollup_keys = session_rollup_keys(db, session_id)
+    errors = _upsert_entries(db, session_id, request.form)
+    refresh_rollup(db, rollup_keys | session_rollup_keys(db, session_id))
     db.commit()
-    db.close()
+    _flash_form_errors(errors)
     flash("Zwischenspeicherung erfolgreich", "success")
     return redirect(url_for("sessions.record_session", session_id=session_id))
 
 
+@bp.patch("/<int:session_id>/entries")
+def patch_entries(session_id: int):
+    """
+    Autosave aus record.html: nur geänderte Felder einzelner Übungen (JSON).
+
+      PATCH /sessions/<id>/entries
+      {"entries": [{"exercise_id": 3, "weight": 42.5}, {"exercise_id": 5, "sets": 0}]}
+
+    Kein Redirect, kein Neurendern der Seite (siehe `_apply_entry_changes`).
+    """
+    changes, errors = decode_entry_changes(request.get_json(silent=True))
+    if errors:
+        return jsonify({"ok": False, "errors": errors}), 400
+    if not changes:
+        return jsonify({"ok": True, "saved": [], "deleted": []})
+
+    db = get_db()
+    sess = _load_session(db, session_id)
+    known = _plan_exercise_ids(db, sess["plan_id"], sorted(changes))
+    unknown = [i for i in sorted(changes) if i not in known]
+    if unknown:
+        return jsonify({"ok": False, "errors": [f"Übung {i} gehört nicht zum Plan" for i in unknown]}), 422
+
+    now = _utcnow_iso()
+    saved, deleted, rollup_keys = _apply_entry_changes(db, session_id, sess["plan_id"], changes, now)
+    refresh_rollup(db, rollup_keys)
+    db.commit()
+    return jsonify({"ok": True, "saved": saved, "deleted": deleted, "saved_at": now})
+
+
+# ------------------------------
+# Offline-Sync
+# ------------------------------
+MAX_SYNC_MUTATIONS = 500
+SYNC_KEY_RETENTION_DAYS = 30
+
+
+def _mutation_time(mutation: Dict[str, Any], sess: sqlite3.Row, now: str) -> str:
+    """
+    Zeitpunkt einer Offline-Mutation: `queued_at` des Clients (wann die
+    Änderung erfasst wurde), begrenzt auf [Session-Start, Server-Zeit].
+    Fehlt er oder ist er ungültig, gilt die Server-Zeit.
+    """
+    raw = mutation.get("queued_at")
+    if not isinstance(raw, str):
+        return now
+    try:
+        at = datetime.fromisoformat(raw)
+    except ValueError:
+        return now
+    if at.tzinfo is not None:
+        at = at.astimezone(timezone.utc).replace(tzinfo=None)
+    at = min(at.replace(microsecond=0), datetime.fromisoformat(now))
+    try:
+        at = max(at, datetime.fromisoformat(sess["started_at"]))
+    except (TypeError, ValueError):
+        pass
+    return at.isoformat(timespec="seconds")
+
+
+def _apply_mutation(
+    db: sqlite3.Connection,
+    mutation: Dict[str, Any],
+    sessions: Dict[int, Optional[sqlite3.Row]],
+    now: str,
+    rollup_keys: Set[RollupKey],
+) -> List[str]:
+    """Eine Offline-Mutation anwenden; liefert Fehler (dann wurde nichts geschrieben)."""
+    try:
+        session_id = int(mutation.get("session_id"))
+    except (TypeError, ValueError):
+        return ["session_id: expected an integer"]
+    if session_id not in sessions:
+        sessions[session_id] = db.execute(
+            "SELECT id, plan_id, started_at, ended_at FROM sessions WHERE id = ?", (session_id,)
+        ).fetchone()
+    sess = sessions[session_id]
+    if sess is None:
+        return [f"Session {session_id} existiert nicht (abgebrochen?)"]
+
+    # offline erfasst und später synchronisiert: Einträge und Trainingsende
+    # auf den Zeitpunkt der Erfassung datieren, nicht auf den des Syncs
+    at = _mutation_time(mutation, sess, now)
+    kind = mutation.get("type")
+    if kind == "entries":
+        changes, errors = decode_entry_changes(mutation)
+        if errors:
+            return errors
+        known = _plan_exercise_ids(db, sess["plan_id"], sorted(changes))
+        unknown = [i for i in sorted(changes) if i not in known]
+        if unknown:
+            return [f"Übung {i} gehört nicht zum Plan" for i in unknown]
+        _, _, keys = _apply_entry_changes(db, session_id, sess["plan_id"], changes, at)
+        rollup_keys |= keys
+        return []
+    if kind == "finish":
+        rollup_keys |= session_rollup_keys(db, session_id)
+        _close_session(db, sess, mutation.get("duration_minutes"), at)
+        rollup_keys |= session_rollup_keys(db, session_id)
+        return []
+    return [f"type: unbekannt ({kind!r})"]
+
+
+@bp.post("/sync")
+def sync_mutations():
+    """
+    Offline-Warteschlange aus record.html in einem Rutsch übernehmen.
+
+      POST /sessions/sync
+      {"mutations": [
+        {"key": "<uuid>", "session_id": 12, "type": "entries",
+         "queued_at": "2024-05-01T19:30:00Z",
+         "entries": [{"exercise_id": 3, "weight": 42.5, "reps": 8}]},
+        {"key": "<uuid>", "session_id": 12, "type": "finish", "duration_minutes": 45,
+         "queued_at": "2024-05-01T19:41:00Z"}
+      ]}
+
+    Alle Mutationen laufen in *einer* Transaktion (BEGIN IMMEDIATE, damit
+    parallele Wiederholungen desselben Batches sich serialisieren) und in
+    der gesendeten Reihenfolge. Der Idempotenz-Schlüssel (`key`) wird in
+    `sync_mutations` festgehalten: bereits bekannte Schlüssel werden als
+    `duplicate` bestätigt, ohne erneut zu schreiben. Ungültige Mutationen
+    werden als `rejected` gemeldet (und ebenfalls gemerkt), damit der Client
+    sie aus seiner Warteschlange nehmen kann. Rollups werden einmal am Ende
+    für alle betroffenen Schlüssel nachgezogen. `queued_at` (Erfassungszeit
+    beim Client) datiert Einträge und Trainingsende, siehe `_mutation_time`.
+    """
+    payload = request.get_json(silent=True)
+    mutations = payload.get("mutations") if isinstance(payload, dict) else None
+    if not isinstance(mutations, list):
+        return jsonify({"ok": False, "errors": ['expected {"mutations": [...]}']}), 400
+    if len(mutations) > MAX_SYNC_MUTATIONS:
+        return jsonify({"ok": False, "errors": [f"höchstens {MAX_SYNC_MUTATIONS} Mutationen je Request"]}), 413
+
+    keys = [m.get("key") for m in mutations if isinstance(m, dict) and isinstance(m.get("key"), str)]
+    db = get_db()
+    now = _utcnow_iso()
+    db.execute("BEGIN IMMEDIATE")
+    try:
+        known = {}
+        if keys:
+            known = dict(db.execute(
+                f"SELECT idempotency_key, status FROM sync_mutations "
+                f"WHERE idempotency_key IN ({','.join('?' * len(keys))})",
+                keys,
+            ).fetchall())
+
+        results: List[Dict[str, Any]] = []
+        sessions: Dict[int, Optional[sqlite3.Row]] = {}
+        rollup_keys: Set[RollupKey] = set()
+        log_rows = []
+        finished: List[sqlite3.Row] = []
+        for pos, mutation in enumerate(mutations):
+            key = mutation.get("key") if isinstance(mutation, dict) else None
+            if not isinstance(key, str) or not 1 <= len(key) <= 100:
+                results.append({"key": key, "status": "rejected",
+                                "errors": [f"mutations[{pos}].key: 1..100 Zeichen erwartet"]})
+                continue
+            if key in known:
+                results.append({"key": key, "status": "duplicate"})
+                continue
+
+            errors = _apply_mutation(db, mutation, sessions, now, rollup_keys)
+            status = "rejected" if errors else "applied"
+            known[key] = status
+            log_rows.append((key, mutation.get("session_id"), str(mutation.get("type")), status, now))
+            results.append({"key": key, "status": status, **({"errors": errors} if errors else {})})
+            if not errors and mutation.get("type") == "finish":
+                finished.append(sessions[int(mutation["session_id"])])
+
+        refresh_rollup(db, rollup_keys)
+        if log_rows:
+            db.executemany(
+                """
+                INSERT INTO sync_mutations (idempotency_key, session_id, kind, status, applied_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                log_rows,
+            )
+        cutoff = (datetime.fromisoformat(now) - timedelta(days=SYNC_KEY_RETENTION_DAYS)).isoformat(timespec="seconds")
+        db.execute("DELETE FROM sync_mutations WHERE applied_at < ?", (cutoff,))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    if finished:
+        bump_data_version()
+        for sess in finished:
+            schedule_session_charts(sess["id"], sess["plan_id"])
+        flash("Training wurde gespeichert", "success")
+
+    counts = {s: sum(r["status"] == s for r in results) for s in ("applied", "duplicate", "rejected")}
+    return jsonify({"ok": True, "results": results, **counts})
+
+
 @bp.post("/<int:session_id>/finish")
 def finish_session(session_id: int):
     """Training speichern & beenden."""
     db = get_db()
     sess = _load_session(db, session_id)
-    _upsert_entries(db, session_id, request.form)
+    rollup_keys = session_rollup_keys(db, session_id)
+    now = _utcnow_iso()
+    errors = _upsert_entries(db, session_id, request.form, now)
 
-    # Optional: Dauer in Minuten
-    raw_minutes = request.form.get("duration_minutes_override")
-    if not raw_minutes:
-        # Alias unterstützen (z. B. neues Template-Feld 'duration_minutes')
-        raw_minutes = request.form.get("duration_minutes")
+    # Optional: Dauer in Minuten (Alias 'duration_minutes' aus dem neuen Template-Feld)
+    raw_minutes = request.form.get("duration_minutes_override") or request.form.get("duration_minutes")
+    _close_session(db, sess, raw_minutes, now)
 
-    if raw_minutes:
-        try:
-            mins = max(0.0, float(str(raw_minutes).replace(",", ".").strip()))
-        except ValueError:
-            mins = 0.0
-    else:
-        mins = 0.0
+    # Tages-Rollups der betroffenen (Übung, Plan, Tag)-Schlüssel nachziehen
+    refresh_rollup(db, rollup_keys | session_rollup_keys(db, session_id))
 
-    if mins > 0.0:
-        try:
-            start_dt = datetime.fromisoformat(sess["started_at"])
-        except Exception:
-            start_dt = datetime.utcnow()
-        ended_at_iso = (start_dt + timedelta(minutes=mins)).isoformat(timespec="seconds")
-        db.execute("UPDATE sessions SET ended_at = ? WHERE id = ?", (ended_at_iso, session_id))
-    else:
-        # klassischer „Training beenden“-Klick -> Ende jetzt, falls nicht schon gesetzt
-        db.execute(
-            "UPDATE sessions SET ended_at = COALESCE(ended_at, ?) WHERE id = ?",
-            (_utcnow_iso(), session_id),
-        )
+    db.commit()
+    bump_data_version()
 
-    # Nach Abschluss der Session: Standardgewichte im Plan aktualisieren
-    _update_plan_defaults_from_session(db, sess["plan_id"], session_id)
+    # Plan- und Übungsdiagramme im Hintergrund für den nächsten Besuch rendern
+    schedule_session_charts(session_id, sess["plan_id"])
 
-    db.commit()
-    db.close()
+    _flash_form_errors(errors)
     flash("Training wurde gespeichert", "success")
     return redirect(url_for("index"))
 
@@ -412,9 +603,11 @@ def abort_session(session_id: int):
     """Training abbrechen – löscht Session und Einträge."""
     db = get_db()
     _ = _load_session(db, session_id)
+    rollup_keys = session_rollup_keys(db, session_id)
     db.execute("DELETE FROM session_entries WHERE session_id = ?", (session_id,))
     db.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+    refresh_rollup(db, rollup_keys)
     db.commit()
-    db.close()
+    bump_data_version()
     flash("Training abgebrochen.", "info")
     return redirect(url_for("index"))
@@ -0,0 +1,170 @@
+# fitlog/cli.py
+"""
+Flask-CLI-Kommandos für FitLog.
+
+Aufruf z. B.:
+    flask --app app rollup rebuild
+    flask --app app data import verlauf.csv
+    flask --app app data export --format ndjson -o verlauf.ndjson
+    flask --app app sqltrace summary --top 10
+    flask --app app assets build
+"""
+
+from __future__ import annotations
+
+import time
+
+import click
+from flask import Flask
+from flask.cli import AppGroup
+
+from .db import get_db
+
+rollup_cli = AppGroup("rollup", help="Tages-Rollups (exercise_daily_stats) pflegen.")
+
+
+@rollup_cli.command("rebuild")
+def rollup_rebuild() -> None:
+    """Rollup-Tabelle vollständig aus session_entries neu aufbauen."""
+    from .services.rollup import rebuild_rollup
+
+    db = get_db()
+    t0 = time.perf_counter()
+    rows = rebuild_rollup(db)
+    db.commit()
+    click.echo(f"exercise_daily_stats neu aufgebaut: {rows} Zeilen in {time.perf_counter() - t0:.2f}s")
+
+
+data_cli = AppGroup("data", help="Trainingsdaten importieren und exportieren.")
+
+
+@data_cli.command("import")
+@click.argument("source", type=click.File("rb"))
+@click.option("--format", "fmt", type=click.Choice(["csv", "ndjson"]), default=None,
+              help="Dateiformat; Standard: aus der Dateiendung (.csv, .ndjson/.jsonl).")
+@click.option("--chunk-size", type=int, default=None,
+              help="Zeilen pro Transaktion (Standard: 5000).")
+def data_import(source, fmt: str | None, chunk_size: int | None) -> None:
+    """Historische Einträge aus CSV/NDJSON importieren (SOURCE oder - für stdin)."""
+    from .services.data_version import bump_data_version
+    from .services.importer import DEFAULT_CHUNK_SIZE, ImportAborted, import_rows, iter_rows
+
+    if fmt is None:
+        name = (getattr(source, "name", "") or "").lower()
+        fmt = "ndjson" if name.endswith((".ndjson", ".jsonl")) else "csv"
+
+    def _progress(report) -> None:
+        click.echo(f"  {report.rows_read} Zeilen, {report.rows_per_second:.0f} Zeilen/s", err=True)
+
+    try:
+        report = import_rows(
+            get_db(),
+            iter_rows(source, fmt),
+            chunk_size=chunk_size or DEFAULT_CHUNK_SIZE,
+            progress=_progress,
+        )
+    except ImportAborted as exc:
+        if exc.report.entries_written:
+            bump_data_version()
+        raise click.ClickException(
+            f"{exc} – {exc.report.entries_written} Einträge wurden bereits geschrieben."
+        ) from exc
+    bump_data_version()
+    click.echo(
+        f"{report.entries_written} Einträge aus {report.rows_read} Zeilen importiert "
+        f"({report.sessions_created} neue und {report.sessions_matched} vorhandene Sessions, {report.exercises_created} neue Übungen, "
+        f"{report.plans_created} neue Pläne) in {report.seconds:.2f}s "
+        f"= {report.rows_per_second:.0f} Zeilen/s"
+    )
+    if report.error_count:
+        click.echo(f"{report.error_count} Zeilen übersprungen:", err=True)
+        for msg in report.errors:
+            click.echo(f"  {msg}", err=True)
+
+
+@data_cli.command("export")
+@click.option("--format", "fmt", type=click.Choice(["csv", "ndjson"]), default="csv")
+@click.option("--plan-id", type=int, default=None)
+@click.option("--exercise-id", type=int, default=None)
+@click.option("--from", "date_from", type=click.DateTime(["%Y-%m-%d"]), default=None)
+@click.option("--to", "date_to", type=click.DateTime(["%Y-%m-%d"]), default=None)
+@click.option("-o", "--output", type=click.File("w", encoding="utf-8"), default="-",
+              help="Zieldatei (Standard: stdout).")
+def data_export(fmt, plan_id, exercise_id, date_from, date_to, output) -> None:
+    """Sessions mit Einträgen als CSV/NDJSON ausgeben."""
+    from .services.exporter import ExportFilter, iter_export
+
+    filters = ExportFilter(
+        plan_id=plan_id,
+        exercise_id=exercise_id,
+        date_from=date_from.date().isoformat() if date_from else None,
+        date_to=date_to.date().isoformat() if date_to else None,
+    )
+    for chunk in iter_export(get_db(), filters, fmt):
+        output.write(chunk)
+
+
+sqltrace_cli = AppGroup("sqltrace", help="SQL-Trace (SQL_TRACE=True) auswerten.")
+
+
+@sqltrace_cli.command("summary")
+@click.option("--log", "log_path", type=click.Path(dir_okay=False), default=None,
+              help="Trace-Log (Standard: SQL_TRACE_LOG).")
+@click.option("--top", type=int, default=20, show_default=True)
+@click.option("--plans/--no-plans", default=True, help="EXPLAIN QUERY PLAN langsamer Statements zeigen.")
+def sqltrace_summary(log_path: str | None, top: int, plans: bool) -> None:
+    """Statements nach Gesamtzeit sortiert ausgeben."""
+    from pathlib import Path
+
+    from flask import current_app
+
+    from .sqltrace import summarize
+
+    path = Path(log_path or current_app.config["SQL_TRACE_LOG"])
+    if not path.exists():
+        raise click.ClickException(f"Kein Trace-Log unter {path} (SQL_TRACE=True gesetzt?)")
+
+    groups = summarize(path)
+    click.echo(f"{len(groups)} verschiedene Statements in {path}\n")
+    click.echo(f"{'gesamt ms':>10} {'Anzahl':>7} {'Ø ms':>8} {'max ms':>8} {'langsam':>7}  SQL")
+    for grp in groups[:top]:
+        flag = " [SCAN]" if grp["full_scan"] else ""
+        click.echo(
+            f"{grp['total_ms']:>10.1f} {grp['count']:>7} {grp['total_ms'] / grp['count']:>8.2f} "
+            f"{grp['max_ms']:>8.2f} {grp['slow']:>7}  {grp['sql'][:100]}{flag}"
+        )
+        if plans and grp["plan"]:
+            click.echo(f"{'':>45}Endpoints: {', '.join(sorted(grp['endpoints']))}")
+            for line in grp["plan"]:
+                click.echo(f"{'':>45}{line}")
+
+
+assets_cli = AppGroup("assets", help="CSS/JS-Bündel bauen (siehe fitlog/assets.py).")
+
+
+@assets_cli.command("build")
+def assets_build() -> None:
+    """Bündel neu bauen, fingerprinten, komprimieren und Manifest schreiben."""
+    from pathlib import Path
+
+    from flask import current_app
+
+    from .assets import assets_dir, brotli, build_assets
+
+    out_dir = assets_dir(current_app)
+    manifest = build_assets(Path(current_app.static_folder), out_dir)
+    click.echo(f"Assets nach {out_dir}:")
+    for name, filename in manifest["files"].items():
+        sizes = manifest["sizes"][name]
+        packed = ", ".join(f"{enc} {n} B" for enc, n in sizes.items() if enc != "raw")
+        click.echo(f"  {name:<20} -> {filename}  ({sizes['raw']} B; {packed})")
+    if brotli is None:
+        click.echo("Hinweis: Paket 'brotli' nicht installiert – nur gzip-Varianten.", err=True)
+
+
+def register_cli(app: Flask) -> None:
+    """Alle CLI-Gruppen an der App registrieren."""
+    app.cli.add_command(rollup_cli)
+    app.cli.add_command(data_cli)
+    app.cli.add_command(sqltrace_cli)
+    app.cli.add_command(assets_cli)
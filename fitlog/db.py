@@ -1,18 +1,210 @@
+import os
+import queue
 import sqlite3
+import threading
+import time
 from pathlib import Path
-from flask import current_app, g
+from flask import Flask, current_app, g
+
+# Standard-PRAGMAs, einmal pro neu geöffneter Connection gesetzt.
+# Über die Config `SQLITE_PRAGMAS` einzeln überschreibbar.
+DEFAULT_PRAGMAS: dict[str, object] = {
+    "journal_mode": "WAL",       # Leser blockieren Schreiber nicht
+    "busy_timeout": 5000,        # ms warten statt sofort "database is locked"
+    "synchronous": "NORMAL",     # mit WAL sicher und deutlich schneller als FULL
+    "foreign_keys": "ON",
+    "cache_size": -16000,        # negativ = KiB, also ~16 MB Page-Cache
+    "mmap_size": 128 * 1024 * 1024,
+    "temp_store": "MEMORY",
+}
+
+
+class TimedConnection(sqlite3.Connection):
+    """
+    Connection, die Anzahl und Dauer ihrer Statements mitzählt.
+
+    Gemessen wird `execute`/`executemany`/`executescript` bis zur ersten
+    Ergebniszeile; das spätere Abholen per `fetchall` ist nicht enthalten.
+    `get_db()` setzt die Zähler beim Ausleihen zurück (siehe fitlog/metrics.py).
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self.statements = 0
+        self.statement_seconds = 0.0
+
+    def execute(self, *args):
+        t0 = time.perf_counter()
+        try:
+            return super().execute(*args)
+        finally:
+            self.statements += 1
+            self.statement_seconds += time.perf_counter() - t0
+
+    def executemany(self, *args):
+        t0 = time.perf_counter()
+        try:
+            return super().executemany(*args)
+        finally:
+            self.statements += 1
+            self.statement_seconds += time.perf_counter() - t0
+
+    def executescript(self, *args):
+        t0 = time.perf_counter()
+        try:
+            return super().executescript(*args)
+        finally:
+            self.statements += 1
+            self.statement_seconds += time.perf_counter() - t0
+
+
+class ConnectionPool:
+    """
+    Begrenzter Pool von SQLite-Connections pro Prozess.
+
+    - höchstens `max_size` Connections gleichzeitig; weitere Anfragen warten
+      bis zu `timeout` Sekunden auf eine freie Connection
+    - PRAGMAs werden nur beim Öffnen einer Connection gesetzt
+    - nach einem fork() (z. B. Gunicorn mit --preload) wird der Pool
+      verworfen, damit Connections nie zwischen Prozessen geteilt werden
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        max_size: int = 8,
+        pragmas: dict[str, object] | None = None,
+        cached_statements: int = 256,
+        timeout: float = 10.0,
+        factory: type[sqlite3.Connection] = sqlite3.Connection,
+    ) -> None:
+        self.db_path = str(db_path)
+        self.factory = factory
+        self.max_size = max(1, int(max_size))
+        self.pragmas = {**DEFAULT_PRAGMAS, **(pragmas or {})}
+        self.cached_statements = int(cached_statements)
+        self.timeout = float(timeout)
+        self._reset()
+
+    def _reset(self) -> None:
+        self._pid = os.getpid()
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            timeout=self.pragmas.get("busy_timeout", 5000) / 1000,
+            cached_statements=self.cached_statements,
+            check_same_thread=False,  # jeweils nur ein Thread nutzt sie (Pool)
+            factory=self.factory,
+        )
+        conn.row_factory = sqlite3.Row
+        for name, value in self.pragmas.items():
+            if value is None:
+                continue
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        if self._pid != os.getpid():
+            self._reset()
+
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._created < self.max_size:
+                self._created += 1
+                create = True
+            else:
+                create = False
+
+        if create:
+            try:
+                return self._connect()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise RuntimeError(
+                f"Keine freie DB-Connection nach {self.timeout:.0f}s "
+                f"(DB_POOL_SIZE={self.max_size})"
+            ) from None
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        if self._pid != os.getpid():
+            # Connection stammt aus dem Elternprozess -> nicht wiederverwenden
+            return
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = sqlite3.Row
+        except sqlite3.Error:
+            # defekte Connection verwerfen, Platz für eine neue schaffen
+            with self._lock:
+                self._created -= 1
+            conn.close()
+            return
+        self._idle.put(conn)
+
+    def close_all(self) -> None:
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._created -= 1
+
+
+def _connection_factory(app: Flask) -> type[sqlite3.Connection]:
+    """SQL-Trace > Statement-Zähler (nur wenn /metrics sie auswertet) > plain."""
+    if app.config.get("SQL_TRACE"):
+        from .sqltrace import TracingConnection
+        return TracingConnection
+    if app.config.get("METRICS_ENABLED"):
+        return TimedConnection
+    return sqlite3.Connection
+
+
+def init_app(app: Flask) -> ConnectionPool:
+    """Pool gemäß Config anlegen und Teardown registrieren."""
+    pool = ConnectionPool(
+        app.config["DATABASE"],
+        max_size=app.config.get("DB_POOL_SIZE", 8),
+        pragmas=app.config.get("SQLITE_PRAGMAS"),
+        cached_statements=app.config.get("DB_STATEMENT_CACHE", 256),
+        timeout=app.config.get("DB_POOL_TIMEOUT", 10.0),
+        factory=_connection_factory(app),
+    )
+    app.extensions["db_pool"] = pool
+    app.teardown_appcontext(close_db)
+    return pool
+
 
 def get_db() -> sqlite3.Connection:
-    """Liefert eine (pro Request gecachte) DB-Connection."""
+    """Liefert eine (pro Request gecachte) DB-Connection aus dem Pool."""
     if "db" not in g:
-        db_path = Path(current_app.instance_path) / "fitlog.db"
-        g.db = sqlite3.connect(db_path, detect_types=sqlite3.PARSE_DECLTYPES)
-        g.db.row_factory = sqlite3.Row
-        g.db.execute("PRAGMA foreign_keys = ON")
+        g.db = current_app.extensions["db_pool"].acquire()
+        if isinstance(g.db, TimedConnection):
+            g.db.reset_stats()
     return g.db
 
 def close_db(e: Exception | None = None) -> None:
-    """Schließt die DB-Connection am Ende des Requests."""
+    """Gibt die DB-Connection am Ende des Requests an den Pool zurück."""
     db = g.pop("db", None)
     if db is not None:
-        db.close()
+        current_app.extensions["db_pool"].release(db)
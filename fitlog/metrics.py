@@ -0,0 +1,241 @@
+# fitlog/metrics.py
+"""
+Laufzeit-Metriken im Prometheus-Textformat (/metrics).
+
+Erfasst pro Prozess:
+  - Latenz je Endpoint (Histogramm, Labels endpoint/method/status)
+  - Anzahl und Dauer der SQL-Statements je Request (über `TimedConnection`)
+  - Renderzeit der Matplotlib-Diagramme je Diagrammtyp
+  - Größe der ausgelieferten PNGs je Endpoint
+
+Ohne zusätzliche Abhängigkeit: einfache, thread-sichere Zähler und
+Histogramme mit festen Buckets. Bei mehreren Worker-Prozessen (Gunicorn)
+liefert jeder Prozess seine eigenen Werte.
+
+Zugriff auf /metrics: mit `METRICS_TOKEN` nur per
+`Authorization: Bearer <token>` (Prometheus: `authorization`/`bearer_token`),
+ohne Token nur von Loopback-Adressen.
+"""
+
+from __future__ import annotations
+
+import bisect
+import hmac
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Sequence, Tuple
+
+from flask import Flask, Response, abort, current_app, g, request
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+SQL_TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+RENDER_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+BYTES_BUCKETS = (4096, 16384, 32768, 65536, 131072, 262144, 524288, 1048576)
+
+LOOPBACK_ADDRS = frozenset({"127.0.0.1", "::1"})
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, doc: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.doc = doc
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _label_str(self, values: LabelValues, extra: str = "") -> str:
+        parts = [f'{k}="{_escape(v)}"' for k, v in zip(self.labels, values)]
+        if extra:
+            parts.append(extra)
+        return "{" + ",".join(parts) + "}" if parts else ""
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.doc}"
+        yield f"# TYPE {self.name} {self.kind}"
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, doc: str, labels: Sequence[str] = ()) -> None:
+        super().__init__(name, doc, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def render(self) -> Iterator[str]:
+        yield from super().render()
+        with self._lock:
+            items = sorted(self._values.items())
+        for values, total in items:
+            yield f"{self.name}{self._label_str(values)} {_fmt(total)}"
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, doc: str, labels: Sequence[str], buckets: Sequence[float]) -> None:
+        super().__init__(name, doc, labels)
+        self.buckets = tuple(sorted(buckets))
+        # je Labelkombination: [Zähler pro Bucket (nicht kumuliert) + Inf, Summe]
+        self._series: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][idx] += 1
+            series[1] += value
+
+    def render(self) -> Iterator[str]:
+        yield from super().render()
+        with self._lock:
+            items = sorted((k, (list(v[0]), v[1])) for k, v in self._series.items())
+        for values, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = self._label_str(values, f'le="{_fmt(bound)}"')
+                yield f"{self.name}_bucket{le} {cumulative}"
+            yield f"{self.name}_sum{self._label_str(values)} {_fmt(total)}"
+            yield f"{self.name}_count{self._label_str(values)} {cumulative}"
+
+
+class Metrics:
+    """Alle Metriken der App (ein Objekt pro Prozess)."""
+
+    def __init__(self) -> None:
+        self.request_latency = Histogram(
+            "fitlog_http_request_duration_seconds",
+            "Dauer der HTTP-Requests je Endpoint.",
+            ("endpoint", "method", "status"), LATENCY_BUCKETS,
+        )
+        self.sql_statements = Histogram(
+            "fitlog_sql_statements_per_request",
+            "Anzahl SQL-Statements je Request.",
+            ("endpoint",), SQL_COUNT_BUCKETS,
+        )
+        self.sql_seconds = Histogram(
+            "fitlog_sql_seconds_per_request",
+            "Summierte SQL-Zeit je Request.",
+            ("endpoint",), SQL_TIME_BUCKETS,
+        )
+        self.render_seconds = Histogram(
+            "fitlog_chart_render_seconds",
+            "Renderzeit der Matplotlib-Diagramme.",
+            ("kind",), RENDER_BUCKETS,
+        )
+        self.png_bytes = Histogram(
+            "fitlog_png_response_bytes",
+            "Größe der ausgelieferten PNG-Antworten.",
+            ("endpoint",), BYTES_BUCKETS,
+        )
+        self.png_bytes_total = Counter(
+            "fitlog_png_response_bytes_total",
+            "Summe der ausgelieferten PNG-Bytes.",
+            ("endpoint",),
+        )
+
+    def all(self) -> Sequence[_Metric]:
+        return (
+            self.request_latency, self.sql_statements, self.sql_seconds,
+            self.render_seconds, self.png_bytes, self.png_bytes_total,
+        )
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.all():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# ---------------------------
+# Flask-Anbindung
+# ---------------------------
+
+def _before_request() -> None:
+    g.metrics_t0 = time.perf_counter()
+
+
+def _after_request(response: Response) -> Response:
+    metrics: Metrics = current_app.extensions["metrics"]
+    t0 = g.pop("metrics_t0", None)
+    if t0 is None:
+        return response
+
+    endpoint = request.endpoint or "<unmatched>"
+    metrics.request_latency.observe(
+        time.perf_counter() - t0, endpoint, request.method, str(response.status_code)
+    )
+
+    db = g.get("db")
+    if db is not None and hasattr(db, "statements"):
+        metrics.sql_statements.observe(db.statements, endpoint)
+        metrics.sql_seconds.observe(db.statement_seconds, endpoint)
+
+    if response.mimetype == "image/png" and not response.direct_passthrough:
+        size = response.calculate_content_length()
+        if size is not None:
+            metrics.png_bytes.observe(size, endpoint)
+            metrics.png_bytes_total.inc(endpoint, amount=size)
+    return response
+
+
+@contextmanager
+def time_render(kind: str) -> Iterator[None]:
+    """Renderzeit eines Diagramms erfassen (no-op ohne Metriken)."""
+    metrics = current_app.extensions.get("metrics")
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        if metrics is not None:
+            metrics.render_seconds.observe(time.perf_counter() - t0, kind)
+
+
+def _scrape_allowed(token: str | None) -> bool:
+    """Bearer-Token prüfen bzw. ohne Token nur Loopback zulassen."""
+    if token:
+        scheme, _, presented = request.headers.get("Authorization", "").partition(" ")
+        return scheme.lower() == "bearer" and hmac.compare_digest(
+            presented.strip().encode("utf-8"), token.encode("utf-8")
+        )
+    return request.remote_addr in LOOPBACK_ADDRS
+
+
+def init_metrics(app: Flask) -> Metrics | None:
+    """Hooks und /metrics registrieren, falls `METRICS_ENABLED` gesetzt ist."""
+    if not app.config.get("METRICS_ENABLED"):
+        return None
+
+    metrics = Metrics()
+    app.extensions["metrics"] = metrics
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+
+    @app.get("/metrics")
+    def metrics_endpoint():
+        if not _scrape_allowed(app.config.get("METRICS_TOKEN")):
+            abort(403)
+        return Response(metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+    return metrics
@@ -0,0 +1,49 @@
+-- 0001_init.sql
+-- Basisschema von FitLog (ersetzt das frühere instance/001_init.sql).
+-- Idempotent formuliert, damit bestehende Datenbanken (user_version = 0)
+-- ohne Datenverlust in die versionierte Migration übernommen werden.
+
+CREATE TABLE IF NOT EXISTS exercises (
+  id   INTEGER PRIMARY KEY AUTOINCREMENT,
+  name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS training_plans (
+  id         INTEGER PRIMARY KEY AUTOINCREMENT,
+  name       TEXT NOT NULL,
+  created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+  deleted_at TEXT
+);
+
+-- Planname nur unter aktiven (nicht archivierten) Plänen eindeutig
+CREATE UNIQUE INDEX IF NOT EXISTS ux_training_plans_active_name
+    ON training_plans(name)
+    WHERE deleted_at IS NULL;
+
+CREATE TABLE IF NOT EXISTS plan_exercises (
+  plan_id           INTEGER NOT NULL REFERENCES training_plans(id) ON DELETE CASCADE,
+  exercise_id       INTEGER NOT NULL REFERENCES exercises(id),
+  position          INTEGER,
+  default_reps      INTEGER,
+  default_weight_kg REAL,
+  note              TEXT,
+  PRIMARY KEY (plan_id, exercise_id)
+);
+
+CREATE TABLE IF NOT EXISTS sessions (
+  id         INTEGER PRIMARY KEY AUTOINCREMENT,
+  plan_id    INTEGER NOT NULL REFERENCES training_plans(id),
+  started_at TEXT NOT NULL,
+  ended_at   TEXT
+);
+
+CREATE TABLE IF NOT EXISTS session_entries (
+  id          INTEGER PRIMARY KEY AUTOINCREMENT,
+  session_id  INTEGER NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+  exercise_id INTEGER NOT NULL REFERENCES exercises(id),
+  weight_kg   REAL,
+  reps        INTEGER,
+  note        TEXT,
+  created_at  TEXT,
+  UNIQUE (session_id, exercise_id)
+);
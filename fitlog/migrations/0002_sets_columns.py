@@ -0,0 +1,25 @@
+"""
+0002: Spalten für die Satzanzahl.
+
+  - session_entries.sets       (erfasste Sätze je Übung)
+  - plan_exercises.default_sets (Standard-Sätze im Plan)
+
+Ältere Datenbanken haben die Spalten teils schon (manuell ergänzt), daher
+wird nur hinzugefügt, was fehlt.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+
+COLUMNS = [
+    ("session_entries", "sets", "INTEGER"),
+    ("plan_exercises", "default_sets", "INTEGER"),
+]
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    for table, column, decl in COLUMNS:
+        existing = {r[1].lower() for r in conn.execute(f"PRAGMA table_info({table})")}
+        if column.lower() not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
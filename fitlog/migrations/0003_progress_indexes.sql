@@ -0,0 +1,8 @@
+-- 0003_progress_indexes.sql
+-- Indizes für die Fortschritts-Abfragen (Sessions je Plan, Einträge je Übung).
+
+CREATE INDEX IF NOT EXISTS idx_sessions_plan
+    ON sessions(plan_id, id);
+
+CREATE INDEX IF NOT EXISTS idx_session_entries_exercise
+    ON session_entries(exercise_id, session_id);
@@ -0,0 +1,7 @@
+-- 0004_plan_carry_over.sql
+-- Pro Plan einstellbar: beim Beenden einer Session neben dem Gewicht auch
+-- Wiederholungen bzw. Sätze als neue Plan-Defaults übernehmen.
+
+ALTER TABLE training_plans ADD COLUMN carry_over_reps INTEGER NOT NULL DEFAULT 0;
+
+ALTER TABLE training_plans ADD COLUMN carry_over_sets INTEGER NOT NULL DEFAULT 0;
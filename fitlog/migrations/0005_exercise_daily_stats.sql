@@ -0,0 +1,30 @@
+-- 0005_exercise_daily_stats.sql
+-- Materialisierte Tages-Rollups je (Übung, Plan, Tag) für die
+-- Fortschritts-Abfragen. Gepflegt inkrementell von den Session-Routen
+-- (siehe fitlog/services/rollup.py), neu aufbaubar mit `flask rollup rebuild`.
+
+CREATE TABLE IF NOT EXISTS exercise_daily_stats (
+  exercise_id     INTEGER NOT NULL REFERENCES exercises(id) ON DELETE CASCADE,
+  plan_id         INTEGER NOT NULL,
+  day             TEXT    NOT NULL,              -- YYYY-MM-DD
+  max_weight_kg   REAL,                          -- NULL, wenn ohne Gewicht erfasst
+  total_volume_kg REAL    NOT NULL DEFAULT 0,    -- Σ Gewicht × Wdh. × Sätze
+  set_count       INTEGER NOT NULL DEFAULT 0,
+  entry_count     INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (exercise_id, plan_id, day)
+) WITHOUT ROWID;
+
+-- Erstbefüllung aus den vorhandenen Einträgen
+INSERT INTO exercise_daily_stats
+    (exercise_id, plan_id, day, max_weight_kg, total_volume_kg, set_count, entry_count)
+SELECT se.exercise_id,
+       s.plan_id,
+       DATE(COALESCE(se.created_at, s.ended_at, s.started_at)) AS day,
+       MAX(se.weight_kg),
+       TOTAL(COALESCE(se.weight_kg, 0) * COALESCE(se.reps, 0) * COALESCE(se.sets, 1)),
+       TOTAL(COALESCE(se.sets, 1)),
+       COUNT(*)
+  FROM session_entries se
+  JOIN sessions s ON s.id = se.session_id
+ WHERE DATE(COALESCE(se.created_at, s.ended_at, s.started_at)) IS NOT NULL
+ GROUP BY se.exercise_id, s.plan_id, day;
@@ -0,0 +1,15 @@
+-- 0006_sync_mutations.sql
+-- Bereits angewendete Offline-Mutationen (POST /sessions/sync). Der vom
+-- Client erzeugte Idempotenz-Schlüssel verhindert, dass eine wiederholt
+-- gesendete Mutation (Verbindungsabbruch nach dem Commit) doppelt wirkt.
+
+CREATE TABLE IF NOT EXISTS sync_mutations (
+  idempotency_key TEXT    PRIMARY KEY,
+  session_id      INTEGER,
+  kind            TEXT    NOT NULL,
+  status          TEXT    NOT NULL,              -- applied | rejected
+  applied_at      TEXT    NOT NULL
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_sync_mutations_applied_at
+    ON sync_mutations(applied_at);
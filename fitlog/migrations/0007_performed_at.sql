@@ -0,0 +1,87 @@
+-- 0007_performed_at.sql
+-- Kanonischer Zeitpunkt je Eintrag: session_entries.performed_at als
+-- Unix-Epoch (UTC, INTEGER) von COALESCE(created_at, ended_at, started_at).
+-- Die TEXT-Zeitstempel kommen in mehreren Formaten vor ("…T…", "… …", mit
+-- und ohne Zeitzone); strftime('%s', …) vereinheitlicht sie, Vergleiche und
+-- Sortierung laufen danach über einen Index statt über COALESCE/DATE.
+--
+-- Eine STORED-Generated-Column lässt sich per ALTER TABLE nicht ergänzen und
+-- dürfte ohnehin nicht auf sessions zugreifen; gepflegt wird die Spalte
+-- daher von den Triggern unten – für alle Schreibpfade (Formular, Autosave,
+-- Offline-Sync, Import) gleichermaßen.
+
+ALTER TABLE session_entries ADD COLUMN performed_at INTEGER;
+
+UPDATE session_entries
+   SET performed_at = (
+       SELECT CAST(strftime('%s', COALESCE(session_entries.created_at, s.ended_at, s.started_at)) AS INTEGER)
+         FROM sessions s
+        WHERE s.id = session_entries.session_id
+   );
+
+-- Verlauf/„letztes Gewicht“ je Übung: Bereichsscan statt Sortierung.
+-- Zugriffe über session_id deckt bereits der UNIQUE-Index
+-- (session_id, exercise_id) aus 0001 ab.
+CREATE INDEX IF NOT EXISTS idx_session_entries_performed
+    ON session_entries(exercise_id, performed_at);
+
+-- Letzte abgeschlossene Session (Startseite) über denselben kanonischen Wert
+CREATE INDEX IF NOT EXISTS idx_sessions_ended_epoch
+    ON sessions(CAST(strftime('%s', ended_at) AS INTEGER))
+ WHERE ended_at IS NOT NULL;
+
+-- Neue Einträge: performed_at setzen, sofern der Schreiber es nicht mitgibt
+CREATE TRIGGER IF NOT EXISTS trg_session_entries_performed_insert
+AFTER INSERT ON session_entries
+WHEN NEW.performed_at IS NULL
+BEGIN
+    UPDATE session_entries
+       SET performed_at = (
+           SELECT CAST(strftime('%s', COALESCE(NEW.created_at, s.ended_at, s.started_at)) AS INTEGER)
+             FROM sessions s
+            WHERE s.id = NEW.session_id
+       )
+     WHERE id = NEW.id;
+END;
+
+-- Geänderter Zeitstempel (Upsert, Import) verschiebt den Eintrag
+CREATE TRIGGER IF NOT EXISTS trg_session_entries_performed_update
+AFTER UPDATE OF created_at, session_id ON session_entries
+BEGIN
+    UPDATE session_entries
+       SET performed_at = (
+           SELECT CAST(strftime('%s', COALESCE(NEW.created_at, s.ended_at, s.started_at)) AS INTEGER)
+             FROM sessions s
+            WHERE s.id = NEW.session_id
+       )
+     WHERE id = NEW.id;
+END;
+
+-- Einträge ohne eigenes created_at folgen Start/Ende ihrer Session
+CREATE TRIGGER IF NOT EXISTS trg_sessions_performed_update
+AFTER UPDATE OF started_at, ended_at ON sessions
+BEGIN
+    UPDATE session_entries
+       SET performed_at = CAST(strftime('%s', COALESCE(NEW.ended_at, NEW.started_at)) AS INTEGER)
+     WHERE session_id = NEW.id
+       AND created_at IS NULL;
+END;
+
+-- Tages-Rollups (0005) neu aufbauen: Tage kommen ab jetzt aus performed_at
+-- (UTC) statt aus DATE(COALESCE(…)) über die TEXT-Zeitstempel – siehe
+-- DAY_EXPR in fitlog/services/rollup.py
+DELETE FROM exercise_daily_stats;
+
+INSERT INTO exercise_daily_stats
+    (exercise_id, plan_id, day, max_weight_kg, total_volume_kg, set_count, entry_count)
+SELECT se.exercise_id,
+       s.plan_id,
+       DATE(se.performed_at, 'unixepoch') AS day,
+       MAX(se.weight_kg),
+       TOTAL(COALESCE(se.weight_kg, 0) * COALESCE(se.reps, 0) * COALESCE(se.sets, 1)),
+       TOTAL(COALESCE(se.sets, 1)),
+       COUNT(*)
+  FROM session_entries se
+  JOIN sessions s ON s.id = se.session_id
+ WHERE se.performed_at IS NOT NULL
+ GROUP BY se.exercise_id, s.plan_id, day;
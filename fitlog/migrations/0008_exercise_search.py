@@ -0,0 +1,64 @@
+"""
+0008: Volltextindex für die Übungssuche (Typeahead).
+
+  - exercises_fts: FTS5-Tabelle über exercises.name (External Content,
+    rowid = exercises.id). Der Tokenizer `unicode61 remove_diacritics 2`
+    macht die Suche unabhängig von Umlauten/Akzenten („uber“ findet
+    „Überzüge“), die Präfix-Indizes beschleunigen kurze Eingaben.
+  - Trigger halten den Index bei INSERT/UPDATE/DELETE auf exercises aktuell.
+
+SQLite-Builds ohne FTS5 überspringen die Migration; die Suche fällt dann
+auf LIKE zurück (siehe fitlog/services/exercise_search.py).
+"""
+
+from __future__ import annotations
+
+import sqlite3
+
+STATEMENTS = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS exercises_fts USING fts5(
+        name,
+        content = 'exercises',
+        content_rowid = 'id',
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_exercises_fts_insert
+    AFTER INSERT ON exercises
+    BEGIN
+        INSERT INTO exercises_fts (rowid, name) VALUES (NEW.id, NEW.name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_exercises_fts_delete
+    AFTER DELETE ON exercises
+    BEGIN
+        INSERT INTO exercises_fts (exercises_fts, rowid, name) VALUES ('delete', OLD.id, OLD.name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_exercises_fts_update
+    AFTER UPDATE OF name ON exercises
+    BEGIN
+        INSERT INTO exercises_fts (exercises_fts, rowid, name) VALUES ('delete', OLD.id, OLD.name);
+        INSERT INTO exercises_fts (rowid, name) VALUES (NEW.id, NEW.name);
+    END
+    """,
+    # Erstbefüllung aus den vorhandenen Übungen
+    "INSERT INTO exercises_fts (exercises_fts) VALUES ('rebuild')",
+]
+
+
+def fts5_available(conn: sqlite3.Connection) -> bool:
+    options = {r[0].upper() for r in conn.execute("PRAGMA compile_options")}
+    return "ENABLE_FTS5" in options
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    if not fts5_available(conn):
+        return
+    for statement in STATEMENTS:
+        conn.execute(statement)
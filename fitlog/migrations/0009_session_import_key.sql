@@ -0,0 +1,11 @@
+-- 0009_session_import_key.sql
+-- Externer Session-Schlüssel aus dem Import (Spalte `session`, Standard:
+-- Startzeitpunkt). Ein erneuter Import derselben Datei – etwa nach einem
+-- Abbruch – findet die Sessions darüber wieder und überschreibt deren
+-- Einträge, statt sie doppelt anzulegen.
+
+ALTER TABLE sessions ADD COLUMN import_key TEXT;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_sessions_import_key
+    ON sessions(plan_id, import_key)
+ WHERE import_key IS NOT NULL;
@@ -0,0 +1,138 @@
+# fitlog/migrations/__init__.py
+"""
+Versionierte Schema-Migrationen für FitLog.
+
+Migrationen liegen als nummerierte Dateien in diesem Paket:
+  NNNN_<name>.sql  – SQL-Skript
+  NNNN_<name>.py   – Python-Modul mit `upgrade(conn)`
+
+Die erreichte Version steht in `PRAGMA user_version`. Jede Migration läuft
+in einer eigenen Transaktion (`BEGIN IMMEDIATE`), zusammen mit dem Setzen
+der neuen Version – parallel startende Worker serialisieren sich darüber
+und wenden jede Migration genau einmal an.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import re
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent
+
+_FILENAME_RE = re.compile(r"^(\d{4})_([a-z0-9_]+)\.(sql|py)$")
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    path: Path
+
+    def apply(self, conn: sqlite3.Connection) -> None:
+        """Migration auf `conn` ausführen (Transaktion läuft bereits)."""
+        if self.path.suffix == ".sql":
+            for statement in _split_sql(self.path.read_text(encoding="utf-8")):
+                conn.execute(statement)
+        else:
+            spec = importlib.util.spec_from_file_location(
+                f"fitlog.migrations._m{self.version:04d}", self.path
+            )
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            module.upgrade(conn)
+
+
+def _split_sql(script: str) -> List[str]:
+    """
+    SQL-Skript in einzelne Statements zerlegen.
+
+    `executescript()` committet eine offene Transaktion vorab und taugt daher
+    nicht für atomare Migrationen; `sqlite3.complete_statement` erkennt auch
+    Trigger-Körper (BEGIN … END) korrekt.
+    """
+    statements: List[str] = []
+    buf = ""
+    for line in script.splitlines(keepends=True):
+        if not buf and line.strip().startswith("--"):
+            continue
+        buf += line
+        if sqlite3.complete_statement(buf):
+            if buf.strip():
+                statements.append(buf.strip())
+            buf = ""
+    if buf.strip():
+        raise ValueError(f"Unvollständiges SQL-Statement am Skriptende: {buf.strip()[:60]!r}")
+    return statements
+
+
+def discover_migrations() -> List[Migration]:
+    """Alle Migrationen im Paket, aufsteigend nach Version."""
+    migrations: List[Migration] = []
+    for path in MIGRATIONS_DIR.iterdir():
+        match = _FILENAME_RE.match(path.name)
+        if match:
+            migrations.append(Migration(int(match.group(1)), match.group(2), path))
+    migrations.sort(key=lambda m: m.version)
+
+    versions = [m.version for m in migrations]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError(f"Doppelte Migrationsnummern: {versions}")
+    return migrations
+
+
+def current_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def latest_version() -> int:
+    migrations = discover_migrations()
+    return migrations[-1].version if migrations else 0
+
+
+def migrate(conn: sqlite3.Connection, target: Optional[int] = None) -> List[int]:
+    """
+    Offene Migrationen bis `target` (Standard: neueste) anwenden.
+
+    Gibt die Liste der tatsächlich angewendeten Versionen zurück.
+    """
+    applied: List[int] = []
+    previous_isolation = conn.isolation_level
+    conn.isolation_level = None  # Transaktionen explizit steuern
+    try:
+        for migration in discover_migrations():
+            if target is not None and migration.version > target:
+                break
+            if current_version(conn) >= migration.version:
+                continue
+
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Ein anderer Prozess könnte zwischenzeitlich migriert haben
+                if current_version(conn) >= migration.version:
+                    conn.execute("COMMIT")
+                    continue
+                migration.apply(conn)
+                conn.execute(f"PRAGMA user_version = {int(migration.version)}")
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            applied.append(migration.version)
+    finally:
+        conn.isolation_level = previous_isolation
+    return applied
+
+
+def apply_migrations(db_path: str | Path, target: Optional[int] = None) -> List[int]:
+    """Datenbankdatei öffnen (bei Bedarf anlegen) und migrieren."""
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        conn.execute("PRAGMA foreign_keys = ON")
+        return migrate(conn, target)
+    finally:
+        conn.close()
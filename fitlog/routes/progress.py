@@ -1,16 +1,10 @@
 # fitlog/routes/progress.py
 from __future__ import annotations
 
-import io
+from itertools import groupby
 from typing import List, Tuple, Optional
-from datetime import datetime
 
-from flask import Blueprint, Response, render_template, request, abort, redirect, url_for
-
-# Matplotlib im Headless-Mode
-import matplotlib
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
+from flask import Blueprint, Response, jsonify, render_template, request, abort, redirect, url_for
 
 # Hole get_db aus deinem Projekt.
 try:
@@ -19,128 +13,91 @@ except Exception:
     # Fallback, falls der Pfad sich mal ändert
     from fitlog.database import get_db  # type: ignore  # noqa: F401
 
+from fitlog.metrics import time_render
+from fitlog.services import charts
+from fitlog.services.chart_cache import chart_key, get_chart_cache
+from fitlog.services.chart_specs import (
+    exercise_chart_spec,
+    fetch_exercise_name,
+    fetch_exercise_series,
+    fetch_plan_exercises_with_latest_weight,
+    fetch_plan_name,
+    plan_chart_spec,
+)
+from fitlog.services.prerender import get_prerenderer
+
 progress_bp = Blueprint("progress", __name__, url_prefix="/progress")
 
+# Punktbudget für clientseitig gezeichnete Verläufe (LTTB-Ausdünnung)
+CLIENT_MAX_POINTS = 365
+
+# So lange wartet ein PNG-Request höchstens auf einen laufenden Vorab-Render
+PRERENDER_WAIT_SECONDS = 5.0
+
 
 # ---------------------------
 # Hilfsfunktionen (SQL, etc.)
 # ---------------------------
 
-def _fetch_plan_name(db, plan_id: int) -> Optional[str]:
-    row = db.execute(
-        "SELECT name FROM training_plans WHERE id = ? AND deleted_at IS NULL",
-        (plan_id,),
-    ).fetchone()
-    return row["name"] if row else None
-
-
-def _fetch_exercise_name(db, exercise_id: int) -> Optional[str]:
-    row = db.execute(
-        "SELECT name FROM exercises WHERE id = ?",
-        (exercise_id,),
-    ).fetchone()
-    return row["name"] if row else None
-
-
-def _fetch_plan_exercises_with_latest_weight(db, plan_id: int) -> List[Tuple[str, float]]:
+def _fetch_plan_dashboard_series(
+    db, plan_id: int
+) -> List[Tuple[int, str, List[Tuple[str, float, float]]]]:
     """
-    Liefert Liste von (exercise_name, latest_weight_kg) für alle Übungen eines Plans.
-
-    latest_weight_kg:
-      - letztes erfasstes Gewicht aus session_entries / sessions
-      - falls keine Erfassung existiert, 0.0 als Fallback.
+    Verläufe aller Übungen eines Plans mit *einer* Abfrage:
+    [(exercise_id, Name, [(Tag, Höchstgewicht, Volumen), ...]), ...]
+    in Plan-Reihenfolge. Gleiche Semantik wie `fetch_exercise_series` ohne
+    Planfilter; Übungen ohne Einträge erscheinen mit leerem Verlauf.
     """
-    # 1) Alle Übungen im Plan (Reihenfolge via position, falls vorhanden)
-    plan_rows = db.execute(
+    rows = db.execute(
         """
-        SELECT e.id AS exercise_id, e.name AS exercise_name,
-               COALESCE(pe.default_weight_kg, 0) AS default_weight_kg
-        FROM plan_exercises pe
-        JOIN exercises e ON e.id = pe.exercise_id
-        WHERE pe.plan_id = ?
-        ORDER BY COALESCE(pe.position, 999999), e.name
+        SELECT pe.exercise_id,
+               e.name,
+               ds.day,
+               MAX(ds.max_weight_kg)   AS weight_kg,
+               TOTAL(ds.total_volume_kg) AS volume_kg
+          FROM plan_exercises pe
+          JOIN exercises e ON e.id = pe.exercise_id
+          LEFT JOIN exercise_daily_stats ds
+                 ON ds.exercise_id = pe.exercise_id
+                AND ds.max_weight_kg IS NOT NULL
+         WHERE pe.plan_id = ?
+         GROUP BY pe.exercise_id, ds.day
+         ORDER BY COALESCE(pe.position, 9999), e.name, pe.exercise_id, ds.day
         """,
         (plan_id,),
     ).fetchall()
 
-    if not plan_rows:
-        return []
-
-    # 2) Für jede Übung: letztes Gewicht aus session_entries/sessions für Sessions dieses Plans
-    result: List[Tuple[str, float]] = []
-    for r in plan_rows:
-        ex_id = r["exercise_id"]
-        ex_name = r["exercise_name"]
-        default_weight = float(r["default_weight_kg"])
-
-        rec = db.execute(
-            """
-            SELECT se.weight_kg
-            FROM session_entries se
-            JOIN sessions s ON s.id = se.session_id
-            WHERE s.plan_id = ?
-              AND se.exercise_id = ?
-              AND se.weight_kg IS NOT NULL
-            ORDER BY COALESCE(se.created_at, s.ended_at, s.started_at) DESC
-            LIMIT 1
-            """,
-            (plan_id, ex_id),
-        ).fetchone()
-
-        if rec and rec["weight_kg"] is not None:
-            latest = float(rec["weight_kg"])
-        else:
-            latest = default_weight
+    panels: List[Tuple[int, str, List[Tuple[str, float, float]]]] = []
+    for (exercise_id, name), group in groupby(rows, key=lambda r: (r[0], r[1])):
+        series = [
+            (r["day"], float(r["weight_kg"]), float(r["volume_kg"]))
+            for r in group
+            if r["day"] is not None
+        ]
+        panels.append((exercise_id, name, series))
+    return panels
 
-        result.append((ex_name, latest))
 
-    return result
+def _downsample_series(series: list, max_points: Optional[int]) -> list:
+    """Verlauf per LTTB auf höchstens `max_points` Punkte ausdünnen."""
+    if not max_points or not len(series) > max_points >= 3:
+        return series
 
+    import numpy as np
+    from fitlog.services.downsample import lttb_indices
 
-def _fetch_exercise_history(
-    db,
-    exercise_id: int,
-    plan_id: Optional[int],
-) -> List[Tuple[str, float]]:
-    """
-    Liefert Verlauf (ISO-Datum, Gewicht) für eine Übung.
-    Optional nach Plan filterbar.
-    Sortiert nach Datum/Zeit aufsteigend.
-    """
-    if plan_id:
-        rows = db.execute(
-            """
-            SELECT
-                DATE(COALESCE(se.created_at, s.ended_at, s.started_at)) AS day,
-                se.weight_kg
-            FROM session_entries se
-            JOIN sessions s ON s.id = se.session_id
-            WHERE se.exercise_id = ?
-              AND s.plan_id = ?
-            ORDER BY COALESCE(se.created_at, s.ended_at, s.started_at)
-            """,
-            (exercise_id, plan_id),
-        ).fetchall()
-    else:
-        rows = db.execute(
-            """
-            SELECT
-                DATE(COALESCE(se.created_at, s.ended_at, s.started_at)) AS day,
-                se.weight_kg
-            FROM session_entries se
-            JOIN sessions s ON s.id = se.session_id
-            WHERE se.exercise_id = ?
-            ORDER BY COALESCE(se.created_at, s.ended_at, s.started_at)
-            """,
-            (exercise_id,),
-        ).fetchall()
-
-    history: List[Tuple[str, float]] = []
-    for row in rows:
-        if row["weight_kg"] is None:
-            continue
-        history.append((row["day"], float(row["weight_kg"])))
-    return history
+    days = np.array([point[0] for point in series], dtype="datetime64[D]")
+    weights = np.array([point[1] for point in series], dtype=float)
+    keep = lttb_indices(days.astype(np.int64), weights, max_points)
+    return [series[i] for i in keep.tolist()]
+
+
+def _json_conditional(payload: dict) -> Response:
+    """JSON-Antwort mit ETag; passende If-None-Match-Anfragen erhalten 304."""
+    resp = jsonify(payload)
+    resp.add_etag()
+    resp.headers["Cache-Control"] = "no-cache"
+    return resp.make_conditional(request)
 
 
 # ---------------------------
@@ -162,9 +119,6 @@ def overview() -> Response:
     plans = db.execute(
         "SELECT id, name FROM training_plans WHERE deleted_at IS NULL ORDER BY name"
     ).fetchall()
-    exercises = db.execute(
-        "SELECT id, name FROM exercises ORDER BY name"
-    ).fetchall()
 
     diagram_type = request.args.get("diagram_type", "plan")
     if diagram_type not in ("plan", "exercise"):
@@ -174,22 +128,31 @@ def overview() -> Response:
     selected_exercise_id = request.args.get("exercise_id", type=int)
 
     image_url: Optional[str] = None
+    series_url: Optional[str] = None
+    dashboard_url: Optional[str] = None
     title_suffix = ""
     selected_plan_name: Optional[str] = None
     selected_exercise_name: Optional[str] = None
 
     if diagram_type == "plan" and selected_plan_id:
-        selected_plan_name = _fetch_plan_name(db, selected_plan_id)
+        selected_plan_name = fetch_plan_name(db, selected_plan_id)
         if selected_plan_name:
             image_url = url_for("progress.plan_png", plan_id=selected_plan_id)
+            series_url = url_for("progress.plan_series", plan_id=selected_plan_id)
+            dashboard_url = url_for("progress.plan_dashboard", plan_id=selected_plan_id)
             title_suffix = f" – {selected_plan_name}"
         else:
             selected_plan_id = None
 
     elif diagram_type == "exercise" and selected_exercise_id:
-        selected_exercise_name = _fetch_exercise_name(db, selected_exercise_id)
+        selected_exercise_name = fetch_exercise_name(db, selected_exercise_id)
         if selected_exercise_name:
             image_url = url_for("progress.exercise_png", exercise_id=selected_exercise_id)
+            series_url = url_for(
+                "progress.exercise_series",
+                exercise_id=selected_exercise_id,
+                max_points=CLIENT_MAX_POINTS,
+            )
             title_suffix = f" – {selected_exercise_name}"
         else:
             selected_exercise_id = None
@@ -198,12 +161,13 @@ def overview() -> Response:
         "progress_plan.html",  # gemeinsames Template für beide Diagrammtypen
         diagram_type=diagram_type,
         plans=plans,
-        exercises=exercises,
         selected_plan_id=selected_plan_id,
         selected_exercise_id=selected_exercise_id,
         selected_plan_name=selected_plan_name,
         selected_exercise_name=selected_exercise_name,
         image_url=image_url,
+        series_url=series_url,
+        dashboard_url=dashboard_url,
         title_suffix=title_suffix,
     )
 
@@ -215,7 +179,7 @@ def plan_view(plan_id: int) -> Response:
     Leitet intern auf die Übersichtsseite mit gesetztem diagram_type=plan weiter.
     """
     db = get_db()
-    plan_name = _fetch_plan_name(db, plan_id)
+    plan_name = fetch_plan_name(db, plan_id)
     if not plan_name:
         abort(404, "Plan not found")
 
@@ -232,7 +196,7 @@ def exercise_view(exercise_id: int) -> Response:
     Optionaler plan_id-Filter bleibt als Query-Parameter erhalten.
     """
     db = get_db()
-    exercise_name = _fetch_exercise_name(db, exercise_id)
+    exercise_name = fetch_exercise_name(db, exercise_id)
     if not exercise_name:
         abort(404, "Exercise not found")
 
@@ -247,39 +211,181 @@ def exercise_view(exercise_id: int) -> Response:
     )
 
 
+# ---------------------------
+# JSON-Endpoints
+# ---------------------------
+
+@progress_bp.get("/exercise/<int:exercise_id>/stats")
+def exercise_stats(exercise_id: int):
+    """
+    Kraft-Analysen einer Übung als JSON (e1RM, Tonnage, 4-Wochen-Mittel, PRs).
+    Optional: ?plan_id=... zum Filtern.
+    """
+    from fitlog.services.analytics import (
+        compute_exercise_stats,
+        load_exercise_arrays,
+        stats_to_json,
+    )
+
+    plan_id = request.args.get("plan_id", type=int)
+
+    db = get_db()
+    exercise_name = fetch_exercise_name(db, exercise_id)
+    if not exercise_name:
+        abort(404, "Exercise not found")
+
+    stats = compute_exercise_stats(load_exercise_arrays(db, exercise_id, plan_id))
+    return jsonify(
+        exercise_id=exercise_id,
+        exercise_name=exercise_name,
+        plan_id=plan_id,
+        **stats_to_json(stats),
+    )
+
+
+@progress_bp.get("/plan/<int:plan_id>/series")
+def plan_series(plan_id: int):
+    """
+    Daten des Plan-Diagramms als spaltenweises JSON (für clientseitiges Zeichnen):
+      { "labels": [...], "weights": [...] }
+    """
+    db = get_db()
+    plan_name = fetch_plan_name(db, plan_id)
+    if not plan_name:
+        abort(404, "Plan not found")
+
+    data = fetch_plan_exercises_with_latest_weight(db, plan_id)
+    return _json_conditional({
+        "plan_id": plan_id,
+        "title": f"Current weights per exercise – {plan_name}",
+        "labels": [name for name, _ in data],
+        "weights": [round(val, 2) for _, val in data],
+    })
+
+
+@progress_bp.get("/exercise/<int:exercise_id>/series")
+def exercise_series(exercise_id: int):
+    """
+    Verlauf einer Übung als spaltenweises JSON (für clientseitiges Zeichnen):
+      { "dates": [...], "weights": [...], "volume": [...] }
+    Optional: ?plan_id=... zum Filtern, ?max_points=N dünnt lange Verläufe
+    per LTTB (Largest-Triangle-Three-Buckets) auf N Punkte aus,
+    ?volume=0 lässt das Volumen weg.
+    """
+    plan_id = request.args.get("plan_id", type=int)
+    max_points = request.args.get("max_points", type=int)
+    with_volume = request.args.get("volume", default=1, type=int) != 0
+
+    db = get_db()
+    exercise_name = fetch_exercise_name(db, exercise_id)
+    if not exercise_name:
+        abort(404, "Exercise not found")
+
+    title = f"Weight over time – {exercise_name}"
+    if plan_id:
+        plan_name = fetch_plan_name(db, plan_id)
+        if plan_name:
+            title += f" (Plan: {plan_name})"
+
+    series = fetch_exercise_series(db, exercise_id, plan_id)
+    total_points = len(series)
+    series = _downsample_series(series, max_points)
+
+    payload = {
+        "exercise_id": exercise_id,
+        "plan_id": plan_id,
+        "title": title,
+        "total_points": total_points,
+        "dates": [day for day, _, _ in series],
+        "weights": [round(w, 2) for _, w, _ in series],
+    }
+    if with_volume:
+        payload["volume"] = [round(v, 2) for _, _, v in series]
+    return _json_conditional(payload)
+
+
+@progress_bp.get("/plan/<int:plan_id>/dashboard.json")
+def plan_dashboard_json(plan_id: int):
+    """
+    Verläufe aller Übungen eines Plans in einer Antwort (statt einer
+    Series-Anfrage je Übung):
+      { "exercises": [ { "exercise_id", "name", "dates", "weights", "volume" }, ... ] }
+    Optional: ?max_points=N dünnt jeden Verlauf per LTTB aus.
+    """
+    max_points = request.args.get("max_points", type=int)
+
+    db = get_db()
+    plan_name = fetch_plan_name(db, plan_id)
+    if not plan_name:
+        abort(404, "Plan not found")
+
+    exercises = []
+    for exercise_id, name, series in _fetch_plan_dashboard_series(db, plan_id):
+        total_points = len(series)
+        series = _downsample_series(series, max_points)
+        exercises.append({
+            "exercise_id": exercise_id,
+            "name": name,
+            "total_points": total_points,
+            "dates": [day for day, _, _ in series],
+            "weights": [round(w, 2) for _, w, _ in series],
+            "volume": [round(v, 2) for _, _, v in series],
+        })
+
+    return _json_conditional({
+        "plan_id": plan_id,
+        "title": f"Progress per exercise – {plan_name}",
+        "exercises": exercises,
+    })
+
+
 # ---------------------------
 # PNG-Endpoints
 # ---------------------------
 
+def _png_response(kind: str, etag: str, render, headers: dict) -> Response:
+    """
+    PNG-Antwort mit starkem ETag.
+
+    - Passt `If-None-Match` zum ETag -> 304 ohne Rendern.
+    - Sonst PNG aus dem ChartCache bzw. vom laufenden Vorab-Render-Job,
+      erst dann `render()` aufrufen und ablegen.
+    """
+    if etag in request.if_none_match:
+        resp = Response(status=304, headers=headers)
+    else:
+        cache = get_chart_cache()
+        png = cache.get(etag)
+        if png is None:
+            # läuft gerade ein Vorab-Render dieses Diagramms? -> darauf warten
+            prerenderer = get_prerenderer()
+            if prerenderer is not None:
+                png = prerenderer.wait_for(etag, PRERENDER_WAIT_SECONDS)
+        if png is None:
+            with time_render(kind):
+                png = render()
+            cache.put(etag, png)
+        resp = Response(png, mimetype="image/png", headers=headers)
+
+    resp.set_etag(etag)
+    # Browser dürfen cachen, müssen aber revalidieren (-> 304)
+    resp.headers["Cache-Control"] = "no-cache"
+    return resp
+
+
 @progress_bp.get("/plan/<int:plan_id>/png")
 def plan_png(plan_id: int):
     """
     PNG für einen Plan zeichnen.
     Balkendiagramm: aktuelles (zuletzt erfasstes) Gewicht je Übung im Plan.
     Optional: ?download=1 setzt Attachment-Header.
+    Antworten sind per ETag revalidierbar und werden im ChartCache gehalten.
     """
     db = get_db()
-    plan_name = _fetch_plan_name(db, plan_id)
-    if not plan_name:
+    spec = plan_chart_spec(db, plan_id)
+    if spec is None:
         abort(404, "Plan not found")
-
-    data = _fetch_plan_exercises_with_latest_weight(db, plan_id)
-    labels = [name for name, _ in data]
-    values = [val for _, val in data]
-
-    fig, ax = plt.subplots(figsize=(7.5, 3.8), dpi=140)
-    ax.bar(labels, values)
-    ax.set_title(f"Current weights per exercise – {plan_name}")
-    ax.set_ylabel("Weight (kg)")
-    ax.set_xlabel("Exercise")
-    ax.grid(axis="y", linestyle=":", alpha=0.4)
-    plt.setp(ax.get_xticklabels(), rotation=18, ha="right")
-    plt.tight_layout()
-
-    buf = io.BytesIO()
-    fig.savefig(buf, format="png")
-    plt.close(fig)
-    buf.seek(0)
+    etag, plan_name, data = spec
 
     download = request.args.get("download", type=int) == 1
     headers = {}
@@ -287,7 +393,12 @@ def plan_png(plan_id: int):
         safe_name = plan_name.replace('"', "'")
         headers["Content-Disposition"] = f'attachment; filename="progress_plan_{safe_name}.png"'
 
-    return Response(buf.getvalue(), mimetype="image/png", headers=headers)
+    return _png_response(
+        "plan",
+        etag,
+        lambda: charts.render_plan_png(plan_name, data),
+        headers,
+    )
 
 
 @progress_bp.get("/exercise/<int:exercise_id>/png")
@@ -296,47 +407,15 @@ def exercise_png(exercise_id: int):
     PNG für eine Übung zeichnen.
     Liniendiagramm: Gewicht über die Zeit.
     Optional: ?plan_id=... zum Filtern, ?download=1 für Attachment-Header.
+    Antworten sind per ETag revalidierbar und werden im ChartCache gehalten.
     """
     plan_id = request.args.get("plan_id", type=int)
 
     db = get_db()
-    exercise_name = _fetch_exercise_name(db, exercise_id)
+    exercise_name = fetch_exercise_name(db, exercise_id)
     if not exercise_name:
         abort(404, "Exercise not found")
-
-    history = _fetch_exercise_history(db, exercise_id, plan_id)
-    dates = [datetime.strptime(day, "%Y-%m-%d").date() for day, _ in history]
-    weights = [w for _, w in history]
-
-    fig, ax = plt.subplots(figsize=(7.5, 3.2), dpi=140)
-
-    if weights:
-        # Linie mit Markern, x-Achse = Datum, y-Achse = Gewicht
-        ax.plot(dates, weights, marker="o", linewidth=2)
-    else:
-        ax.text(
-            0.5, 0.5,
-            "No data yet",
-            ha="center", va="center", transform=ax.transAxes
-        )
-
-    title = f"Weight over time – {exercise_name}"
-    if plan_id:
-        plan_name = _fetch_plan_name(db, plan_id)
-        if plan_name:
-            title += f" (Plan: {plan_name})"
-
-    ax.set_title(title)
-    ax.set_ylabel("Weight (kg)")
-    ax.set_xlabel("Date")
-    ax.grid(True, linestyle=":", alpha=0.4)
-    fig.autofmt_xdate()
-    plt.tight_layout()
-
-    buf = io.BytesIO()
-    fig.savefig(buf, format="png")
-    plt.close(fig)
-    buf.seek(0)
+    etag, title, history = exercise_chart_spec(db, exercise_id, plan_id, exercise_name)
 
     download = request.args.get("download", type=int) == 1
     headers = {}
@@ -344,4 +423,41 @@ def exercise_png(exercise_id: int):
         base = exercise_name.replace('"', "'")
         suffix = f"_plan{plan_id}" if plan_id else ""
         headers["Content-Disposition"] = f'attachment; filename=\"progress_exercise_{base}{suffix}.png\"'
-    return Response(buf.getvalue(), mimetype="image/png", headers=headers)
+
+    return _png_response(
+        "exercise",
+        etag,
+        lambda: charts.render_exercise_png(title, history),
+        headers,
+    )
+
+
+@progress_bp.get("/plan/<int:plan_id>/dashboard")
+def plan_dashboard(plan_id: int):
+    """
+    Small Multiples: Gewichtsverlauf aller Übungen eines Plans in *einem* PNG.
+    Eine SQL-Abfrage und ein Rendering statt je eines `exercise_png` pro Übung.
+    Optional: ?download=1 setzt Attachment-Header.
+    """
+    db = get_db()
+    plan_name = fetch_plan_name(db, plan_id)
+    if not plan_name:
+        abort(404, "Plan not found")
+
+    panels = [
+        (name, [(day, weight) for day, weight, _ in series])
+        for _, name, series in _fetch_plan_dashboard_series(db, plan_id)
+    ]
+    etag = chart_key("dashboard", plan_id, plan_name, panels)
+
+    headers = {}
+    if request.args.get("download", type=int) == 1:
+        safe_name = plan_name.replace('"', "'")
+        headers["Content-Disposition"] = f'attachment; filename="progress_dashboard_{safe_name}.png"'
+
+    return _png_response(
+        "dashboard",
+        etag,
+        lambda: charts.render_dashboard_png(plan_name, panels),
+        headers,
+    )
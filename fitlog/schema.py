@@ -0,0 +1,78 @@
+# fitlog/schema.py
+"""
+Schema-Fähigkeiten der Datenbank – einmal pro Prozess ermittelt.
+
+Beim App-Start werden die Migrationen angewendet (siehe `fitlog.migrations`)
+und anschließend das Schema einmalig inspiziert. Request-Code fragt
+`get_schema()` ab, statt pro Request `PRAGMA table_info` auszuführen.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Tuple
+
+from flask import Flask, current_app
+
+from fitlog.migrations import apply_migrations
+
+# Tabellen, deren Spalten in den Fähigkeiten festgehalten werden
+_TABLES = ("exercises", "training_plans", "plan_exercises", "sessions", "session_entries")
+
+
+@dataclass(frozen=True)
+class SchemaCapabilities:
+    user_version: int
+    sqlite_version: Tuple[int, ...]
+    columns: Dict[str, FrozenSet[str]] = field(default_factory=dict)
+    tables: FrozenSet[str] = frozenset()
+
+    def has_column(self, table: str, column: str) -> bool:
+        return column.lower() in self.columns.get(table, frozenset())
+
+    def has_table(self, table: str) -> bool:
+        """Tabelle vorhanden (auch optionale, z. B. exercises_fts ohne FTS5)."""
+        return table.lower() in self.tables
+
+
+def inspect_schema(conn: sqlite3.Connection) -> SchemaCapabilities:
+    """Schema über PRAGMA inspizieren (nur beim Start bzw. einmalig)."""
+    columns: Dict[str, FrozenSet[str]] = {}
+    for table in _TABLES:
+        rows = conn.execute(f"PRAGMA table_info({table})").fetchall()
+        columns[table] = frozenset(r[1].lower() for r in rows)
+    tables = frozenset(
+        r[0].lower() for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    )
+
+    return SchemaCapabilities(
+        user_version=conn.execute("PRAGMA user_version").fetchone()[0],
+        sqlite_version=sqlite3.sqlite_version_info,
+        columns=columns,
+        tables=tables,
+    )
+
+
+def init_schema(app: Flask) -> SchemaCapabilities:
+    """Migrationen anwenden (falls AUTO_MIGRATE) und Fähigkeiten cachen."""
+    db_path = app.config["DATABASE"]
+    if app.config.get("AUTO_MIGRATE", True):
+        apply_migrations(db_path)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        caps = inspect_schema(conn)
+    finally:
+        conn.close()
+
+    app.extensions["schema"] = caps
+    return caps
+
+
+def get_schema() -> SchemaCapabilities:
+    """Gecachte Schema-Fähigkeiten der aktuellen App."""
+    caps = current_app.extensions.get("schema")
+    if caps is None:
+        caps = init_schema(current_app)
+    return caps
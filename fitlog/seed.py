@@ -9,8 +9,8 @@ Ausführung:
     python seed.py
 
 Voraussetzung:
-    - Die Datenbank wurde vorher mit `init_db.py` und `instance/001_init.sql`
-      initialisiert.
+    - Die Datenbank wurde vorher mit `init_db.py` (bzw. beim App-Start über
+      die Migrationen in `fitlog/migrations`) initialisiert.
 """
 
 import sqlite3
@@ -0,0 +1,183 @@
+# fitlog/services/analytics.py
+"""
+Kraft-Analysen für eine Übung, vektorisiert mit NumPy.
+
+Die komplette Historie einer Übung wird mit *einer* Abfrage als Spalten
+(Tag, Gewicht, Wdh., Sätze) geladen und anschließend ohne Python-Schleife
+pro Zeile ausgewertet:
+
+  - geschätztes 1RM je Eintrag (Epley, Brzycki)
+  - Tonnage (Gewicht × Wdh. × Sätze)
+  - Tageswerte (bestes e1RM, Höchstgewicht, Tonnage)
+  - gleitende 4-Wochen-Mittel (Zeitfenster von 28 Tagen, nicht 28 Punkte)
+  - PR-Markierungen (Tag übertrifft alle vorherigen Tage)
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+ROLLING_WINDOW_DAYS = 28
+
+
+def load_exercise_arrays(db, exercise_id: int, plan_id: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    Historie einer Übung als NumPy-Spalten (nach Tag sortiert).
+
+    Fehlende Wdh. werden zu NaN (kein e1RM), fehlende Sätze zählen als 1.
+    Die Reihenfolge liefert idx_session_entries_performed (keine Sortierung).
+    """
+    plan_filter = "AND s.plan_id = :plan_id" if plan_id else ""
+    cur = db.execute(
+        f"""
+        SELECT DATE(se.performed_at, 'unixepoch') AS day,
+               se.weight_kg,
+               se.reps,
+               COALESCE(se.sets, 1) AS sets
+          FROM session_entries se
+          JOIN sessions s ON s.id = se.session_id
+         WHERE se.exercise_id = :exercise_id
+           AND se.performed_at IS NOT NULL
+           AND se.weight_kg IS NOT NULL
+           {plan_filter}
+         ORDER BY se.performed_at
+        """,
+        {"exercise_id": exercise_id, "plan_id": plan_id},
+    )
+    cur.row_factory = None  # einfache Tupel, kein sqlite3.Row-Overhead
+    rows = cur.fetchall()
+
+    if not rows:
+        return {
+            "day": np.array([], dtype="datetime64[D]"),
+            "weight": np.array([], dtype=float),
+            "reps": np.array([], dtype=float),
+            "sets": np.array([], dtype=float),
+        }
+
+    days, weights, reps, sets = zip(*rows)
+    return {
+        "day": np.array(days, dtype="datetime64[D]"),
+        "weight": np.array(weights, dtype=float),
+        "reps": np.array(reps, dtype=float),  # None -> NaN
+        "sets": np.array(sets, dtype=float),
+    }
+
+
+def epley(weight: np.ndarray, reps: np.ndarray) -> np.ndarray:
+    """e1RM nach Epley: w · (1 + r/30); bei 1 Wdh. das Gewicht selbst."""
+    return np.where(reps == 1, weight, weight * (1.0 + reps / 30.0))
+
+
+def brzycki(weight: np.ndarray, reps: np.ndarray) -> np.ndarray:
+    """e1RM nach Brzycki: w · 36 / (37 − r); ab 37 Wdh. nicht definiert (NaN)."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = weight * 36.0 / (37.0 - reps)
+    return np.where(reps < 37, result, np.nan)
+
+
+def _rolling_window(days: np.ndarray, values: np.ndarray, window_days: int):
+    """Summe und Anzahl je Tag über das Zeitfenster (d − window + 1 … d)."""
+    valid = ~np.isnan(values)
+    cs = np.concatenate(([0.0], np.cumsum(np.where(valid, values, 0.0))))
+    cn = np.concatenate(([0], np.cumsum(valid)))
+    end = np.arange(1, len(days) + 1)
+    start = np.searchsorted(days, days - np.timedelta64(window_days - 1, "D"), side="left")
+    return cs[end] - cs[start], cn[end] - cn[start]
+
+
+def compute_exercise_stats(arrays: Dict[str, np.ndarray]) -> Dict[str, Any]:
+    """Alle Kennzahlen aus den Spalten von `load_exercise_arrays`."""
+    day = arrays["day"]
+    weight = arrays["weight"]
+    reps = arrays["reps"]
+    sets = arrays["sets"]
+
+    e1rm_epley = epley(weight, reps)
+    e1rm_brzycki = brzycki(weight, reps)
+    tonnage = weight * np.nan_to_num(reps) * sets
+
+    if len(day) == 0:
+        empty = np.array([], dtype=float)
+        return {
+            "days": np.array([], dtype="datetime64[D]"),
+            "max_weight": empty, "e1rm_epley": empty, "e1rm_brzycki": empty,
+            "tonnage": empty, "e1rm_avg_4w": empty, "tonnage_weekly_avg_4w": empty,
+            "pr_e1rm": np.array([], dtype=bool), "pr_weight": np.array([], dtype=bool),
+            "entries": 0,
+        }
+
+    # Einträge zu Tagen gruppieren (day ist sortiert)
+    days, first = np.unique(day, return_index=True)
+    day_max_weight = np.maximum.reduceat(weight, first)
+    day_epley = np.fmax.reduceat(e1rm_epley, first)       # fmax ignoriert NaN
+    day_brzycki = np.fmax.reduceat(e1rm_brzycki, first)
+    day_tonnage = np.add.reduceat(tonnage, first)
+
+    e1rm_sum, e1rm_n = _rolling_window(days, day_epley, ROLLING_WINDOW_DAYS)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        e1rm_avg = np.where(e1rm_n > 0, e1rm_sum / e1rm_n, np.nan)
+    ton_sum, _ = _rolling_window(days, day_tonnage, ROLLING_WINDOW_DAYS)
+    ton_weekly = ton_sum / (ROLLING_WINDOW_DAYS / 7)
+
+    # PR: Tageswert übertrifft das bisherige Maximum aller Vortage
+    def _pr(values: np.ndarray) -> np.ndarray:
+        filled = np.where(np.isnan(values), -np.inf, values)
+        previous_best = np.concatenate(([-np.inf], np.maximum.accumulate(filled)[:-1]))
+        return filled > previous_best
+
+    return {
+        "days": days,
+        "max_weight": day_max_weight,
+        "e1rm_epley": day_epley,
+        "e1rm_brzycki": day_brzycki,
+        "tonnage": day_tonnage,
+        "e1rm_avg_4w": e1rm_avg,
+        "tonnage_weekly_avg_4w": ton_weekly,
+        "pr_e1rm": _pr(day_epley),
+        "pr_weight": _pr(day_max_weight),
+        "entries": int(len(day)),
+    }
+
+
+def _json_floats(values: np.ndarray) -> list:
+    """Gerundete Floats; NaN wird zu None (JSON null)."""
+    rounded = np.round(values.astype(float), 2)
+    return np.where(np.isnan(rounded), None, rounded).tolist()
+
+
+def stats_to_json(stats: Dict[str, Any]) -> Dict[str, Any]:
+    """Spaltenweise, JSON-serialisierbare Darstellung inkl. Zusammenfassung."""
+    days = stats["days"]
+    has_data = len(days) > 0
+
+    def _best(values: np.ndarray) -> Optional[float]:
+        if not has_data or np.all(np.isnan(values)):
+            return None
+        return round(float(np.nanmax(values)), 2)
+
+    return {
+        "summary": {
+            "entries": stats["entries"],
+            "training_days": int(len(days)),
+            "first_day": str(days[0]) if has_data else None,
+            "last_day": str(days[-1]) if has_data else None,
+            "best_weight_kg": _best(stats["max_weight"]),
+            "best_e1rm_kg": _best(stats["e1rm_epley"]),
+            "total_tonnage_kg": round(float(stats["tonnage"].sum()), 2),
+            "pr_count": int(stats["pr_e1rm"].sum()),
+        },
+        "series": {
+            "days": days.astype(str).tolist(),
+            "max_weight_kg": _json_floats(stats["max_weight"]),
+            "e1rm_epley_kg": _json_floats(stats["e1rm_epley"]),
+            "e1rm_brzycki_kg": _json_floats(stats["e1rm_brzycki"]),
+            "tonnage_kg": _json_floats(stats["tonnage"]),
+            "e1rm_avg_4w_kg": _json_floats(stats["e1rm_avg_4w"]),
+            "tonnage_weekly_avg_4w_kg": _json_floats(stats["tonnage_weekly_avg_4w"]),
+            "pr_e1rm": stats["pr_e1rm"].tolist(),
+            "pr_weight": stats["pr_weight"].tolist(),
+        },
+    }
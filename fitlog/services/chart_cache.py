@@ -0,0 +1,177 @@
+# fitlog/services/chart_cache.py
+"""
+Content-adressierter Cache für die Fortschritts-Diagramme (PNG).
+
+Der Schlüssel eines Diagramms ist ein SHA-256 über alle Eingaben, die das
+Bild beeinflussen (Diagrammtyp, Plan-/Übungs-ID, Planfilter, Titel und die
+geordneten Diagrammdaten selbst). Gleiche Eingaben ergeben damit dasselbe
+Bild – der Schlüssel taugt direkt als starkes ETag.
+
+Aufbau:
+  - begrenzter LRU im Speicher (pro Prozess)
+  - optionaler Spill auf die Platte unter `instance/` (überlebt Neustarts
+    und wird von allen Workern geteilt)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+
+from flask import current_app
+
+
+def chart_key(kind: str, *parts: Any) -> str:
+    """Stabilen Cache-Schlüssel (hex) aus Diagrammtyp + Eingaben bilden."""
+    h = hashlib.sha256(kind.encode("utf-8"))
+    for part in parts:
+        h.update(b"\x1f")
+        h.update(repr(part).encode("utf-8"))
+    return h.hexdigest()
+
+
+class ChartCache:
+    """
+    Thread-sicherer LRU-Cache für PNG-Bytes mit optionalem Platten-Spill.
+
+    Einträge, die aus dem Speicher verdrängt werden, landen (falls ein
+    `spill_dir` gesetzt ist) als `<key>.png` auf der Platte und werden beim
+    nächsten Zugriff wieder in den Speicher geholt.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        spill_dir: Optional[str | Path] = None,
+        max_spill_files: int = 2048,
+    ) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self.max_spill_files = max(1, int(max_spill_files))
+        self._items: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if self.spill_dir is not None:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            if key in self._items:
+                return True
+        path = self._spill_path(key)
+        return path is not None and path.exists()
+
+    # ---------------------------
+    # Öffentliche API
+    # ---------------------------
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._items.get(key)
+            if data is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return data
+
+        data = self._read_spill(key)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            evicted = self._insert(key, data)
+        self._write_spill(evicted)
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        with self._lock:
+            evicted = self._insert(key, data)
+        self._write_spill(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    # ---------------------------
+    # Interna
+    # ---------------------------
+
+    def _insert(self, key: str, data: bytes) -> list[tuple[str, bytes]]:
+        """Eintrag einfügen (Lock muss gehalten werden); liefert Verdrängte."""
+        self._items[key] = data
+        self._items.move_to_end(key)
+        evicted: list[tuple[str, bytes]] = []
+        while len(self._items) > self.max_entries:
+            evicted.append(self._items.popitem(last=False))
+        return evicted
+
+    def _spill_path(self, key: str) -> Optional[Path]:
+        if self.spill_dir is None:
+            return None
+        return self.spill_dir / f"{key}.png"
+
+    def _read_spill(self, key: str) -> Optional[bytes]:
+        path = self._spill_path(key)
+        if path is None:
+            return None
+        try:
+            return path.read_bytes()
+        except OSError:
+            return None
+
+    def _write_spill(self, evicted: list[tuple[str, bytes]]) -> None:
+        if self.spill_dir is None or not evicted:
+            return
+        for key, data in evicted:
+            path = self._spill_path(key)
+            if path.exists():
+                continue
+            # Atomar schreiben, damit parallele Worker nie halbe Dateien lesen
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            try:
+                tmp.write_bytes(data)
+                os.replace(tmp, path)
+            except OSError:
+                tmp.unlink(missing_ok=True)
+        self._prune_spill()
+
+    def _prune_spill(self) -> None:
+        """Älteste Spill-Dateien löschen, sobald das Limit überschritten ist."""
+        try:
+            files = sorted(self.spill_dir.glob("*.png"), key=lambda p: p.stat().st_mtime)
+        except OSError:
+            return
+        for path in files[: max(0, len(files) - self.max_spill_files)]:
+            path.unlink(missing_ok=True)
+
+
+def init_chart_cache(app) -> ChartCache:
+    """ChartCache gemäß App-Konfiguration anlegen und in `app.extensions` ablegen."""
+    spill_dir = None
+    if app.config.get("CHART_CACHE_SPILL"):
+        spill_dir = app.config.get("CHART_CACHE_DIR") or str(
+            Path(app.instance_path) / "chart_cache"
+        )
+    cache = ChartCache(
+        max_entries=app.config.get("CHART_CACHE_SIZE", 128),
+        spill_dir=spill_dir,
+        max_spill_files=app.config.get("CHART_CACHE_SPILL_MAX_FILES", 2048),
+    )
+    app.extensions["chart_cache"] = cache
+    return cache
+
+
+def get_chart_cache() -> ChartCache:
+    """ChartCache der aktuellen App (wird bei Bedarf angelegt)."""
+    cache = current_app.extensions.get("chart_cache")
+    if cache is None:
+        cache = init_chart_cache(current_app)
+    return cache
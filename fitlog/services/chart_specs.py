@@ -0,0 +1,166 @@
+# fitlog/services/chart_specs.py
+"""
+Eingaben der Fortschritts-Diagramme: Daten per SQL, Titel und Cache-Schlüssel.
+
+Von den PNG-Endpoints (fitlog/routes/progress.py) und vom Vorab-Rendern
+(fitlog/services/prerender.py) gemeinsam genutzt – beide müssen für dasselbe
+Diagramm denselben Schlüssel bilden, sonst trifft der Vorab-Render nie.
+Braucht nur eine Connection, keinen Request-Kontext.
+
+  - `plan_chart_spec`:     (ETag, Planname, [(Übung, Gewicht), ...])
+  - `exercise_chart_spec`: (ETag, Titel, [(Tag, Gewicht), ...])
+"""
+
+from __future__ import annotations
+
+from typing import List, Optional, Tuple
+
+from .chart_cache import chart_key
+
+
+# ---------------------------
+# Abfragen
+# ---------------------------
+
+def fetch_plan_name(db, plan_id: int) -> Optional[str]:
+    row = db.execute(
+        "SELECT name FROM training_plans WHERE id = ? AND deleted_at IS NULL",
+        (plan_id,),
+    ).fetchone()
+    return row["name"] if row else None
+
+
+def fetch_exercise_name(db, exercise_id: int) -> Optional[str]:
+    row = db.execute(
+        "SELECT name FROM exercises WHERE id = ?",
+        (exercise_id,),
+    ).fetchone()
+    return row["name"] if row else None
+
+
+def fetch_plan_exercises_with_latest_weight(db, plan_id: int) -> List[Tuple[str, float]]:
+    """
+    Liefert Liste von (exercise_name, latest_weight_kg) für alle Übungen eines Plans.
+
+    latest_weight_kg:
+      - letztes erfasstes Gewicht aus session_entries / sessions
+      - falls keine Erfassung existiert, Default-Gewicht des Plans bzw. 0.0 als Fallback.
+
+    Eine einzige Abfrage für alle Übungen: je Übung liest die Unterabfrage
+    idx_session_entries_performed rückwärts (neueste zuerst) und bricht beim
+    ersten Eintrag aus einer Session dieses Plans ab – ein Bereichsscan statt
+    ROW_NUMBER() mit Sortierung aller Einträge des Plans.
+    """
+    rows = db.execute(
+        """
+        SELECT e.name AS exercise_name,
+               COALESCE(
+                   (SELECT se.weight_kg
+                      FROM session_entries se
+                      JOIN sessions s ON s.id = se.session_id
+                     WHERE se.exercise_id = pe.exercise_id
+                       AND se.weight_kg IS NOT NULL
+                       AND s.plan_id = :plan_id
+                     ORDER BY se.performed_at DESC, se.rowid DESC
+                     LIMIT 1),
+                   pe.default_weight_kg,
+                   0
+               ) AS latest_weight_kg
+          FROM plan_exercises pe
+          JOIN exercises e ON e.id = pe.exercise_id
+         WHERE pe.plan_id = :plan_id
+         ORDER BY COALESCE(pe.position, 999999), e.name
+        """,
+        {"plan_id": plan_id},
+    ).fetchall()
+
+    return [(r["exercise_name"], float(r["latest_weight_kg"])) for r in rows]
+
+
+def fetch_exercise_series(
+    db,
+    exercise_id: int,
+    plan_id: Optional[int],
+) -> List[Tuple[str, float, float]]:
+    """
+    Liefert Verlauf (ISO-Datum, Höchstgewicht, Volumen in kg) für eine Übung,
+    ein Punkt je Trainingstag. Optional nach Plan filterbar, nach Datum sortiert.
+
+    Liest aus dem Tages-Rollup `exercise_daily_stats`; die Kosten hängen damit
+    von der Zahl der Trainingstage ab, nicht von der Zahl der Einträge.
+    """
+    if plan_id:
+        rows = db.execute(
+            """
+            SELECT day, max_weight_kg AS weight_kg, total_volume_kg AS volume_kg
+              FROM exercise_daily_stats
+             WHERE exercise_id = ?
+               AND plan_id = ?
+               AND max_weight_kg IS NOT NULL
+             ORDER BY day
+            """,
+            (exercise_id, plan_id),
+        ).fetchall()
+    else:
+        rows = db.execute(
+            """
+            SELECT day, MAX(max_weight_kg) AS weight_kg, TOTAL(total_volume_kg) AS volume_kg
+              FROM exercise_daily_stats
+             WHERE exercise_id = ?
+               AND max_weight_kg IS NOT NULL
+             GROUP BY day
+             ORDER BY day
+            """,
+            (exercise_id,),
+        ).fetchall()
+
+    return [(r["day"], float(r["weight_kg"]), float(r["volume_kg"])) for r in rows]
+
+
+def fetch_exercise_history(
+    db,
+    exercise_id: int,
+    plan_id: Optional[int],
+) -> List[Tuple[str, float]]:
+    """
+    Liefert Verlauf (ISO-Datum, Gewicht) für eine Übung – ein Punkt je
+    Trainingstag mit dem höchsten Gewicht des Tages.
+    Optional nach Plan filterbar.
+    Sortiert nach Datum aufsteigend.
+    """
+    return [(day, weight) for day, weight, _ in fetch_exercise_series(db, exercise_id, plan_id)]
+
+
+# ---------------------------
+# Diagramm-Spezifikationen
+# ---------------------------
+
+def plan_chart_spec(db, plan_id: int) -> Optional[Tuple[str, str, List[Tuple[str, float]]]]:
+    """(ETag, Planname, Daten) des Plan-Diagramms; None, wenn es den Plan nicht gibt."""
+    plan_name = fetch_plan_name(db, plan_id)
+    if not plan_name:
+        return None
+
+    # Die geordneten (Übung, Gewicht)-Paare sind genau die Diagramm-Eingabe
+    # (ein Bereichsscan je Übung) -> direkt als Inhalts-Fingerprint
+    data = fetch_plan_exercises_with_latest_weight(db, plan_id)
+    return chart_key("plan", plan_id, plan_name, data), plan_name, data
+
+
+def exercise_chart_spec(
+    db, exercise_id: int, plan_id: Optional[int] = None, exercise_name: Optional[str] = None
+) -> Optional[Tuple[str, str, List[Tuple[str, float]]]]:
+    """(ETag, Titel, Verlauf) des Übungsdiagramms; None bei unbekannter Übung."""
+    exercise_name = exercise_name or fetch_exercise_name(db, exercise_id)
+    if not exercise_name:
+        return None
+
+    title = f"Weight over time – {exercise_name}"
+    if plan_id:
+        plan_name = fetch_plan_name(db, plan_id)
+        if plan_name:
+            title += f" (Plan: {plan_name})"
+
+    # Verlauf aus dem Rollup ist günstig -> direkt als Inhalts-Fingerprint
+    history = fetch_exercise_history(db, exercise_id, plan_id)
+    return chart_key("exercise", exercise_id, plan_id, title, history), title, history
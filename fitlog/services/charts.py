@@ -0,0 +1,185 @@
+# fitlog/services/charts.py
+"""
+Rendering der Fortschritts-Diagramme (PNG) mit Matplotlib.
+
+Gezeichnet wird ausschließlich über die objektorientierte API (`Figure` +
+`FigureCanvasAgg`), ohne pyplot: keine globale Figure-Verwaltung, kein
+`plt.close`, kein Zustand, den sich Threads teilen. Jeder Aufruf baut seine
+eigene Figure und kann damit gefahrlos parallel in mehreren Threads laufen.
+Das Aussehen steckt in wiederverwendbaren `ChartStyle`-Vorlagen, die direkt
+an die Artists übergeben werden – `rcParams` bleiben unangetastet.
+
+Matplotlib wird erst beim ersten Diagramm importiert (`_mpl`), nicht beim
+Import der App – Worker beantworten `/health` und `/` damit ohne
+Matplotlib-Import und Font-Cache. Wer die Kosten lieber beim Start zahlt
+(z. B. Gunicorn mit --preload), setzt `CHART_WARMUP=True` (siehe `warmup`).
+"""
+
+from __future__ import annotations
+
+import io
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+_Figure = None
+_Canvas = None
+_mpl_lock = threading.Lock()
+
+
+def _mpl():
+    """(Figure, FigureCanvasAgg) einmalig und thread-sicher importieren."""
+    global _Figure, _Canvas
+    if _Figure is None:
+        with _mpl_lock:
+            if _Figure is None:
+                from matplotlib.backends.backend_agg import FigureCanvasAgg
+                from matplotlib.figure import Figure
+                _Canvas = FigureCanvasAgg
+                _Figure = Figure
+    return _Figure, _Canvas
+
+
+# ---------------------------
+# Stilvorlagen
+# ---------------------------
+
+@dataclass(frozen=True)
+class ChartStyle:
+    figsize: Tuple[float, float] = (7.5, 3.8)
+    dpi: int = 140
+    color: Optional[str] = None          # None = Matplotlib-Standardfarbe
+    linewidth: float = 2.0
+    marker: Optional[str] = None
+    grid_axis: str = "both"
+    grid_linestyle: str = ":"
+    grid_alpha: float = 0.4
+    xtick_rotation: float = 0.0
+    title_size: Optional[float] = None
+    label_size: Optional[float] = None
+    tick_size: Optional[float] = None
+
+
+PLAN_STYLE = ChartStyle(figsize=(7.5, 3.8), grid_axis="y", xtick_rotation=18)
+EXERCISE_STYLE = ChartStyle(figsize=(7.5, 3.2), marker="o")
+# figsize gilt je Einzeldiagramm (Panel) der Small Multiples
+DASHBOARD_STYLE = ChartStyle(
+    figsize=(3.2, 2.3), dpi=110, linewidth=1.5, marker=".",
+    title_size=9, label_size=8, tick_size=7,
+)
+DASHBOARD_COLUMNS = 3
+
+
+def _new_figure(style: ChartStyle):
+    Figure, Canvas = _mpl()
+    fig = Figure(figsize=style.figsize, dpi=style.dpi)
+    Canvas(fig)  # hängt sich an fig.canvas
+    return fig, fig.add_subplot()
+
+
+def _decorate(ax, style: ChartStyle, title: str, xlabel: str, ylabel: str) -> None:
+    ax.set_title(title, fontsize=style.title_size)
+    ax.set_xlabel(xlabel, fontsize=style.label_size)
+    ax.set_ylabel(ylabel, fontsize=style.label_size)
+    ax.grid(True, axis=style.grid_axis, linestyle=style.grid_linestyle, alpha=style.grid_alpha)
+    if style.tick_size:
+        ax.tick_params(labelsize=style.tick_size)
+    if style.xtick_rotation:
+        for label in ax.get_xticklabels():
+            label.set_rotation(style.xtick_rotation)
+            label.set_horizontalalignment("right")
+
+
+def _to_png(fig) -> bytes:
+    fig.tight_layout()
+    buf = io.BytesIO()
+    fig.canvas.print_png(buf)
+    return buf.getvalue()
+
+
+# ---------------------------
+# Diagramme
+# ---------------------------
+
+def warmup() -> None:
+    """Opt-in: Matplotlib laden und ein Mini-Diagramm rendern (Font-Cache, Agg)."""
+    render_exercise_png("warmup", [])
+
+
+def render_plan_png(
+    plan_name: str, data: List[Tuple[str, float]], style: ChartStyle = PLAN_STYLE
+) -> bytes:
+    """Balkendiagramm (aktuelles Gewicht je Übung) als PNG-Bytes."""
+    labels = [name for name, _ in data]
+    values = [val for _, val in data]
+
+    fig, ax = _new_figure(style)
+    ax.bar(labels, values, color=style.color)
+    _decorate(ax, style, f"Current weights per exercise – {plan_name}", "Exercise", "Weight (kg)")
+    return _to_png(fig)
+
+
+def render_exercise_png(
+    title: str, history: List[Tuple[str, float]], style: ChartStyle = EXERCISE_STYLE
+) -> bytes:
+    """Liniendiagramm (Gewicht über die Zeit) als PNG-Bytes."""
+    dates = [datetime.strptime(day, "%Y-%m-%d").date() for day, _ in history]
+    weights = [w for _, w in history]
+
+    fig, ax = _new_figure(style)
+    if weights:
+        # Linie mit Markern, x-Achse = Datum, y-Achse = Gewicht
+        ax.plot(dates, weights, marker=style.marker, linewidth=style.linewidth, color=style.color)
+    else:
+        ax.text(
+            0.5, 0.5,
+            "No data yet",
+            ha="center", va="center", transform=ax.transAxes
+        )
+
+    _decorate(ax, style, title, "Date", "Weight (kg)")
+    fig.autofmt_xdate()
+    return _to_png(fig)
+
+
+def render_dashboard_png(
+    plan_name: str,
+    panels: List[Tuple[str, List[Tuple[str, float]]]],
+    style: ChartStyle = DASHBOARD_STYLE,
+) -> bytes:
+    """Small Multiples (ein Gewichtsverlauf je Übung) in einer Figure als PNG-Bytes."""
+    from matplotlib.dates import AutoDateLocator, ConciseDateFormatter
+
+    Figure, Canvas = _mpl()
+    n = max(1, len(panels))
+    ncols = min(DASHBOARD_COLUMNS, n)
+    nrows = -(-n // ncols)
+    width, height = style.figsize
+    fig = Figure(figsize=(width * ncols, height * nrows + 0.5), dpi=style.dpi)
+    Canvas(fig)
+    fig.suptitle(f"Progress per exercise – {plan_name}")
+    axes = fig.subplots(nrows, ncols, squeeze=False).ravel()
+
+    if not panels:
+        axes[0].text(0.5, 0.5, "No exercises in this plan", ha="center", va="center",
+                     transform=axes[0].transAxes)
+        axes[0].set_axis_off()
+
+    for ax, (name, history) in zip(axes, panels):
+        if history:
+            dates = [datetime.strptime(day, "%Y-%m-%d").date() for day, _ in history]
+            ax.plot(dates, [w for _, w in history], marker=style.marker,
+                    linewidth=style.linewidth, color=style.color)
+            locator = AutoDateLocator(minticks=3, maxticks=6)
+            ax.xaxis.set_major_locator(locator)
+            ax.xaxis.set_major_formatter(ConciseDateFormatter(locator))
+        else:
+            ax.text(0.5, 0.5, "No data yet", ha="center", va="center",
+                    transform=ax.transAxes, fontsize=style.label_size)
+        _decorate(ax, style, name, "", "kg")
+
+    for ax in axes[n:]:
+        ax.set_axis_off()
+
+    return _to_png(fig)
@@ -0,0 +1,106 @@
+# fitlog/services/data_version.py
+"""
+Datenversion für schreib-invalidierte Caches (z. B. die Startseite).
+
+Jeder Schreibpfad, der sichtbare Daten ändert (Plan anlegen/ändern/löschen,
+Training beenden/abbrechen, Import), ruft `bump_data_version()` auf. Caches
+speichern ihre Werte zusammen mit der Version, unter der sie geladen wurden,
+und laden erst neu, wenn sich die Version geändert hat – ein Treffer kostet
+damit kein SQL.
+
+Die Version besteht aus
+  - einem Zähler im Prozess (sofort sichtbar für den schreibenden Worker)
+  - Inode + mtime der Datei `DATA_VERSION_FILE` (Standard:
+    instance/data_version), die bei jedem Bump atomar ersetzt wird – so
+    sehen auch andere Worker-Prozesse und CLI-Importe die Änderung
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from flask import Flask, current_app
+
+Version = Tuple[int, int, int]
+
+
+class DataVersion:
+    """Monotone Datenversion eines Prozesses, über eine Datei geteilt."""
+
+    def __init__(self, path: Optional[str | Path] = None) -> None:
+        self.path = Path(path) if path else None
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def current(self) -> Version:
+        if self.path is None:
+            return (self._counter, 0, 0)
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return (self._counter, 0, 0)
+        return (self._counter, st.st_ino, st.st_mtime_ns)
+
+    def bump(self) -> Version:
+        with self._lock:
+            self._counter += 1
+            if self.path is not None:
+                # neue Datei statt Überschreiben: neuer Inode, auch wenn die
+                # mtime-Auflösung des Dateisystems grob ist
+                tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+                tmp.write_text(f"{self._counter}\n", encoding="ascii")
+                os.replace(tmp, self.path)
+        return self.current()
+
+
+class VersionedCache:
+    """Kleiner Cache: je Name ein Wert, gültig solange die Datenversion gleich ist."""
+
+    def __init__(self, version: DataVersion) -> None:
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self._values: Dict[str, Tuple[Version, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get_or_load(self, name: str, loader: Callable[[], Any]) -> Any:
+        version = self.version.current()
+        with self._lock:
+            entry = self._values.get(name)
+        if entry is not None and entry[0] == version:
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        value = loader()
+        with self._lock:
+            self._values[name] = (version, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+def init_data_version(app: Flask) -> DataVersion:
+    """Datenversion und (falls `INDEX_CACHE`) den Seiten-Cache anlegen."""
+    path = app.config.get("DATA_VERSION_FILE") or str(Path(app.instance_path) / "data_version")
+    version = DataVersion(path)
+    app.extensions["data_version"] = version
+    if app.config.get("INDEX_CACHE"):
+        app.extensions["page_cache"] = VersionedCache(version)
+    return version
+
+
+def bump_data_version() -> None:
+    """Nach einem Commit aufrufen, der Plan- oder Session-Daten ändert."""
+    version = current_app.extensions.get("data_version")
+    if version is not None:
+        version.bump()
+
+
+def get_page_cache() -> Optional[VersionedCache]:
+    return current_app.extensions.get("page_cache")
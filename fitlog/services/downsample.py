@@ -0,0 +1,54 @@
+# fitlog/services/downsample.py
+"""
+Largest-Triangle-Three-Buckets (LTTB) zum Ausdünnen langer Zeitreihen.
+
+LTTB behält den ersten und letzten Punkt und wählt aus jedem Bucket den
+Punkt, der mit dem zuletzt gewählten Punkt und dem Mittel des nächsten
+Buckets das größte Dreieck aufspannt – Spitzen und Trendwechsel bleiben
+dadurch sichtbar, anders als bei einfachem Mitteln oder jedem n-ten Punkt.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Indizes der `threshold` repräsentativen Punkte (aufsteigend).
+
+    `x` muss aufsteigend sortiert sein. Ist `threshold` < 3 oder nicht kleiner
+    als die Anzahl Punkte, werden alle Indizes zurückgegeben.
+    """
+    n = len(x)
+    if threshold < 3 or threshold >= n:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    every = (n - 2) / (threshold - 2)
+    bounds = (np.floor(np.arange(threshold - 1) * every) + 1).astype(np.intp)
+    bounds[-1] = n - 1
+
+    indices = np.empty(threshold, dtype=np.intp)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        start, end = bounds[i], bounds[i + 1]
+        next_end = bounds[i + 2] if i + 2 < len(bounds) else n
+        next_start = end
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        # doppelte Dreiecksfläche (Vorzeichen egal) für alle Punkte des Buckets
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        indices[i + 1] = a
+
+    return indices
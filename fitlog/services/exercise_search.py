@@ -0,0 +1,93 @@
+# fitlog/services/exercise_search.py
+"""
+Übungssuche für die Auswahlfelder (Typeahead, GET /exercises/search).
+
+Statt den kompletten Übungskatalog in jede Seite zu rendern, fragen Plan-
+Bearbeitung und Fortschrittsseite seitenweise nach passenden Übungen.
+
+  - mit FTS5 (Migration 0008): jedes Wort der Eingabe als Präfix, alle Wörter
+    müssen vorkommen; Umlaute/Akzente werden ignoriert
+    („bankdru“ -> „Bankdrücken“, „seit steh“ -> „Seitheben stehend“)
+  - ohne FTS5: Teilstring-Suche per LIKE (ohne Umlaut-Normalisierung)
+
+Ergebnisse sind alphabetisch sortiert und werden mit limit/offset geblättert.
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+@dataclass
+class SearchPage:
+    items: List[Dict[str, Any]]
+    next_offset: Optional[int]  # None: keine weiteren Treffer
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"items": self.items, "next_offset": self.next_offset}
+
+
+def fts_query(text: str) -> Optional[str]:
+    """
+    Eingabe in einen FTS5-Ausdruck übersetzen: `"wort1"* "wort2"*`.
+
+    Nur Wortzeichen werden übernommen – Operatoren oder Anführungszeichen aus
+    der Eingabe können so keinen Syntaxfehler auslösen.
+    """
+    tokens = _TOKEN_RE.findall(text or "")
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def _like_pattern(token: str) -> str:
+    return "%" + token.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+def search_exercises(
+    db: sqlite3.Connection,
+    text: str,
+    limit: int = DEFAULT_LIMIT,
+    offset: int = 0,
+    use_fts: bool = True,
+) -> SearchPage:
+    """Eine Seite Übungen (id, name) passend zu `text`; leere Eingabe = alle."""
+    limit = min(max(1, limit), MAX_LIMIT)
+    offset = max(0, offset)
+
+    match = fts_query(text)
+    if match is None:
+        sql = "SELECT e.id, e.name FROM exercises e"
+        params: list = []
+    elif use_fts:
+        sql = """
+            SELECT e.id, e.name
+              FROM exercises_fts
+              JOIN exercises e ON e.id = exercises_fts.rowid
+             WHERE exercises_fts MATCH ?
+        """
+        params = [match]
+    else:
+        tokens = _TOKEN_RE.findall(text)
+        sql = "SELECT e.id, e.name FROM exercises e WHERE " + " AND ".join(
+            ["e.name LIKE ? ESCAPE '\\'"] * len(tokens)
+        )
+        params = [_like_pattern(t) for t in tokens]
+
+    # eine Zeile mehr lesen: verrät, ob es eine nächste Seite gibt
+    rows = db.execute(
+        f"{sql} ORDER BY e.name LIMIT ? OFFSET ?",
+        params + [limit + 1, offset],
+    ).fetchall()
+
+    items = [{"id": r["id"], "name": r["name"]} for r in rows[:limit]]
+    next_offset = offset + limit if len(rows) > limit else None
+    return SearchPage(items, next_offset)
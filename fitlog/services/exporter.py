@@ -0,0 +1,118 @@
+# fitlog/services/exporter.py
+"""
+Streaming-Export von Sessions und Einträgen als CSV oder NDJSON.
+
+Die Spalten entsprechen dem Importformat (siehe services/importer.py), ein
+Export lässt sich also direkt wieder importieren. Als `session` wird der
+Import-Schlüssel ausgegeben (sonst die ID) – ein Re-Import in dieselbe
+Datenbank findet die Sessions so wieder, statt sie zu verdoppeln. Zeilen werden blockweise
+per `fetchmany` vom Cursor gelesen und als Text-Blöcke ausgegeben – der
+Speicherbedarf bleibt unabhängig von der Datenbankgröße konstant.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import sqlite3
+from dataclasses import dataclass
+from typing import Iterator, Optional, Tuple
+
+FETCH_SIZE = 1000
+
+EXPORT_COLUMNS = (
+    "session", "date", "ended_at", "plan", "exercise",
+    "weight_kg", "reps", "sets", "note",
+)
+
+
+@dataclass(frozen=True)
+class ExportFilter:
+    plan_id: Optional[int] = None
+    exercise_id: Optional[int] = None
+    date_from: Optional[str] = None   # YYYY-MM-DD, inklusive
+    date_to: Optional[str] = None     # YYYY-MM-DD, inklusive
+
+
+def _export_query(f: ExportFilter) -> Tuple[str, dict]:
+    where = []
+    if f.plan_id is not None:
+        where.append("s.plan_id = :plan_id")
+    if f.exercise_id is not None:
+        where.append("se.exercise_id = :exercise_id")
+    if f.date_from:
+        where.append("s.started_at >= :date_from")
+    if f.date_to:
+        # inklusive: alles vor dem Folgetag
+        where.append("s.started_at < DATE(:date_to, '+1 day')")
+    sql = f"""
+        SELECT COALESCE(s.import_key, s.id), s.started_at, s.ended_at, tp.name, e.name,
+               se.weight_kg, se.reps, se.sets, se.note
+          FROM sessions s
+          JOIN training_plans tp  ON tp.id = s.plan_id
+          JOIN session_entries se ON se.session_id = s.id
+          JOIN exercises e        ON e.id = se.exercise_id
+         {"WHERE " + " AND ".join(where) if where else ""}
+         ORDER BY s.id, se.id
+    """
+    params = {
+        "plan_id": f.plan_id,
+        "exercise_id": f.exercise_id,
+        "date_from": f.date_from,
+        "date_to": f.date_to,
+    }
+    return sql, params
+
+
+def iter_export_rows(conn: sqlite3.Connection, f: ExportFilter) -> Iterator[tuple]:
+    """Ergebniszeilen als einfache Tupel, blockweise vom Cursor gelesen."""
+    sql, params = _export_query(f)
+    cur = conn.execute(sql, params)
+    cur.row_factory = None
+    try:
+        while True:
+            batch = cur.fetchmany(FETCH_SIZE)
+            if not batch:
+                break
+            yield from batch
+    finally:
+        cur.close()
+
+
+def iter_csv(rows: Iterator[tuple], batch_rows: int = FETCH_SIZE) -> Iterator[str]:
+    """CSV mit Kopfzeile, in Blöcken von `batch_rows` Zeilen."""
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(EXPORT_COLUMNS)
+    n = 0
+    for row in rows:
+        writer.writerow(row)
+        n += 1
+        if n >= batch_rows:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+            n = 0
+    yield buf.getvalue()
+
+
+def iter_ndjson(rows: Iterator[tuple], batch_rows: int = FETCH_SIZE) -> Iterator[str]:
+    """Ein JSON-Objekt pro Zeile, in Blöcken von `batch_rows` Zeilen."""
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False))
+        if len(lines) >= batch_rows:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def iter_export(conn: sqlite3.Connection, f: ExportFilter, fmt: str) -> Iterator[str]:
+    """Export im Format 'csv' oder 'ndjson' als Folge von Text-Blöcken."""
+    if fmt == "csv":
+        return iter_csv(iter_export_rows(conn, f))
+    if fmt == "ndjson":
+        return iter_ndjson(iter_export_rows(conn, f))
+    raise ValueError(f"Unbekanntes Exportformat: {fmt!r} (erwartet: csv, ndjson)")
@@ -0,0 +1,354 @@
+# fitlog/services/importer.py
+"""
+Streaming-Import historischer Trainingsdaten (CSV oder NDJSON).
+
+Eine Zeile = ein Eintrag (Übung in einer Session). Spalten/Felder:
+
+  date         Pflicht, YYYY-MM-DD oder ISO-Zeitstempel (Start der Session)
+  plan         Pflicht, Name des Trainingsplans
+  exercise     Pflicht, Name der Übung
+  weight_kg    optional (Alias: weight), Komma oder Punkt als Dezimaltrenner
+  reps, sets   optional, ganze Zahlen
+  note         optional
+  session      optional, externer Session-Schlüssel; Standard: plan + date
+               (wird gespeichert: ein erneuter Import überschreibt die
+               Einträge dieser Session, statt sie doppelt anzulegen)
+  ended_at     optional, Ende der Session (Standard: = date)
+
+Zeilen werden gestreamt gelesen und in Blöcken (`chunk_size`) mit
+`executemany` je Transaktion geschrieben – der Speicherbedarf hängt von der
+Blockgröße und der Zahl der Sessions ab, nicht von der Zahl der Zeilen.
+Übungen und Pläne werden über In-Memory-Maps aufgelöst und bei Bedarf
+angelegt.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional, Set, Tuple
+
+from fitlog.services.rollup import RollupKey, refresh_rollup, session_rollup_keys
+
+DEFAULT_CHUNK_SIZE = 5000
+MAX_REPORTED_ERRORS = 50
+
+_UPSERT_ENTRY = """
+    INSERT INTO session_entries (session_id, exercise_id, weight_kg, reps, sets, note, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(session_id, exercise_id) DO UPDATE SET
+      weight_kg = excluded.weight_kg,
+      reps      = excluded.reps,
+      sets      = excluded.sets,
+      note      = excluded.note,
+      created_at= excluded.created_at
+"""
+
+
+class ImportRowError(ValueError):
+    """Ungültige Importzeile (wird übersprungen und im Report vermerkt)."""
+
+
+class ImportAborted(Exception):
+    """
+    Import mittendrin abgebrochen (z. B. ungültiges UTF-8 im Stream).
+
+    Bereits geschriebene Blöcke bleiben bestehen, ihre Tages-Rollups sind
+    aktualisiert; `report` beschreibt diesen Teilimport, `__cause__` den
+    eigentlichen Fehler.
+    """
+
+    def __init__(self, message: str, report: "ImportReport") -> None:
+        super().__init__(message)
+        self.report = report
+
+
+@dataclass
+class ImportReport:
+    rows_read: int = 0
+    entries_written: int = 0
+    sessions_created: int = 0
+    sessions_matched: int = 0
+    exercises_created: int = 0
+    plans_created: int = 0
+    chunks: int = 0
+    seconds: float = 0.0
+    errors: List[str] = field(default_factory=list)
+    error_count: int = 0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_read / self.seconds if self.seconds > 0 else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "rows_read": self.rows_read,
+            "entries_written": self.entries_written,
+            "sessions_created": self.sessions_created,
+            "sessions_matched": self.sessions_matched,
+            "exercises_created": self.exercises_created,
+            "plans_created": self.plans_created,
+            "chunks": self.chunks,
+            "seconds": round(self.seconds, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+            "error_count": self.error_count,
+            "errors": self.errors,
+        }
+
+
+# ---------------------------
+# Leser
+# ---------------------------
+
+def iter_csv(stream: IO[str]) -> Iterator[Dict[str, Any]]:
+    """CSV mit Kopfzeile zeilenweise lesen."""
+    yield from csv.DictReader(stream)
+
+
+def iter_ndjson(stream: IO[str]) -> Iterator[Dict[str, Any]]:
+    """NDJSON (ein JSON-Objekt pro Zeile) lesen; Leerzeilen werden ignoriert."""
+    for line_no, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            obj = json.loads(line)
+        except json.JSONDecodeError as exc:
+            obj = {"__error__": f"Zeile {line_no}: kein gültiges JSON ({exc.msg})"}
+        yield obj if isinstance(obj, dict) else {"__error__": f"Zeile {line_no}: kein JSON-Objekt"}
+
+
+def iter_rows(stream: IO[bytes] | IO[str], fmt: str) -> Iterator[Dict[str, Any]]:
+    """Rohstream (Bytes oder Text) im Format 'csv' oder 'ndjson' lesen."""
+    if isinstance(stream, io.TextIOBase):
+        text = stream
+    else:
+        text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        return iter_csv(text)
+    if fmt == "ndjson":
+        return iter_ndjson(text)
+    raise ValueError(f"Unbekanntes Importformat: {fmt!r} (erwartet: csv, ndjson)")
+
+
+# ---------------------------
+# Import
+# ---------------------------
+
+def _opt_int(raw: Any, name: str) -> Optional[int]:
+    if raw is None or raw == "":
+        return None
+    try:
+        return int(str(raw).strip())
+    except ValueError:
+        raise ImportRowError(f"{name}: keine ganze Zahl ({raw!r})") from None
+
+
+def _opt_float(raw: Any, name: str) -> Optional[float]:
+    if raw is None or raw == "":
+        return None
+    try:
+        return float(str(raw).replace(",", ".").strip())
+    except ValueError:
+        raise ImportRowError(f"{name}: keine Zahl ({raw!r})") from None
+
+
+def _timestamp(raw: Any) -> str:
+    """Datum/Zeit normalisieren: 'YYYY-MM-DD' -> 'YYYY-MM-DDT00:00:00'."""
+    value = str(raw or "").strip().replace(" ", "T", 1)
+    if len(value) == 10:
+        value += "T00:00:00"
+    if len(value) < 19 or value[4] != "-" or value[7] != "-":
+        raise ImportRowError(f"date: ungültiges Datum ({raw!r})")
+    value = value[:19]
+    try:
+        # unmögliche Daten (2024-13-45) hätten kein performed_at und fehlten
+        # still in Diagrammen und Statistiken
+        datetime.fromisoformat(value)
+    except ValueError:
+        raise ImportRowError(f"date: ungültiges Datum ({raw!r})") from None
+    return value
+
+
+class _Importer:
+    def __init__(self, db: sqlite3.Connection, report: ImportReport) -> None:
+        self.db = db
+        self.report = report
+        self.exercises: Dict[str, int] = {
+            name: ex_id for ex_id, name in db.execute("SELECT id, name FROM exercises")
+        }
+        self.exercises_folded = {name.casefold(): ex_id for name, ex_id in self.exercises.items()}
+        self.plans: Dict[str, int] = {
+            name: plan_id for plan_id, name in db.execute(
+                "SELECT id, name FROM training_plans WHERE deleted_at IS NULL"
+            )
+        }
+        # bekannte Sessions: (plan_id, import_key) -> id; ältere Sessions ohne
+        # Schlüssel (manuell erfasst oder vor 0009 importiert) über ihren Start
+        self.sessions: Dict[Tuple[int, str], int] = {}
+        self.unkeyed_sessions: Dict[Tuple[int, str], int] = {}
+        for session_id, plan_id, import_key, started_at in db.execute(
+            "SELECT id, plan_id, import_key, started_at FROM sessions"
+        ):
+            if import_key is not None:
+                self.sessions[(plan_id, import_key)] = session_id
+            else:
+                self.unkeyed_sessions.setdefault((plan_id, started_at), session_id)
+        self.touched_sessions: set = set()
+        self.plan_links: set = set()
+        self.rollup_keys: Set[RollupKey] = set()
+
+    def exercise_id(self, name: str) -> int:
+        ex_id = self.exercises.get(name) or self.exercises_folded.get(name.casefold())
+        if ex_id is None:
+            ex_id = self.db.execute("INSERT INTO exercises (name) VALUES (?)", (name,)).lastrowid
+            self.exercises[name] = ex_id
+            self.exercises_folded[name.casefold()] = ex_id
+            self.report.exercises_created += 1
+        return ex_id
+
+    def plan_id(self, name: str) -> int:
+        plan_id = self.plans.get(name)
+        if plan_id is None:
+            plan_id = self.db.execute(
+                "INSERT INTO training_plans (name) VALUES (?)", (name,)
+            ).lastrowid
+            self.plans[name] = plan_id
+            self.report.plans_created += 1
+        return plan_id
+
+    def session_id(self, plan_id: int, key: str, started_at: str, ended_at: str) -> int:
+        session_id = self.sessions.get((plan_id, key))
+        if session_id is None:
+            session_id = self.unkeyed_sessions.pop((plan_id, started_at), None)
+            if session_id is not None:
+                # gleiche Session ohne Schlüssel (z. B. aus einem Export): übernehmen
+                self.db.execute(
+                    "UPDATE sessions SET import_key = ? WHERE id = ?", (key, session_id)
+                )
+            else:
+                session_id = self.db.execute(
+                    "INSERT INTO sessions (plan_id, started_at, ended_at, import_key) "
+                    "VALUES (?, ?, ?, ?)",
+                    (plan_id, started_at, ended_at, key),
+                ).lastrowid
+                self.report.sessions_created += 1
+                self.touched_sessions.add(session_id)
+            self.sessions[(plan_id, key)] = session_id
+
+        if session_id not in self.touched_sessions:
+            # vorhandene Session: Einträge werden überschrieben und können den
+            # Tag wechseln -> auch die bisherigen Rollup-Schlüssel neu berechnen
+            self.touched_sessions.add(session_id)
+            self.rollup_keys |= session_rollup_keys(self.db, session_id)
+            self.report.sessions_matched += 1
+        return session_id
+
+    def convert(self, row: Dict[str, Any]) -> Tuple[tuple, Tuple[int, int]]:
+        if "__error__" in row:
+            raise ImportRowError(row["__error__"])
+
+        plan_name = str(row.get("plan") or "").strip()
+        exercise_name = str(row.get("exercise") or "").strip()
+        if not plan_name or not exercise_name:
+            raise ImportRowError("plan und exercise sind Pflichtfelder")
+
+        started_at = _timestamp(row.get("date"))
+        ended_at = _timestamp(row["ended_at"]) if row.get("ended_at") else started_at
+        weight = _opt_float(row.get("weight_kg", row.get("weight")), "weight_kg")
+        reps = _opt_int(row.get("reps"), "reps")
+        sets = _opt_int(row.get("sets"), "sets")
+        note = str(row.get("note") or "").strip()
+        key = str(row.get("session") or started_at)
+
+        plan_id = self.plan_id(plan_name)
+        ex_id = self.exercise_id(exercise_name)
+        session_id = self.session_id(plan_id, key, started_at, ended_at)
+        entry = (session_id, ex_id, weight, reps, sets, note, started_at)
+        return entry, (plan_id, ex_id)
+
+    def flush(self, entries: List[tuple], links: List[Tuple[int, int]]) -> None:
+        if entries:
+            self.db.executemany(_UPSERT_ENTRY, entries)
+            # Rollup-Schlüssel (Übung, Plan, Tag) merken; `links` ist parallel
+            # zu `entries`. Ein späterer Block kann einen Eintrag derselben
+            # Session auf einen anderen Tag verschieben – daher alle sammeln.
+            self.rollup_keys.update(
+                (ex_id, plan_id, entry[6][:10])
+                for entry, (plan_id, ex_id) in zip(entries, links)
+            )
+        new_links = [link for link in links if link not in self.plan_links]
+        if new_links:
+            # importierte Übungen dem Plan zuordnen (Plan-Diagramm, Erfassung)
+            self.db.executemany(
+                "INSERT OR IGNORE INTO plan_exercises (plan_id, exercise_id) VALUES (?, ?)",
+                new_links,
+            )
+            self.plan_links.update(new_links)
+        self.db.commit()
+        self.report.entries_written += len(entries)
+        self.report.chunks += 1
+
+
+def import_rows(
+    db: sqlite3.Connection,
+    rows: Iterable[Dict[str, Any]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress=None,
+) -> ImportReport:
+    """
+    Zeilen importieren; je `chunk_size` Zeilen eine Transaktion.
+
+    `progress(report)` wird (falls gesetzt) nach jedem Block aufgerufen.
+    Ungültige Zeilen werden übersprungen und im Report gezählt. Zum Schluss
+    werden die Tages-Rollups der importierten (Übung, Plan, Tag) neu
+    berechnet – nicht die ganze Tabelle. Bricht der Import ab (Lese- oder
+    Datenbankfehler), gilt das für die bereits geschriebenen Blöcke; dann
+    wird `ImportAborted` mit dem Teil-Report geworfen.
+    """
+    report = ImportReport()
+    importer = _Importer(db, report)
+    t0 = time.perf_counter()
+
+    entries: List[tuple] = []
+    links: List[Tuple[int, int]] = []
+    try:
+        for line_no, row in enumerate(rows, start=1):
+            report.rows_read += 1
+            try:
+                entry, link = importer.convert(row)
+            except ImportRowError as exc:
+                report.error_count += 1
+                if len(report.errors) < MAX_REPORTED_ERRORS:
+                    report.errors.append(f"Datensatz {line_no}: {exc}")
+                continue
+            entries.append(entry)
+            links.append(link)
+
+            if len(entries) >= chunk_size:
+                importer.flush(entries, links)
+                entries, links = [], []
+                report.seconds = time.perf_counter() - t0
+                if progress:
+                    progress(report)
+
+        importer.flush(entries, links)
+        refresh_rollup(db, importer.rollup_keys)
+        db.commit()
+    except Exception as exc:
+        # nur der laufende Block geht verloren; die schon committeten Blöcke
+        # bleiben und brauchen ihre Rollups trotzdem
+        db.rollback()
+        refresh_rollup(db, importer.rollup_keys)
+        db.commit()
+        report.seconds = time.perf_counter() - t0
+        raise ImportAborted(
+            f"Import nach {report.rows_read} Zeilen abgebrochen: {exc}", report
+        ) from exc
+    report.seconds = time.perf_counter() - t0
+    return report
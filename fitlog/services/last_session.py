@@ -1,30 +1,38 @@
 # fitlog/services/last_session.py
 from __future__ import annotations
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 
-def _parse_dt(val: Optional[str]) -> Optional[datetime]:
-    if not val:
+# Kanonischer Zeitpunkt (Unix-Epoch, UTC) der TEXT-Zeitstempel; der Ausdruck
+# für ended_at muss wörtlich dem von idx_sessions_ended_epoch entsprechen
+_ENDED_EPOCH = "CAST(strftime('%s', s.ended_at) AS INTEGER)"
+_STARTED_EPOCH = "CAST(strftime('%s', s.started_at) AS INTEGER)"
+
+
+def _utc_date(epoch: Optional[int]) -> Optional[str]:
+    if epoch is None:
         return None
-    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d"):
-        try:
-            return datetime.strptime(val, fmt)
-        except ValueError:
-            continue
-    return None
+    return datetime.fromtimestamp(epoch, timezone.utc).date().isoformat()
+
 
 def get_last_session(db) -> Dict[str, Any]:
     """
     Letzte *abgeschlossene* Session aus Tabelle 'sessions' + Planname.
     Gibt Platzhalter '—', wenn nichts vorhanden.
+
+    SQLite normalisiert die Zeitstempel (beliebiges ISO-Format, ggf. mit
+    Zeitzone) zu Epoch-Sekunden; die neueste Session liefert ein Rückwärts-
+    Scan über idx_sessions_ended_epoch (0007_performed_at), ohne Sortierung.
     """
     row = db.execute(
-        """
-        SELECT s.started_at, s.ended_at, tp.name AS plan_name
+        f"""
+        SELECT {_STARTED_EPOCH} AS started_epoch,
+               {_ENDED_EPOCH} AS ended_epoch,
+               tp.name AS plan_name
         FROM sessions s
         JOIN training_plans tp ON tp.id = s.plan_id
         WHERE s.ended_at IS NOT NULL
-        ORDER BY s.ended_at DESC, s.id DESC
+        ORDER BY {_ENDED_EPOCH} DESC, s.id DESC
         LIMIT 1
         """
     ).fetchone()
@@ -32,15 +40,14 @@ def get_last_session(db) -> Dict[str, Any]:
     if not row:
         return {"date": "—", "plan_name": "—", "duration_min": "—"}
 
-    start_dt = _parse_dt(row["started_at"])
-    end_dt   = _parse_dt(row["ended_at"])
+    start, end = row["started_epoch"], row["ended_epoch"]
 
     duration_min = "—"
-    if start_dt and end_dt:
-        duration_min = max(0, int((end_dt - start_dt).total_seconds() // 60))
+    if start is not None and end is not None:
+        duration_min = max(0, (end - start) // 60)
 
     return {
-        "date": (end_dt or start_dt).date().isoformat() if (end_dt or start_dt) else "—",
+        "date": _utc_date(end if end is not None else start) or "—",
         "plan_name": row["plan_name"] or "—",
         "duration_min": duration_min,
     }
@@ -0,0 +1,237 @@
+# fitlog/services/prerender.py
+"""
+Vorab-Rendern der Fortschritts-Diagramme nach „Training beenden“.
+
+Eine beendete Session ändert genau die Diagramme, die als Nächstes geöffnet
+werden: das Plan-Diagramm und die Verläufe der erfassten Übungen.
+`schedule_session_charts` merkt die Session im Request nur vor; erst nach
+dem Ausliefern der Antwort werden Cache-Schlüssel und Daten ermittelt
+(fitlog/services/chart_specs.py) und das Rendern an einen
+`ProcessPoolExecutor` übergeben – außerhalb des GIL. Die fertigen PNGs
+landen im ChartCache.
+
+- `CHART_PRERENDER_WORKERS` Prozesse, höchstens `CHART_PRERENDER_QUEUE`
+  offene Jobs; darüber hinaus wird nichts mehr eingeplant
+- Jobs werden per Cache-Schlüssel dedupliziert; ein Request, der ein gerade
+  laufendes Diagramm braucht, wartet auf diesen Job statt selbst zu rendern
+"""
+
+from __future__ import annotations
+
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Tuple
+
+from flask import Flask, after_this_request, current_app, has_request_context
+
+from .chart_cache import ChartCache
+
+
+def _render_job(kind: str, args: Tuple[Any, ...]) -> bytes:
+    """Läuft im Worker-Prozess; Matplotlib wird dort beim ersten Job geladen."""
+    from fitlog.services import charts
+
+    if kind == "plan":
+        return charts.render_plan_png(*args)
+    if kind == "exercise":
+        return charts.render_exercise_png(*args)
+    raise ValueError(f"Unbekannter Diagrammtyp: {kind!r}")
+
+
+class ChartPrerenderer:
+    """Begrenzte, deduplizierende Render-Warteschlange vor einem Prozess-Pool."""
+
+    def __init__(
+        self,
+        cache: ChartCache,
+        max_workers: int = 1,
+        max_queue: int = 32,
+        start_method: str = "spawn",
+    ) -> None:
+        self.cache = cache
+        self.max_workers = max(1, int(max_workers))
+        self.max_queue = max(1, int(max_queue))
+        self.start_method = start_method
+        self.submitted = 0
+        self.deduplicated = 0
+        self.dropped = 0
+        self.failed = 0
+        self._reset()
+        atexit.register(self.shutdown)
+
+    def _reset(self) -> None:
+        self._pid = os.getpid()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Lock muss gehalten werden
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context(self.start_method),
+            )
+        return self._executor
+
+    def _discard_executor(self) -> None:
+        # Lock muss gehalten werden; laufende Futures scheitern mit BrokenProcessPool
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, key: str, kind: str, args: Tuple[Any, ...]) -> bool:
+        """Render-Job einplanen; False bei Duplikat, vollem Puffer oder Cache-Treffer."""
+        if self._pid != os.getpid():
+            # geforkter Worker: Pool des Elternprozesses nicht anfassen
+            self._reset()
+        if key in self.cache:
+            return False
+
+        with self._lock:
+            if key in self._pending:
+                self.deduplicated += 1
+                return False
+            if len(self._pending) >= self.max_queue:
+                self.dropped += 1
+                return False
+            try:
+                future = self._get_executor().submit(_render_job, kind, args)
+            except (BrokenProcessPool, RuntimeError):
+                # Pool kaputt (Worker abgestürzt, OOM) oder heruntergefahren:
+                # verwerfen und einmal mit einem frischen Pool versuchen
+                self._discard_executor()
+                try:
+                    future = self._get_executor().submit(_render_job, kind, args)
+                except (BrokenProcessPool, RuntimeError):
+                    self._discard_executor()
+                    self.failed += 1
+                    return False
+            self._pending[key] = future
+            self.submitted += 1
+
+        future.add_done_callback(lambda f, key=key: self._done(key, f))
+        return True
+
+    def submit_many(self, jobs: List[Tuple[str, str, Tuple[Any, ...]]]) -> int:
+        return sum(self.submit(key, kind, args) for key, kind, args in jobs)
+
+    def _done(self, key: str, future: Future) -> None:
+        try:
+            if not future.cancelled() and future.exception() is None:
+                self.cache.put(key, future.result())
+            elif not future.cancelled():
+                self.failed += 1
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def wait_for(self, key: str, timeout: float) -> Optional[bytes]:
+        """PNG eines laufenden Jobs abwarten (None, falls keiner läuft/Fehler)."""
+        with self._lock:
+            future = self._pending.get(key)
+        if future is None:
+            return None
+        try:
+            return future.result(timeout=timeout)
+        except (FutureTimeout, Exception):
+            return None
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def init_prerender(app: Flask) -> Optional[ChartPrerenderer]:
+    """Prerenderer gemäß Config anlegen (Prozesse starten erst beim ersten Job)."""
+    if not app.config.get("CHART_PRERENDER"):
+        return None
+    prerenderer = ChartPrerenderer(
+        app.extensions["chart_cache"],
+        max_workers=app.config.get("CHART_PRERENDER_WORKERS", 1),
+        max_queue=app.config.get("CHART_PRERENDER_QUEUE", 32),
+        start_method=app.config.get("CHART_PRERENDER_START_METHOD", "spawn"),
+    )
+    app.extensions["chart_prerender"] = prerenderer
+    return prerenderer
+
+
+def get_prerenderer() -> Optional[ChartPrerenderer]:
+    return current_app.extensions.get("chart_prerender")
+
+
+def _session_chart_jobs(
+    db, prerenderer: ChartPrerenderer, session_id: int, plan_id: int
+) -> List[Tuple[str, str, Tuple[Any, ...]]]:
+    """Render-Jobs für Plan-Diagramm und Übungsverläufe einer Session (ohne Cache-Treffer)."""
+    from .chart_specs import exercise_chart_spec, plan_chart_spec
+
+    jobs: List[Tuple[str, str, Tuple[Any, ...]]] = []
+    plan_spec = plan_chart_spec(db, plan_id)
+    if plan_spec is not None and plan_spec[0] not in prerenderer.cache:
+        etag, plan_name, data = plan_spec
+        jobs.append((etag, "plan", (plan_name, data)))
+
+    exercise_ids = [
+        r[0] for r in db.execute(
+            "SELECT exercise_id FROM session_entries WHERE session_id = ?", (session_id,)
+        )
+    ]
+    for exercise_id in exercise_ids:
+        spec = exercise_chart_spec(db, exercise_id)
+        if spec is not None and spec[0] not in prerenderer.cache:
+            etag, title, history = spec
+            jobs.append((etag, "exercise", (title, history)))
+    return jobs
+
+
+def _prerender_session(
+    app: Flask, prerenderer: ChartPrerenderer, session_id: int, plan_id: int
+) -> int:
+    """Specs mit einer eigenen Pool-Connection ermitteln und Jobs einplanen."""
+    pool = app.extensions["db_pool"]
+    db = pool.acquire()
+    try:
+        jobs = _session_chart_jobs(db, prerenderer, session_id, plan_id)
+    except Exception:
+        # Vorab-Rendern ist Kür: Fehler nur loggen, der PNG-Request rendert selbst
+        app.logger.exception("Vorab-Rendern für Session %s fehlgeschlagen", session_id)
+        return 0
+    finally:
+        pool.release(db)
+    return prerenderer.submit_many(jobs)
+
+
+def schedule_session_charts(session_id: int, plan_id: int) -> bool:
+    """
+    Plan-Diagramm und Übungsverläufe einer beendeten Session einplanen.
+
+    Muss nach dem Commit aufgerufen werden. Im Request passiert nichts außer
+    dem Vormerken: Specs (etwa 2N+2 Abfragen bei N Übungen) und Übergabe an
+    den Pool laufen erst nach dem Ausliefern der Antwort (`call_on_close`),
+    mit einer eigenen Connection aus dem Pool – die des Requests ist dann
+    schon zurückgegeben. Ohne Request-Kontext (CLI) wird sofort eingeplant.
+    Liefert False, wenn Vorab-Rendern abgeschaltet ist.
+    """
+    prerenderer = get_prerenderer()
+    if prerenderer is None:
+        return False
+
+    app = current_app._get_current_object()
+    if not has_request_context():
+        _prerender_session(app, prerenderer, session_id, plan_id)
+        return True
+
+    @after_this_request
+    def _schedule_after_response(response):
+        response.call_on_close(lambda: _prerender_session(app, prerenderer, session_id, plan_id))
+        return response
+
+    return True
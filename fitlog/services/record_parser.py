@@ -1,55 +1,241 @@
 """
-Utilities for parsing the record form and handling duration logic.
+Decoding of the record form (record.html) and of the autosave/sync payloads.
+
+All session write paths share one set of converters and one typed row
+(`EntryRow`): the HTML form via `decode_record_form`, the JSON autosave and
+offline sync via `decode_entry_changes`.
 """
 
 from __future__ import annotations
-from typing import Dict, Any
+
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from werkzeug.datastructures import MultiDict
+
+# Fields per exercise -> session_entries column
+PATCH_FIELDS = {"sets": "sets", "reps": "reps", "weight": "weight_kg", "note": "note"}
+
+# Allowed ranges (inclusive) of the numeric fields
+LIMITS = {"sets": (0, 99), "reps": (0, 999), "weight": (0.0, 2000.0)}
+
+_FIELDS = frozenset(("sets", "reps", "weight", "note"))
 
 
-def parse_exercises_form(form: Dict[str, Any]) -> Dict[int, Dict[str, Any]]:
+@dataclass(slots=True)
+class EntryRow:
     """
-    Extracts the dict under "ex[<id>]" created by the record.html form.
+    Typed values for exactly one exercise.
+
+    None means "not sent" (JSON) or "empty" (flat form fields). `errors`
+    collects validation messages; the affected value then holds the form's
+    fallback (0/None) or the clamped value.
+    """
+
+    exercise_id: int
+    sets: Optional[int] = None
+    reps: Optional[int] = None
+    weight: Optional[float] = None
+    note: Optional[str] = None
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def skipped(self) -> bool:
+        """sets explicitly 0 -> exercise was skipped."""
+        return self.sets == 0
+
+    def present(self) -> Dict[str, Any]:
+        """Fields that carry a value (field name -> value)."""
+        return {
+            name: value
+            for name, value in (("sets", self.sets), ("reps", self.reps),
+                                ("weight", self.weight), ("note", self.note))
+            if value is not None
+        }
 
-    Expected per exercise_id:
-      { "sets": int, "reps": int, "weight": float, "note": str }
 
-    Returns: exercise_id -> payload
+# ---------------------------
+# Converters
+# ---------------------------
+
+def convert_value(name: str, raw: Any) -> Tuple[Any, Optional[str]]:
     """
-    result: Dict[int, Dict[str, Any]] = {}
-    for full_key, raw_value in form.items():
-        if not full_key.startswith("ex["):
-            continue
-        try:
-            left = full_key.index("[") + 1
-            right = full_key.index("]", left)
-            ex_id = int(full_key[left:right])
-        except Exception:
-            continue
+    Convert one raw field value; returns (value, error).
 
-        try:
-            sub_left = full_key.index("[", right) + 1
-            sub_right = full_key.index("]", sub_left)
-            subkey = full_key[sub_left:sub_right]
-        except Exception:
-            continue
+    Empty input gives (None, None), unparseable input (None, error). Values
+    outside `LIMITS` are clamped and reported. Weights accept a decimal
+    comma, counts accept integral floats (8.0) but no fractions.
+    """
+    if name == "note":
+        return str(raw or "").strip(), None
+    if type(raw) is str and raw.isdecimal():
+        # common case (form input "3", "10"): no strip/float/exception path
+        value = int(raw)
+        lo, hi = LIMITS[name]
+        if value > hi:
+            return hi, f"{name}: expected {lo:g}..{hi:g}"
+        return (float(value) if name == "weight" else value), None
+    if raw is None or isinstance(raw, bool):
+        return None, (f"{name}: expected a number" if raw is not None else None)
 
-        payload = result.setdefault(ex_id, {"sets": 0, "reps": 0, "weight": 0.0, "note": ""})
-        if subkey == "sets":
+    if isinstance(raw, (int, float)):
+        number = raw
+    else:
+        text = str(raw).strip()
+        if not text:
+            return None, None
+        if text.isdecimal():
+            number = int(text)  # common case, no exception path
+        else:
             try:
-                payload["sets"] = max(0, int(str(raw_value).strip()))
+                number = float(text.replace(",", ".") if name == "weight" else text)
             except ValueError:
-                payload["sets"] = 0
-        elif subkey == "reps":
-            try:
-                payload["reps"] = max(0, int(str(raw_value).strip()))
-            except ValueError:
-                payload["reps"] = 0
-        elif subkey == "weight":
+                return None, f"{name}: expected a number"
+
+    if name == "weight":
+        value = float(number)
+        if not math.isfinite(value):
+            return None, f"{name}: expected a number"
+    elif isinstance(number, float):
+        if not number.is_integer():
+            return None, f"{name}: expected an integer"
+        value = int(number)
+    else:
+        value = number
+
+    lo, hi = LIMITS[name]
+    if value < lo or value > hi:
+        return min(max(value, lo), hi), f"{name}: expected {lo:g}..{hi:g}"
+    return value, None
+
+
+# ---------------------------
+# HTML form
+# ---------------------------
+
+def _lists(form: Any) -> Iterator[Tuple[str, List[Any]]]:
+    """(key, values) pairs; for a MultiDict one pair per key with all its values."""
+    if isinstance(form, MultiDict):
+        # lists() yields each key once with its value list – cheaper than
+        # items(multi=True), which yields one pair per value
+        return form.lists()
+    return ((key, [value]) for key, value in form.items())
+
+
+def decode_record_form(form: Any) -> List[EntryRow]:
+    """
+    Decode the record form in a single pass into one EntryRow per exercise.
+
+    Supported field names:
+      A) ex[<id>][sets|reps|weight|note]
+      B) flat: sets_<id>, reps_<id>, weight_<id>, note_<id>
+
+    Exercise ids and their order come from the hidden `exercise_id` fields;
+    without them every id seen in A/B is used (ascending). Bracket values win
+    over flat ones. Missing or invalid bracket values count as 0 (sets 0 =
+    skipped), missing or invalid flat values stay None. Invalid values are
+    reported in `EntryRow.errors`.
+    """
+    hidden: List[str] = []
+    bracket: Dict[int, Dict[str, Any]] = {}
+    flat: Dict[int, Dict[str, Any]] = {}
+
+    for key, values in _lists(form):
+        if key.startswith("ex[") and key.endswith("]"):
+            # "ex[12][sets]" -> "12", "sets" (partition is cheaper than a regex)
+            ex_id, sep, name = key[3:-1].partition("][")
+            if sep and name in _FIELDS and ex_id.isdecimal():
+                bracket.setdefault(int(ex_id), {})[name] = values[0]
+        elif key == "exercise_id":
+            hidden.extend(values)
+        else:
+            name, sep, suffix = key.rpartition("_")
+            if sep and name in _FIELDS and suffix.isdecimal():
+                flat.setdefault(int(suffix), {})[name] = values[0]
+
+    if hidden:
+        ids: List[int] = []
+        seen = set()
+        for raw_id in hidden:
             try:
-                payload["weight"] = max(0.0, float(str(raw_value).replace(",", ".").strip()))
-            except ValueError:
-                payload["weight"] = 0.0
-        elif subkey == "note":
-            payload["note"] = (raw_value or "").strip()
+                ex_id = int(raw_id)
+            except (TypeError, ValueError):
+                continue
+            if ex_id not in seen:
+                seen.add(ex_id)
+                ids.append(ex_id)
+    else:
+        ids = sorted(bracket.keys() | flat.keys())
+
+    rows: List[EntryRow] = []
+    empty: Dict[str, Any] = {}
+    for ex_id in ids:
+        values = bracket.get(ex_id)
+        is_bracket = values is not None
+        if not is_bracket:
+            values = flat.get(ex_id, empty)
+
+        get = values.get
+        sets, e_sets = convert_value("sets", get("sets"))
+        reps, e_reps = convert_value("reps", get("reps"))
+        weight, e_weight = convert_value("weight", get("weight"))
+        if is_bracket:
+            sets = 0 if sets is None else sets
+            reps = 0 if reps is None else reps
+            weight = 0.0 if weight is None else weight
+        rows.append(EntryRow(
+            ex_id, sets, reps, weight,
+            str(get("note") or "").strip(),
+            [e for e in (e_sets, e_reps, e_weight) if e],
+        ))
+    return rows
+
+
+# ---------------------------
+# JSON (autosave, offline sync)
+# ---------------------------
+
+def decode_entry_changes(payload: Any) -> Tuple[Dict[int, EntryRow], List[str]]:
+    """
+    Decode an autosave payload into exercise_id -> EntryRow (sent fields only).
+
+    Expected JSON:
+      {"entries": [{"exercise_id": 3, "weight": "42,5"}, {"exercise_id": 5, "sets": 0}]}
+
+    Later entries for the same exercise win per field; an empty value means 0.
+    Returns (rows ordered by id, errors); with errors nothing should be written.
+    """
+    errors: List[str] = []
+    rows: Dict[int, EntryRow] = {}
+    entries = payload.get("entries") if isinstance(payload, dict) else None
+    if not isinstance(entries, list):
+        return {}, ['expected {"entries": [...]}']
+
+    for pos, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            errors.append(f"entries[{pos}]: expected an object")
+            continue
+        raw_id = entry.get("exercise_id")
+        if isinstance(raw_id, bool) or not str(raw_id).strip().isdecimal():
+            errors.append(f"entries[{pos}].exercise_id: expected an integer")
+            continue
+        ex_id = int(raw_id)
 
-    return result
+        row = rows.get(ex_id) or EntryRow(exercise_id=ex_id)
+        for key, raw in entry.items():
+            if key == "exercise_id":
+                continue
+            if key not in PATCH_FIELDS:
+                errors.append(f"entries[{pos}].{key}: unknown field")
+                continue
+            value, error = convert_value(key, raw)
+            if error:
+                errors.append(f"entries[{pos}].{error}")
+                continue
+            if value is None:
+                value = 0.0 if key == "weight" else 0
+            setattr(row, key, value)
+        if row.present():
+            rows[ex_id] = row
+    return dict(sorted(rows.items())), errors
@@ -0,0 +1,109 @@
+# fitlog/services/rollup.py
+"""
+Pflege der Tages-Rollups `exercise_daily_stats`.
+
+Ein Rollup-Schlüssel ist (exercise_id, plan_id, day). Schreibende
+Session-Routen merken sich die Schlüssel ihrer Einträge *vor* dem Schreiben
+(`session_rollup_keys`) und berechnen danach genau diese plus die neuen
+Schlüssel neu (`refresh_rollup`). So bleiben auch Einträge korrekt, deren
+Tag sich durch ein Update von `created_at`/`ended_at` verschiebt.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from typing import Iterable, Optional, Set, Tuple
+
+RollupKey = Tuple[int, int, str]
+
+# Tag eines Eintrags (UTC) aus dem kanonischen Zeitpunkt, siehe 0007_performed_at
+DAY_EXPR = "DATE(se.performed_at, 'unixepoch')"
+
+_AGGREGATE_COLUMNS = f"""
+       se.exercise_id,
+       s.plan_id,
+       {DAY_EXPR} AS day,
+       MAX(se.weight_kg),
+       TOTAL(COALESCE(se.weight_kg, 0) * COALESCE(se.reps, 0) * COALESCE(se.sets, 1)),
+       TOTAL(COALESCE(se.sets, 1)),
+       COUNT(*)
+"""
+
+_INSERT = """
+    INSERT INTO exercise_daily_stats
+        (exercise_id, plan_id, day, max_weight_kg, total_volume_kg, set_count, entry_count)
+"""
+
+
+def session_rollup_keys(
+    db: sqlite3.Connection,
+    session_id: int,
+    exercise_ids: Optional[Iterable[int]] = None,
+) -> Set[RollupKey]:
+    """Rollup-Schlüssel aller Einträge einer Session (optional nur `exercise_ids`)."""
+    params: list = [session_id]
+    exercise_filter = ""
+    if exercise_ids is not None:
+        ids = sorted(set(exercise_ids))
+        if not ids:
+            return set()
+        exercise_filter = f"AND se.exercise_id IN ({','.join('?' * len(ids))})"
+        params.extend(ids)
+    rows = db.execute(
+        f"""
+        SELECT DISTINCT se.exercise_id, s.plan_id, {DAY_EXPR} AS day
+          FROM session_entries se
+          JOIN sessions s ON s.id = se.session_id
+         WHERE se.session_id = ?
+           {exercise_filter}
+        """,
+        params,
+    ).fetchall()
+    return {(r[0], r[1], r[2]) for r in rows if r[2] is not None}
+
+
+def refresh_rollup(db: sqlite3.Connection, keys: Iterable[RollupKey]) -> None:
+    """
+    Rollup-Zeilen für `keys` aus `session_entries` neu berechnen.
+
+    Läuft in der Transaktion des Aufrufers. Je Schlüssel werden nur die
+    Einträge der Übung an diesem Tag gelesen (Bereichsscan über
+    idx_session_entries_performed).
+    """
+    keys = sorted(set(keys))
+    if not keys:
+        return
+    db.executemany(
+        "DELETE FROM exercise_daily_stats WHERE exercise_id = ? AND plan_id = ? AND day = ?",
+        keys,
+    )
+    db.executemany(
+        f"""
+        {_INSERT}
+        SELECT {_AGGREGATE_COLUMNS}
+          FROM session_entries se
+          JOIN sessions s ON s.id = se.session_id
+         WHERE se.exercise_id = ?
+           AND s.plan_id = ?
+           AND se.performed_at >= CAST(strftime('%s', ?) AS INTEGER)
+           AND se.performed_at <  CAST(strftime('%s', ?, '+1 day') AS INTEGER)
+         GROUP BY se.exercise_id, s.plan_id, day
+        """,
+        [(exercise_id, plan_id, day, day) for exercise_id, plan_id, day in keys],
+    )
+
+
+def rebuild_rollup(db: sqlite3.Connection) -> int:
+    """Rollup komplett neu aufbauen; liefert die Anzahl der Zeilen."""
+    db.execute("DELETE FROM exercise_daily_stats")
+    db.execute(
+        f"""
+        {_INSERT}
+        SELECT {_AGGREGATE_COLUMNS}
+          FROM session_entries se
+          JOIN sessions s ON s.id = se.session_id
+         WHERE {DAY_EXPR} IS NOT NULL
+         GROUP BY se.exercise_id, s.plan_id, day
+        """
+    )
+    return db.execute("SELECT COUNT(*) FROM exercise_daily_stats").fetchone()[0]
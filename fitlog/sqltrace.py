@@ -0,0 +1,249 @@
+# fitlog/sqltrace.py
+"""
+Opt-in SQL-Trace mit Slow-Query-Log (Config `SQL_TRACE=True`).
+
+Jede Connection des Pools wird dann als `TracingConnection` geöffnet:
+
+  - jedes Statement wird gemessen – `execute` *und* das spätere Abholen der
+    Zeilen über den Cursor (`fetchone/fetchmany/fetchall`, Iteration)
+  - der Trace-Callback von sqlite3 liefert den SQL-Text mit eingesetzten
+    Parametern (für das Nachstellen langsamer Abfragen)
+  - der Progress-Handler zählt die ausgeführten VM-Schritte (in Blöcken von
+    `PROGRESS_STEPS`) als zeitunabhängiges Maß für die Arbeit eines Statements
+
+Am Ende jedes App-Kontexts werden die Statements als JSON-Zeilen in
+`SQL_TRACE_LOG` (Standard: instance/sql_trace.log) geschrieben. Statements
+ab `SQL_TRACE_THRESHOLD_MS` werden als `slow` markiert und bekommen ihr
+`EXPLAIN QUERY PLAN` sowie den Endpoint mit. Auswertung:
+
+    flask --app app sqltrace summary [--top 20]
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from flask import Flask, current_app, g, has_request_context, request
+
+from .db import TimedConnection
+
+PROGRESS_STEPS = 1000
+
+_write_lock = threading.Lock()
+_WS = re.compile(r"\s+")
+
+
+def normalize_sql(sql: str) -> str:
+    """Whitespace zusammenfassen – gleiche Statements landen in einer Gruppe."""
+    return _WS.sub(" ", sql).strip()
+
+
+@dataclass
+class StatementTrace:
+    sql: str
+    params: Any = None
+    expanded: Optional[str] = None
+    seconds: float = 0.0
+    vm_steps: int = 0
+    many: bool = False
+
+
+class TracingCursor(sqlite3.Cursor):
+    """Cursor, der die Zeit beim Abholen der Zeilen seinem Statement zuschlägt."""
+
+    trace: Optional[StatementTrace] = None
+
+    def _timed(self, fn, *args):
+        t0 = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            if self.trace is not None:
+                self.trace.seconds += time.perf_counter() - t0
+
+    def fetchone(self):
+        return self._timed(super().fetchone)
+
+    def fetchmany(self, *args):
+        return self._timed(super().fetchmany, *args)
+
+    def fetchall(self):
+        return self._timed(super().fetchall)
+
+    def __next__(self):
+        return self._timed(super().__next__)
+
+
+class TracingConnection(TimedConnection):
+    """TimedConnection, die zusätzlich jedes Statement einzeln protokolliert."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._current: Optional[StatementTrace] = None
+        self._paused = False
+        self.set_trace_callback(self._on_trace)
+        self.set_progress_handler(self._on_progress, PROGRESS_STEPS)
+
+    def reset_stats(self) -> None:
+        super().reset_stats()
+        self.traces: List[StatementTrace] = []
+
+    # -- sqlite3-Callbacks ------------------------------------------------
+
+    def _on_trace(self, expanded: str) -> None:
+        cur = self._current
+        if cur is None or self._paused or cur.expanded is not None:
+            return
+        # implizites BEGIN des sqlite3-Moduls und Trigger-Körper überspringen
+        if expanded.lstrip().startswith(("BEGIN", "--")) and not cur.sql.lstrip().upper().startswith("BEGIN"):
+            return
+        cur.expanded = expanded
+
+    def _on_progress(self) -> int:
+        if self._current is not None and not self._paused:
+            self._current.vm_steps += PROGRESS_STEPS
+        return 0  # 0 = weiterlaufen
+
+    # -- Ausführung -------------------------------------------------------
+
+    def _run(self, method: str, sql: str, params: Any, many: bool):
+        trace = StatementTrace(sql=sql, params=None if many else params, many=many)
+        self.traces.append(trace)
+        self._current = trace
+        cur = self.cursor(TracingCursor)
+        cur.trace = trace
+        t0 = time.perf_counter()
+        try:
+            return getattr(cur, method)(sql, params)
+        finally:
+            elapsed = time.perf_counter() - t0
+            trace.seconds += elapsed
+            self.statements += 1
+            self.statement_seconds += elapsed
+
+    def execute(self, sql, parameters=(), /):
+        return self._run("execute", sql, parameters, many=False)
+
+    def executemany(self, sql, seq_of_parameters, /):
+        return self._run("executemany", sql, seq_of_parameters, many=True)
+
+    def explain(self, trace: StatementTrace) -> List[str]:
+        """EXPLAIN QUERY PLAN eines protokollierten Statements (eingerückt)."""
+        if trace.many:
+            return []
+        self._paused = True
+        try:
+            rows = sqlite3.Connection.execute(
+                self, "EXPLAIN QUERY PLAN " + trace.sql, trace.params or ()
+            ).fetchall()
+        except sqlite3.Error as exc:
+            return [f"(EXPLAIN fehlgeschlagen: {exc})"]
+        finally:
+            self._paused = False
+
+        depth: Dict[int, int] = {0: -1}
+        lines = []
+        for node_id, parent, _, detail in rows:
+            depth[node_id] = depth.get(parent, -1) + 1
+            lines.append("  " * depth[node_id] + detail)
+        return lines
+
+
+# ---------------------------
+# Log schreiben / auswerten
+# ---------------------------
+
+def _is_full_scan(plan: Iterable[str]) -> bool:
+    """Tabellen-Scan ohne Index (Scans von Unterabfragen zählen nicht)."""
+    for line in plan:
+        detail = line.strip()
+        if not detail.startswith("SCAN") or " USING " in detail:
+            continue
+        if detail.startswith(("SCAN CONSTANT ROW", "SCAN (subquery")):
+            continue
+        return True
+    return False
+
+
+def _flush_traces(e: BaseException | None = None) -> None:
+    db = g.get("db")
+    if not isinstance(db, TracingConnection) or not db.traces:
+        return
+
+    threshold = current_app.config.get("SQL_TRACE_THRESHOLD_MS", 50) / 1000
+    endpoint = request.endpoint if has_request_context() else "cli"
+    ts = datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+
+    lines = []
+    for trace in db.traces:
+        record = {
+            "ts": ts,
+            "endpoint": endpoint,
+            "ms": round(trace.seconds * 1000, 3),
+            "vm_steps": trace.vm_steps,
+            "sql": normalize_sql(trace.sql),
+        }
+        if trace.many:
+            record["many"] = True
+        if trace.seconds >= threshold:
+            plan = db.explain(trace)
+            record.update(
+                slow=True,
+                expanded=trace.expanded,
+                plan=plan,
+                full_scan=_is_full_scan(plan),
+                temp_btree=any("TEMP B-TREE" in line for line in plan),
+            )
+        lines.append(json.dumps(record, ensure_ascii=False, default=str))
+    db.traces = []
+
+    path = Path(current_app.config["SQL_TRACE_LOG"])
+    with _write_lock, path.open("a", encoding="utf-8") as fh:
+        fh.write("\n".join(lines) + "\n")
+
+
+def summarize(path: str | Path) -> List[Dict[str, Any]]:
+    """Statements aus dem Log nach Gesamtzeit gruppieren (absteigend)."""
+    groups: Dict[str, Dict[str, Any]] = {}
+    with Path(path).open(encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            grp = groups.get(rec["sql"])
+            if grp is None:
+                grp = groups[rec["sql"]] = {
+                    "sql": rec["sql"], "count": 0, "total_ms": 0.0, "max_ms": 0.0,
+                    "slow": 0, "vm_steps": 0, "endpoints": set(), "plan": None,
+                    "full_scan": False,
+                }
+            grp["count"] += 1
+            grp["total_ms"] += rec["ms"]
+            grp["max_ms"] = max(grp["max_ms"], rec["ms"])
+            grp["vm_steps"] += rec.get("vm_steps", 0)
+            grp["endpoints"].add(rec.get("endpoint") or "?")
+            if rec.get("slow"):
+                grp["slow"] += 1
+                grp["plan"] = rec.get("plan")
+                grp["full_scan"] = grp["full_scan"] or rec.get("full_scan", False)
+    return sorted(groups.values(), key=lambda g_: g_["total_ms"], reverse=True)
+
+
+def init_sql_trace(app: Flask) -> None:
+    """Log-Pfad setzen und Flush am Ende des App-Kontexts registrieren."""
+    if not app.config.get("SQL_TRACE_LOG"):
+        app.config["SQL_TRACE_LOG"] = str(Path(app.instance_path) / "sql_trace.log")
+    if app.config.get("SQL_TRACE"):
+        # Requests: noch mit Endpoint im Kontext; CLI/App-Kontexte: Rest beim
+        # Abbau (nach db.init_app registriert -> läuft vor close_db)
+        app.teardown_request(_flush_traces)
+        app.teardown_appcontext(_flush_traces)
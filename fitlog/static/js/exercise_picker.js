@@ -0,0 +1,147 @@
+/*
+ * FitLog – Übungsauswahl mit Suche (Typeahead), ersetzt <select> mit dem
+ * kompletten Übungskatalog.
+ *
+ * Erwartet je Auswahlfeld:
+ *   <div class="exercise-picker" data-search-url="/exercises/search">
+ *     <input type="search" class="exercise-picker__input" …>   sichtbare Eingabe
+ *     <input type="hidden" name="exercise_id" …>               gewählte ID
+ *     <ul class="exercise-picker__list" hidden></ul>           Trefferliste
+ *   </div>
+ *
+ * Treffer werden seitenweise nachgeladen („Weitere …“). Nach einer Auswahl
+ * löst der Container das Event `exercise-picked` aus (detail: {id, name}).
+ */
+(function () {
+  "use strict";
+
+  var PAGE_SIZE = 20;
+  var DELAY_MS = 150;
+
+  function init(root) {
+    var input = root.querySelector(".exercise-picker__input");
+    var hidden = root.querySelector("input[type=hidden]");
+    var list = root.querySelector(".exercise-picker__list");
+    var url = root.getAttribute("data-search-url");
+    var timer = null;
+    var seq = 0;          // nur die Antwort der jüngsten Anfrage zählt
+    var active = -1;
+
+    function options() {
+      return list.querySelectorAll("[role=option]");
+    }
+
+    function close() {
+      list.hidden = true;
+      input.setAttribute("aria-expanded", "false");
+      active = -1;
+    }
+
+    function highlight(index) {
+      var opts = options();
+      if (!opts.length) return;
+      active = (index + opts.length) % opts.length;
+      for (var i = 0; i < opts.length; i++) {
+        opts[i].classList.toggle("is-active", i === active);
+      }
+      opts[active].scrollIntoView({ block: "nearest" });
+    }
+
+    function pick(option) {
+      if (option.hasAttribute("data-more")) {
+        load(Number(option.getAttribute("data-more")));
+        return;
+      }
+      var id = option.getAttribute("data-id");
+      var name = option.textContent;
+      hidden.value = id;
+      input.value = name;
+      close();
+      root.dispatchEvent(new CustomEvent("exercise-picked", { detail: { id: id, name: name } }));
+    }
+
+    function render(data, append) {
+      if (!append) list.innerHTML = "";
+      var more = list.querySelector("[data-more]");
+      if (more) more.remove();
+
+      data.items.forEach(function (item) {
+        var li = document.createElement("li");
+        li.setAttribute("role", "option");
+        li.setAttribute("data-id", item.id);
+        li.textContent = item.name;
+        list.appendChild(li);
+      });
+      if (data.next_offset != null) {
+        var li = document.createElement("li");
+        li.setAttribute("role", "option");
+        li.setAttribute("data-more", data.next_offset);
+        li.className = "exercise-picker__more";
+        li.textContent = "Weitere …";
+        list.appendChild(li);
+      }
+      if (!list.children.length) {
+        var empty = document.createElement("li");
+        empty.className = "muted";
+        empty.textContent = "Keine Übung gefunden";
+        list.appendChild(empty);
+      }
+      list.hidden = false;
+      input.setAttribute("aria-expanded", "true");
+    }
+
+    function load(offset) {
+      var mySeq = ++seq;
+      var params = new URLSearchParams({ q: input.value, limit: PAGE_SIZE, offset: offset || 0 });
+      fetch(url + "?" + params.toString(), { headers: { Accept: "application/json" } })
+        .then(function (res) {
+          if (!res.ok) throw new Error(String(res.status));
+          return res.json();
+        })
+        .then(function (data) {
+          if (mySeq === seq) render(data, offset > 0);
+        })
+        .catch(function () { /* Eingabe bleibt, nächster Tastendruck versucht es erneut */ });
+    }
+
+    input.addEventListener("input", function () {
+      hidden.value = "";
+      clearTimeout(timer);
+      timer = setTimeout(function () { load(0); }, DELAY_MS);
+    });
+    input.addEventListener("focus", function () {
+      if (list.hidden) load(0);
+    });
+    input.addEventListener("keydown", function (ev) {
+      if (ev.key === "ArrowDown" || ev.key === "ArrowUp") {
+        ev.preventDefault();
+        if (list.hidden) { load(0); return; }
+        highlight(active + (ev.key === "ArrowDown" ? 1 : -1));
+      } else if (ev.key === "Enter" && !list.hidden && active >= 0) {
+        ev.preventDefault();
+        pick(options()[active]);
+      } else if (ev.key === "Escape") {
+        close();
+      }
+    });
+    // mousedown statt click: feuert vor dem blur der Eingabe
+    list.addEventListener("mousedown", function (ev) {
+      var option = ev.target.closest("[role=option]");
+      if (!option) return;
+      ev.preventDefault();
+      pick(option);
+    });
+    input.addEventListener("blur", close);
+  }
+
+  function initAll() {
+    var roots = document.querySelectorAll(".exercise-picker[data-search-url]");
+    for (var i = 0; i < roots.length; i++) init(roots[i]);
+  }
+
+  if (document.readyState === "loading") {
+    document.addEventListener("DOMContentLoaded", initAll);
+  } else {
+    initAll();
+  }
+})();
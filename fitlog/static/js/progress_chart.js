@@ -0,0 +1,141 @@
+/*
+ * FitLog – clientseitige Fortschrittsdiagramme (SVG, ohne Fremdbibliothek).
+ *
+ * Erwartet ein Element mit
+ *   data-series-url   JSON-Endpoint (progress.plan_series / progress.exercise_series)
+ *   data-kind         "plan" (Balken) oder "exercise" (Linie über Zeit)
+ *   data-fallback-src PNG-Endpoint, falls das JSON nicht geladen werden kann
+ */
+(function () {
+  "use strict";
+
+  var SVG_NS = "http://www.w3.org/2000/svg";
+  var W = 750, H = 340;
+  var PAD = { top: 34, right: 16, bottom: 64, left: 52 };
+
+  function el(name, attrs, text) {
+    var node = document.createElementNS(SVG_NS, name);
+    Object.keys(attrs || {}).forEach(function (k) { node.setAttribute(k, attrs[k]); });
+    if (text != null) node.textContent = text;
+    return node;
+  }
+
+  function niceMax(v) {
+    if (!(v > 0)) return 1;
+    var mag = Math.pow(10, Math.floor(Math.log10(v)));
+    var steps = [1, 2, 2.5, 5, 10];
+    for (var i = 0; i < steps.length; i++) {
+      if (steps[i] * mag >= v) return steps[i] * mag;
+    }
+    return 10 * mag;
+  }
+
+  function frame(svg, title, yMax) {
+    var plotH = H - PAD.top - PAD.bottom;
+    svg.appendChild(el("text", { x: W / 2, y: 20, "text-anchor": "middle", "font-size": 14 }, title));
+    for (var i = 0; i <= 4; i++) {
+      var y = PAD.top + plotH - (plotH * i) / 4;
+      svg.appendChild(el("line", {
+        x1: PAD.left, x2: W - PAD.right, y1: y, y2: y,
+        stroke: "#94a3b8", "stroke-dasharray": "2 3", "stroke-width": 0.6
+      }));
+      svg.appendChild(el("text", {
+        x: PAD.left - 6, y: y + 4, "text-anchor": "end", "font-size": 11
+      }, String(Math.round((yMax * i) / 4 * 10) / 10)));
+    }
+    svg.appendChild(el("text", {
+      x: 14, y: PAD.top + plotH / 2, "font-size": 12, "text-anchor": "middle",
+      transform: "rotate(-90 14 " + (PAD.top + plotH / 2) + ")"
+    }, "Weight (kg)"));
+  }
+
+  function drawBars(svg, data) {
+    var values = data.weights || [];
+    var yMax = niceMax(Math.max.apply(null, values.concat([0])));
+    var plotW = W - PAD.left - PAD.right, plotH = H - PAD.top - PAD.bottom;
+    var slot = plotW / Math.max(values.length, 1);
+    frame(svg, data.title, yMax);
+    values.forEach(function (v, i) {
+      var h = (v / yMax) * plotH;
+      var x = PAD.left + i * slot + slot * 0.15;
+      var bar = el("rect", {
+        x: x, y: PAD.top + plotH - h, width: slot * 0.7, height: h, fill: "#1f77b4"
+      });
+      bar.appendChild(el("title", {}, data.labels[i] + ": " + v + " kg"));
+      svg.appendChild(bar);
+      var lx = x + slot * 0.35, ly = PAD.top + plotH + 14;
+      svg.appendChild(el("text", {
+        x: lx, y: ly, "font-size": 11, "text-anchor": "end",
+        transform: "rotate(-18 " + lx + " " + ly + ")"
+      }, data.labels[i]));
+    });
+  }
+
+  function drawLine(svg, data) {
+    var dates = (data.dates || []).map(function (d) { return Date.parse(d); });
+    var values = data.weights || [];
+    var plotW = W - PAD.left - PAD.right, plotH = H - PAD.top - PAD.bottom;
+    var yMax = niceMax(Math.max.apply(null, values.concat([0])));
+    frame(svg, data.title, yMax);
+
+    if (!values.length) {
+      svg.appendChild(el("text", { x: W / 2, y: H / 2, "text-anchor": "middle" }, "No data yet"));
+      return;
+    }
+
+    var t0 = dates[0], t1 = dates[dates.length - 1];
+    var span = Math.max(t1 - t0, 1);
+    var px = function (t) { return PAD.left + (values.length === 1 ? plotW / 2 : ((t - t0) / span) * plotW); };
+    var py = function (v) { return PAD.top + plotH - (v / yMax) * plotH; };
+
+    var points = values.map(function (v, i) { return px(dates[i]) + "," + py(v); }).join(" ");
+    svg.appendChild(el("polyline", { points: points, fill: "none", stroke: "#1f77b4", "stroke-width": 2 }));
+    if (values.length <= 120) {
+      values.forEach(function (v, i) {
+        var dot = el("circle", { cx: px(dates[i]), cy: py(v), r: 3.5, fill: "#1f77b4" });
+        dot.appendChild(el("title", {}, data.dates[i] + ": " + v + " kg"));
+        svg.appendChild(dot);
+      });
+    }
+
+    // Datumsbeschriftung: höchstens 6 Ticks
+    var ticks = Math.min(6, values.length);
+    for (var k = 0; k < ticks; k++) {
+      var idx = ticks === 1 ? 0 : Math.round((k * (values.length - 1)) / (ticks - 1));
+      svg.appendChild(el("text", {
+        x: px(dates[idx]), y: PAD.top + plotH + 18, "font-size": 11, "text-anchor": "middle"
+      }, data.dates[idx]));
+    }
+  }
+
+  function fallback(container) {
+    var src = container.getAttribute("data-fallback-src");
+    if (!src) return;
+    var img = document.createElement("img");
+    img.src = src;
+    img.alt = container.getAttribute("aria-label") || "";
+    img.className = "progress-chart__img";
+    container.replaceWith(img);
+  }
+
+  function render(container) {
+    fetch(container.getAttribute("data-series-url"), { headers: { Accept: "application/json" } })
+      .then(function (res) {
+        if (!res.ok) throw new Error("HTTP " + res.status);
+        return res.json();
+      })
+      .then(function (data) {
+        var svg = el("svg", {
+          viewBox: "0 0 " + W + " " + H, width: "100%",
+          preserveAspectRatio: "xMidYMid meet", "font-family": "system-ui, sans-serif"
+        });
+        if (container.getAttribute("data-kind") === "plan") drawBars(svg, data);
+        else drawLine(svg, data);
+        container.innerHTML = "";
+        container.appendChild(svg);
+      })
+      .catch(function () { fallback(container); });
+  }
+
+  document.querySelectorAll("[data-series-url]").forEach(render);
+})();
@@ -0,0 +1,55 @@
+// Service Worker: Startseite und Erfassungsmaske auch ohne Netz öffnen.
+//
+//  - /assets/* (Hash im Namen, immutable): cache-first
+//  - Seitenaufrufe von / und /sessions/<id>/record: network-first, bei
+//    fehlender Verbindung die zuletzt geladene Fassung aus dem Cache
+//  - alles andere (POST, Diagramme, …) geht unverändert ans Netz
+//
+// Ausgeliefert unter /sw.js (Scope: gesamte App).
+const CACHE = 'fitlog-v1';
+const OFFLINE_PAGES = [/^\/$/, /^\/sessions\/\d+\/record$/];
+
+self.addEventListener('install', () => self.skipWaiting());
+
+self.addEventListener('activate', (event) => {
+  event.waitUntil((async () => {
+    const names = await caches.keys();
+    await Promise.all(names.filter((n) => n !== CACHE).map((n) => caches.delete(n)));
+    await self.clients.claim();
+  })());
+});
+
+async function cacheFirst(request) {
+  const cache = await caches.open(CACHE);
+  const hit = await cache.match(request);
+  if (hit) return hit;
+  const response = await fetch(request);
+  if (response.ok) cache.put(request, response.clone());
+  return response;
+}
+
+async function networkFirst(request) {
+  const cache = await caches.open(CACHE);
+  try {
+    const response = await fetch(request);
+    if (response.ok) cache.put(request, response.clone());
+    return response;
+  } catch (err) {
+    const hit = await cache.match(request, { ignoreSearch: true });
+    if (hit) return hit;
+    throw err;
+  }
+}
+
+self.addEventListener('fetch', (event) => {
+  const request = event.request;
+  if (request.method !== 'GET') return;
+  const url = new URL(request.url);
+  if (url.origin !== self.location.origin) return;
+
+  if (url.pathname.startsWith('/assets/')) {
+    event.respondWith(cacheFirst(request));
+  } else if (request.mode === 'navigate' && OFFLINE_PAGES.some((re) => re.test(url.pathname))) {
+    event.respondWith(networkFirst(request));
+  }
+});
@@ -0,0 +1,90 @@
+// Offline-Warteschlange für die Erfassungsmaske (record.html).
+//
+// Änderungen werden zuerst in localStorage abgelegt – jede mit einem eigenen
+// Idempotenz-Schlüssel – und danach gesammelt per POST /sessions/sync
+// übertragen. Ohne Verbindung bleiben sie liegen und gehen beim nächsten
+// `online`-Event, Seitenaufruf oder Retry-Intervall raus. Der Server meldet je
+// Schlüssel applied/duplicate/rejected; alle drei sind damit erledigt.
+//
+// Einbinden: <script src="…" data-sync-url="/sessions/sync"></script>
+(() => {
+  const STORAGE_KEY = 'fitlog.syncQueue';
+  const BATCH_SIZE = 200;
+  const RETRY_MS = 30000;
+  const syncUrl = document.currentScript.dataset.syncUrl;
+  const listeners = new Set();
+  let running = null;
+
+  function load() {
+    try { return JSON.parse(localStorage.getItem(STORAGE_KEY)) || []; }
+    catch { return []; }
+  }
+
+  function save(queue) {
+    localStorage.setItem(STORAGE_KEY, JSON.stringify(queue));
+  }
+
+  function newKey() {
+    if (self.crypto && crypto.randomUUID) return crypto.randomUUID();
+    return Date.now().toString(36) + '-' + Math.random().toString(36).slice(2);
+  }
+
+  function notify(state, detail) {
+    const pending = load().length;
+    listeners.forEach((fn) => fn(state, pending, detail));
+  }
+
+  async function drain() {
+    for (;;) {
+      const batch = load().slice(0, BATCH_SIZE);
+      if (!batch.length) return true;
+      let data;
+      try {
+        const res = await fetch(syncUrl, {
+          method: 'POST',
+          headers: { 'Content-Type': 'application/json' },
+          body: JSON.stringify({ mutations: batch }),
+        });
+        if (!res.ok) throw new Error(String(res.status));
+        data = await res.json();
+      } catch (err) {
+        notify('offline', err);
+        return false;
+      }
+      // erledigte Schlüssel entfernen; zwischenzeitlich Eingereihtes bleibt
+      const done = new Set(data.results.map((r) => r.key));
+      save(load().filter((m) => !done.has(m.key)));
+      const rejected = data.results.filter((r) => r.status === 'rejected');
+      notify(rejected.length ? 'rejected' : 'synced', rejected);
+    }
+  }
+
+  function sync() {
+    if (!running) {
+      running = drain().finally(() => { running = null; });
+      return running;
+    }
+    // läuft schon: danach noch einmal, damit Neues nicht liegen bleibt
+    return running.then(() => sync());
+  }
+
+  function enqueue(mutation) {
+    const queue = load();
+    // queued_at: Erfassungszeit – der Server datiert Einträge/Trainingsende
+    // danach, auch wenn der Sync erst Stunden später gelingt
+    queue.push({ key: newKey(), queued_at: new Date().toISOString(), ...mutation });
+    save(queue);
+    notify('queued');
+    return sync();
+  }
+
+  window.addEventListener('online', () => sync());
+  setInterval(() => { if (load().length && navigator.onLine) sync(); }, RETRY_MS);
+
+  window.FitlogSync = {
+    enqueue,
+    sync,
+    pending: (sessionId) => load().filter((m) => sessionId == null || m.session_id === sessionId),
+    onChange: (fn) => listeners.add(fn),
+  };
+})();
@@ -1,23 +1,20 @@
-import sqlite3
 from pathlib import Path
 
+from fitlog.migrations import apply_migrations, latest_version
+
 def init_db():
-    """Initialisiert die SQLite-Datenbank mit der SQL-Datei 001_init.sql."""
+    """Initialisiert bzw. migriert die SQLite-Datenbank (fitlog/migrations)."""
     db_path = Path("instance/fitlog.db")
-    sql_path = Path("instance/001_init.sql")
 
     print(f'Datenbank wird unter "{db_path.resolve()}" initialisiert.')
 
-    with sqlite3.connect(db_path) as connection:
-        with open(sql_path, "r", encoding="utf-8") as f:
-            sql_script = f.read()
-        try:
-            connection.executescript(sql_script)
-            connection.commit()
-        except sqlite3.OperationalError as e:
-            print(f"Fehler beim Initialisieren der Datenbank: {e}")
+    applied = apply_migrations(db_path)
+    if applied:
+        print(f"Angewendete Migrationen: {', '.join(str(v) for v in applied)}")
+    else:
+        print("Keine offenen Migrationen.")
 
-    print("Datenbank wurde erfolgreich erstellt und initialisiert.")
+    print(f"Datenbank ist auf Schema-Version {latest_version()}.")
 
 if __name__ == "__main__":
     init_db()